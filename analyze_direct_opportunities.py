@@ -5,11 +5,14 @@ Calcule le ratio des opportunités réalisables immédiatement (≤ 3 jours)
 """
 
 import re
+import sys
 import json
+import time
 from datetime import datetime, timedelta
 from scrapers.twitter_rss_scraper import TwitterRSSScraper
 from scrapers.galxe_scraper import GalxeScraperEnhanced
 from scrapers.zealy_scraper import ZealyScraper
+from storage.opportunity_store import OpportunityStore
 
 class DirectOpportunityAnalyzer:
     def __init__(self):
@@ -207,6 +210,23 @@ class DirectOpportunityAnalyzer:
         
         return results
     
+    def run_store_analysis(self, days=7, db_path="data/opportunities.db"):
+        """Analyse les opportunités enregistrées ces `days` derniers jours (base SQLite, sans re-scraping)"""
+        store = OpportunityStore(db_path)
+        try:
+            opportunities = store.query(since=time.time() - days * 86400, order_by='created_at')
+        finally:
+            store.close()
+        print(f"🗄️ {len(opportunities)} opportunités lues depuis {db_path} ({days} derniers jours)")
+        
+        if not opportunities:
+            print("❌ Aucune opportunité trouvée pour l'analyse")
+            return None
+        
+        results = self.analyze_opportunities(opportunities)
+        self.display_results(results)
+        return results
+    
     def display_results(self, results):
         """Affiche les résultats de l'analyse de manière formatée"""
         print("\n" + "=" * 70)
@@ -266,4 +286,7 @@ class DirectOpportunityAnalyzer:
 
 if __name__ == "__main__":
     analyzer = DirectOpportunityAnalyzer()
-    analyzer.run_full_analysis()
+    if "--store" in sys.argv:
+        analyzer.run_store_analysis()
+    else:
+        analyzer.run_full_analysis()
@@ -1,35 +1,23 @@
 #!/usr/bin/env python3
 import json
-import re
+
+from processing.rates import get_rate_provider
+from processing.reward_parser import parse_reward
 
 def extract_numeric_value(reward_str):
     """Extrait la valeur numérique d'une chaîne de récompense"""
     if not reward_str or reward_str == 'unknown':
         return 0
     
-    # Chercher les montants en dollars
-    dollar_match = re.search(r'\$(\d+(?:,\d+)*(?:\.\d+)?)', str(reward_str))
-    if dollar_match:
-        return float(dollar_match.group(1).replace(',', ''))
-    
-    # Chercher les BTC
-    btc_match = re.search(r'(\d+(?:\.\d+)?)\s*BTC', str(reward_str), re.IGNORECASE)
-    if btc_match:
-        # Convertir BTC en USD (estimation ~100,000 USD par BTC)
-        return float(btc_match.group(1)) * 100000
+    # Un nombre sans devise n'est pas compté (devise inconnue)
+    reward = parse_reward(reward_str, default_currency=None)
+    if reward.amount is None:
+        return 20 if 'estimated' in str(reward_str).lower() else 0  # défaut pour estimated
     
-    # Pour les estimations
-    if 'estimated' in str(reward_str).lower():
-        if '10-30' in str(reward_str):
-            return 20  # moyenne
-        elif '50-100' in str(reward_str):
-            return 75  # moyenne
-        elif '20-50' in str(reward_str):
-            return 35  # moyenne
-        elif '5-20' in str(reward_str):
-            return 12.5  # moyenne
-        else:
-            return 20  # défaut pour estimated
+    # Montants en dollars (stablecoins inclus) et en BTC, au taux courant ;
+    # fourchettes estimées ("$10-30 estimated") : moyenne
+    if reward.currency in ('USD', 'USDT', 'USDC', 'BTC'):
+        return reward.amount * get_rate_provider().rate(reward.currency)
     
     return 0
 
@@ -6,6 +6,8 @@ import json
 from datetime import datetime
 import os
 
+from storage.opportunity_store import OpportunityStore
+
 # Configuration de la page
 st.set_page_config(
     page_title="Web3 Opportunities Tracker",
@@ -57,6 +59,33 @@ def load_opportunities_from_files(data_dir="data"):
 
     return df
 
+STORE_PATH = "data/opportunities.db"
+STORE_LIMIT = 5000  # Opportunités chargées au plus depuis la base (les meilleures par ROI)
+
+@st.cache_data(ttl=300)  # Cache de 5 minutes
+def load_opportunities_from_store(min_roi=0.0, db_path=STORE_PATH, limit=STORE_LIMIT):
+    """Charge les meilleures opportunités (ROI ≥ min_roi) depuis la base SQLite (une requête indexée, bornée)."""
+    if not os.path.exists(db_path):
+        return pd.DataFrame()
+    store = OpportunityStore(db_path)
+    try:
+        opportunities = store.query(min_roi=min_roi, limit=limit)
+    finally:
+        store.close()
+    if not opportunities:
+        return pd.DataFrame()
+
+    df = pd.DataFrame(opportunities)
+    df['source'] = df['source'].fillna('Unknown') if 'source' in df else 'Unknown'
+    df['createdAt'] = pd.to_datetime(df['created_at'], unit='s')
+    df['roi'] = pd.to_numeric(df['roi'], errors='coerce').fillna(0) if 'roi' in df else 0.0
+    df['reward'] = df['reward'].fillna('N/A') if 'reward' in df else 'N/A'
+    minutes = df['time_est_min'] if 'time_est_min' in df else df.get('estimated_time', 0)
+    df['estimated_time'] = pd.to_numeric(minutes, errors='coerce')
+    df['estimated_time'] = df['estimated_time'].fillna(0)
+
+    return df
+
 @st.cache_data
 def get_mock_data():
     """Génère des données de test si aucune donnée réelle n'est trouvée."""
@@ -73,8 +102,17 @@ def get_mock_data():
 
 st.title("🚀 Web3 Opportunities Tracker")
 
-# Charger les données
-df_opportunities = load_opportunities_from_files()
+st.sidebar.title("🔧 Filtres")
+roi_min = st.sidebar.slider("ROI minimum ($/min)", 0.0, 20.0, 2.0, 0.1)
+
+# Charger les données (base SQLite, filtrée sur le ROI ; anciens fichiers JSON tant qu'elle n'existe pas)
+if os.path.exists(STORE_PATH):
+    df_opportunities = load_opportunities_from_store(roi_min)
+    if df_opportunities.empty:
+        st.info(f"Aucune opportunité avec un ROI ≥ ${roi_min:.1f}/min dans la base.")
+        st.stop()
+else:
+    df_opportunities = load_opportunities_from_files()
 
 if df_opportunities.empty:
     st.warning("Aucune donnée d'opportunité trouvée. Utilisation de données de test.")
@@ -82,13 +120,11 @@ if df_opportunities.empty:
 
 # --- SIDEBAR AVEC FILTRES ---
 
-st.sidebar.title("🔧 Filtres")
 source_filter = st.sidebar.multiselect(
     "Sources", 
     options=df_opportunities['source'].unique(),
     default=df_opportunities['source'].unique()
 )
-roi_min = st.sidebar.slider("ROI minimum ($/min)", 0.0, 20.0, 2.0, 0.1)
 
 # Filtre par date
 min_date = df_opportunities['createdAt'].min().date()
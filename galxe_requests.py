@@ -1,7 +1,9 @@
 from datetime import datetime
+import os
 import random
 from dotenv import load_dotenv
 from vault_manager import VaultManager
+from quota_ledger import QuotaLedger, QuotaExhausted, account_id_for
 
 # Charger les variables d'environnement
 load_dotenv()
@@ -10,10 +12,34 @@ class ScraperAPIBalancer:
     def __init__(self):
         self.vault = VaultManager()
         self.accounts = self._load_accounts()
-        self.usage = {acc: 0 for acc in self.accounts}
+        self.account_ids = {acc: account_id_for(acc) for acc in self.accounts}
+        # Registre partagé entre processus : l'usage survit aux redémarrages et aux workers parallèles
+        self.ledger = QuotaLedger(
+            daily_budget=int(os.getenv("SCRAPERAPI_DAILY_BUDGET", 20)),
+            monthly_budget=int(os.getenv("SCRAPERAPI_MONTHLY_BUDGET", 500))
+        )
+        self.ledger.register(self.account_ids.values())
         self.priority_hours = [6, 10, 16]  # UTC hours
 
+    @property
+    def usage(self):
+        """Requêtes consommées aujourd'hui par compte (lues depuis le registre partagé)"""
+        states = self.ledger.snapshot(self.account_ids.values())
+        return {acc: states.get(acc_id, {}).get('day_used', 0) for acc, acc_id in self.account_ids.items()}
+
+    def remaining_quota(self):
+        return self.ledger.remaining_today(self.account_ids.values())
+
+    def pool_exhausted(self):
+        """Vrai uniquement quand aucun compte du pool n'a plus de budget"""
+        return self.ledger.pool_exhausted(self.account_ids.values())
+
     def _load_accounts(self):
+        # Un seul passage concurrent sur kv/scraperapi/, puis lectures servies par le cache
+        try:
+            self.vault.prefetch("scraperapi/")
+        except Exception as e:
+            print(f"⚠️ Préchargement Vault impossible ({e}), lecture compte par compte")
         accounts = []
         for i in range(1, 9):
             path = f"scraperapi/account{i}"
@@ -29,27 +55,34 @@ class ScraperAPIBalancer:
         now_utc = datetime.utcnow()
         selected_keys = []
 
-        # Stratégie 1 : Si heure critique, choisir batch_size clés parmi les 4 priorités
+        # Stratégie 1 : Si heure critique, piocher parmi les 4 comptes prioritaires
         if now_utc.hour in self.priority_hours:
-            selected_keys = random.sample(self.accounts[:4], min(batch_size, 4))
-        
+            candidates = self.accounts[:4]
+            prefer = self.account_ids[random.choice(candidates)]
         else:
-            # Stratégie 2 : Priorité géographique
-            geo_account = self._get_geo_account(now_utc)
-            if self.usage.get(geo_account, 0) < 33:
-                selected_keys.append(geo_account)
-
-            # Compléter avec clés les moins utilisées pour atteindre batch_size
-            remaining = batch_size - len(selected_keys)
-            if remaining > 0:
-                # Trier comptes par usage croissant, exclure déjà sélectionnés
-                candidates = [acc for acc in self.accounts if acc not in selected_keys]
-                candidates_sorted = sorted(candidates, key=lambda acc: self.usage.get(acc, 0))
-                selected_keys.extend(candidates_sorted[:remaining])
-
-        # Met à jour l'usage pour chaque clé sélectionnée
-        for key in selected_keys:
-            self.usage[key] = self.usage.get(key, 0) + 1
+            # Stratégie 2 : Priorité géographique, puis comptes les moins utilisés
+            candidates = self.accounts
+            prefer = self.account_ids[self._get_geo_account(now_utc)]
+
+        # Chaque clé est réservée atomiquement dans le registre (token bucket + budgets)
+        by_id = {self.account_ids[acc]: acc for acc in candidates}
+        for _ in range(batch_size):
+            remaining_ids = [acc_id for acc_id in by_id if by_id[acc_id] not in selected_keys]
+            if not remaining_ids:
+                break
+            acc_id = self.ledger.acquire(remaining_ids, prefer=prefer)
+            if acc_id is None and candidates is not self.accounts:
+                # Comptes prioritaires épuisés : élargir au pool complet
+                by_id = {self.account_ids[acc]: acc for acc in self.accounts}
+                remaining_ids = [acc_id for acc_id in by_id if by_id[acc_id] not in selected_keys]
+                acc_id = self.ledger.acquire(remaining_ids)
+            if acc_id is None:
+                break
+            selected_keys.append(by_id[acc_id])
+            prefer = None
+
+        if not selected_keys:
+            raise QuotaExhausted("Quota ScraperAPI épuisé ou limite de débit atteinte sur tous les comptes")
 
         return selected_keys
 
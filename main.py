@@ -2,10 +2,8 @@
 import sys
 import os
 import time
-import json
 from datetime import datetime
 import schedule
-import hashlib
 from dotenv import load_dotenv
 
 # Charger les variables d'environnement depuis le fichier .env
@@ -18,6 +16,35 @@ from scrapers.galxe_scraper import GalxeScraperEnhanced
 from scrapers.zealy_scraper import ZealyScraper
 from scrapers.twitter_rss_scraper import TwitterRSSScraper
 from scrapers.layer3_scraper import Layer3Scraper
+from scrapers.source_executor import Source, SourceBatch, run_sources
+from processing.deduplication import deduplicate_opportunities
+from processing.seen_index import SeenIndex, UNCHANGED
+from storage.opportunity_store import OpportunityStore
+
+# Budget du crawl Zealy multi-communautés (s) ; la source dispose d'une marge au-delà
+ZEALY_CRAWL_BUDGET = 240
+
+def fetch_galxe(stop):
+    galxe_scraper = GalxeScraperEnhanced()
+    return galxe_scraper.scrape_galxe_campaigns(pages=1, stop=stop)
+
+def fetch_zealy(stop):
+    zealy_scraper = ZealyScraper()
+    # Passages et curseurs des communautés enregistrés seulement une fois le run stocké
+    zealy_raw_data = zealy_scraper.crawl_communities(time_budget=ZEALY_CRAWL_BUDGET, commit=False, stop=stop)
+    return SourceBatch(zealy_scraper.parse_quests(zealy_raw_data), zealy_raw_data.commits)
+
+def fetch_layer3(stop):
+    layer3_scraper = Layer3Scraper()
+    return layer3_scraper.fetch_all_campaigns(max_pages=1, stop=stop)
+
+def build_sources():
+    """Liste des sources exécutées en parallèle, avec leur délai maximum (s)."""
+    return [
+        Source("Galxe", fetch_galxe, timeout=300),
+        Source("Zealy", fetch_zealy, timeout=ZEALY_CRAWL_BUDGET + 60),
+        Source("Layer3", fetch_layer3, timeout=120),
+    ]
 
 def run_pipeline():
     """
@@ -25,74 +52,47 @@ def run_pipeline():
     consolide les données et les sauvegarde.
     """
     print(f"🚀 Démarrage du pipeline de scraping consolidé - {datetime.now().isoformat()}")
-    all_opportunities = []
 
-    # --- 1. Scraper Galxe ---
-    try:
-        print("\n--- Source: Galxe ---")
-        galxe_scraper = GalxeScraperEnhanced()
-        galxe_quests = galxe_scraper.scrape_galxe_campaigns(pages=1)
-        if galxe_quests:
-            all_opportunities.extend(galxe_quests)
-            print(f"✅ Galxe: {len(galxe_quests)} opportunités récupérées.")
-        else:
-            print("⚠️ Galxe: Aucune opportunité récupérée.")
-    except Exception as e:
-        print(f"❌ Erreur lors du scraping de Galxe: {e}")
-
-    # --- 2. Scraper Zealy ---
-    try:
-        print("\n--- Source: Zealy ---")
-        zealy_scraper = ZealyScraper()
-        zealy_raw_data = zealy_scraper.fetch_quests(limit=100)
-        zealy_quests = zealy_scraper.parse_quests(zealy_raw_data)
-        if zealy_quests:
-            all_opportunities.extend(zealy_quests)
-            print(f"✅ Zealy: {len(zealy_quests)} opportunités récupérées.")
-        else:
-            print("⚠️ Zealy: Aucune opportunité récupérée.")
-    except Exception as e:
-        print(f"❌ Erreur lors du scraping de Zealy: {e}")
-
-    # --- 3. Scraper Layer3 ---
-    try:
-        print("\n--- Source: Layer3 ---")
-        layer3_scraper = Layer3Scraper()
-        layer3_quests = layer3_scraper.fetch_all_campaigns(max_pages=1)
-        if layer3_quests:
-            all_opportunities.extend(layer3_quests)
-            print(f"✅ Layer3: {len(layer3_quests)} opportunités récupérées.")
-        else:
-            print("⚠️ Layer3: Aucune opportunité récupérée.")
-    except Exception as e:
-        print(f"❌ Erreur lors du scraping de Layer3: {e}")
+    # --- 1-3. Scraping concurrent des sources ---
+    all_opportunities, execution_report = run_sources(build_sources(), max_workers=3)
 
     # --- 4. Traitement et Sauvegarde ---
     if not all_opportunities:
         print("\n⚠️ Aucune opportunité n'a été récupérée au total. Fin du pipeline.")
+        all_opportunities.commit()  # Rien à stocker : l'état des sources peut avancer
         return
 
-    # Ajout d'un hash unique pour la déduplication
-    processed_opportunities = []
-    for opp in all_opportunities:
-        # Créer une chaîne de caractères unique pour chaque opportunité
-        unique_string = f"{opp.get('source')}-{opp.get('id')}-{opp.get('title')}"
-        opp['hash'] = hashlib.md5(unique_string.encode()).hexdigest()
-        processed_opportunities.append(opp)
-
-    # Sauvegarder les données consolidées
-    timestamp = int(time.time())
-    output_dir = "data/opportunities"
-    if not os.path.exists(output_dir):
-        os.makedirs(output_dir)
-        
-    filename = f"{output_dir}/opportunities_{timestamp}.json"
-    
-    with open(filename, "w", encoding='utf-8') as f:
-        json.dump(processed_opportunities, f, indent=2, ensure_ascii=False)
+    # Clé canonique (URL normalisée, identité propre à chaque source) posée sur chaque
+    # opportunité : les doublons entre sources disparaissent, l'index la réutilise
+    processed_opportunities = deduplicate_opportunities(all_opportunities)
+
+    # Seules les opportunités nouvelles ou modifiées depuis les cycles précédents sont réémises
+    # (le passage n'est enregistré dans l'index qu'une fois le run stocké)
+    seen_index = SeenIndex()
+    try:
+        unchanged_ops = seen_index.classify(processed_opportunities, commit=False)[2]
+        processed_opportunities = [opp for opp in processed_opportunities if opp['seen_status'] != UNCHANGED]
+        if not processed_opportunities:
+            print(f"\n✅ Rien de nouveau depuis le dernier cycle ({len(unchanged_ops)} opportunités inchangées).")
+            seen_index.commit()
+            all_opportunities.commit()
+            return
+
+        # Sauvegarder les données consolidées : un run, une transaction, upsert par clé canonique
+        store = OpportunityStore()
+        try:
+            store.save_run("main", processed_opportunities, execution_report=execution_report)
+        finally:
+            store.close()
+        # Run stocké : index des opportunités vues, curseurs, marques et index des sources
+        # terminées à temps peuvent avancer
+        seen_index.commit()
+        all_opportunities.commit()
+    finally:
+        seen_index.close()
         
     print(f"\n🎉 Pipeline terminé avec succès!")
-    print(f"💾 {len(processed_opportunities)} opportunités totales sauvegardées dans {filename}")
+    print(f"💾 {len(processed_opportunities)} opportunités totales sauvegardées dans {store.path}")
 
 def schedule_jobs():
     """Planifie l'exécution régulière du pipeline."""
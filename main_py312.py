@@ -2,9 +2,7 @@
 import sys
 import os
 import time
-import json
 from datetime import datetime
-import hashlib
 
 # Ajouter le chemin des modules
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), 'scrapers')))
@@ -40,116 +38,102 @@ except ImportError as e:
     print(f"⚠️  RSS scraper non disponible: {e}")
     RSS_AVAILABLE = False
 
+from scrapers.source_executor import Source, SourceBatch, run_sources
+from processing.deduplication import deduplicate_opportunities
+from processing.seen_index import SeenIndex, UNCHANGED
+from storage.opportunity_store import OpportunityStore
+
+# Budget du crawl Zealy multi-communautés (s) ; la source dispose d'une marge au-delà
+ZEALY_CRAWL_BUDGET = 240
+
+def fetch_galxe(stop):
+    galxe_scraper = GalxeScraperPy312()
+    return galxe_scraper.scrape_galxe_campaigns(pages=1, stop=stop)
+
+def fetch_zealy(stop):
+    zealy_scraper = ZealyScraper()
+    # Passages et curseurs des communautés enregistrés seulement une fois le run stocké
+    zealy_raw_data = zealy_scraper.crawl_communities(time_budget=ZEALY_CRAWL_BUDGET, commit=False, stop=stop)
+    return SourceBatch(zealy_scraper.parse_quests(zealy_raw_data), zealy_raw_data.commits)
+
+def fetch_layer3(stop):
+    layer3_scraper = Layer3Scraper()
+    return layer3_scraper.fetch_all_campaigns(max_pages=1, stop=stop)
+
+def fetch_rss(stop):
+    rss_scraper = TwitterRSSScraper()
+    
+    # Seuls les flux dus (rythme de publication, santé) sont récupérés, en parallèle ;
+    # leur état n'avance qu'une fois le run stocké (commit du lot)
+    all_rss_entries = rss_scraper.fetch_due_opportunities(max_entries=30, commit=False)
+    if stop.is_set():
+        return SourceBatch()  # Source abandonnée : ni classification ni traduction
+    if not all_rss_entries:
+        return all_rss_entries
+    return SourceBatch(rss_scraper.parse_rss_data(all_rss_entries), all_rss_entries.commits)
+
+def build_sources():
+    """Sources disponibles exécutées en parallèle, avec leur délai maximum (s)."""
+    sources = []
+    if GALXE_AVAILABLE:
+        sources.append(Source("Galxe", fetch_galxe, timeout=300))
+    if ZEALY_AVAILABLE:
+        sources.append(Source("Zealy", fetch_zealy, timeout=ZEALY_CRAWL_BUDGET + 60))
+    if LAYER3_AVAILABLE:
+        sources.append(Source("Layer3", fetch_layer3, timeout=120))
+    if RSS_AVAILABLE:
+        sources.append(Source("RSS", fetch_rss, timeout=180))
+    return sources
+
 def run_pipeline():
     """
     Exécute le pipeline complet de scraping pour toutes les sources,
     consolide les données et les sauvegarde.
     """
     print(f"🚀 Démarrage du pipeline de scraping consolidé Python 3.12 - {datetime.now().isoformat()}")
-    all_opportunities = []
-
-    # --- 1. Scraper Galxe ---
-    if GALXE_AVAILABLE:
-        try:
-            print("\n--- Source: Galxe ---")
-            galxe_scraper = GalxeScraperPy312()
-            galxe_quests = galxe_scraper.scrape_galxe_campaigns(pages=1)
-            if galxe_quests:
-                all_opportunities.extend(galxe_quests)
-                print(f"✅ Galxe: {len(galxe_quests)} opportunités récupérées.")
-            else:
-                print("⚠️ Galxe: Aucune opportunité récupérée.")
-        except Exception as e:
-            print(f"❌ Erreur lors du scraping de Galxe: {e}")
-    else:
-        print("\n--- Source: Galxe ---")
-        print("❌ Scraper Galxe non disponible")
-
-    # --- 2. Scraper Zealy ---
-    if ZEALY_AVAILABLE:
-        try:
-            print("\n--- Source: Zealy ---")
-            zealy_scraper = ZealyScraper()
-            zealy_raw_data = zealy_scraper.fetch_quests(limit=100)
-            zealy_quests = zealy_scraper.parse_quests(zealy_raw_data)
-            if zealy_quests:
-                all_opportunities.extend(zealy_quests)
-                print(f"✅ Zealy: {len(zealy_quests)} opportunités récupérées.")
-            else:
-                print("⚠️ Zealy: Aucune opportunité récupérée.")
-        except Exception as e:
-            print(f"❌ Erreur lors du scraping de Zealy: {e}")
-    else:
-        print("\n--- Source: Zealy ---")
-        print("❌ Scraper Zealy non disponible (dépendances manquantes)")
 
-    # --- 3. Scraper Layer3 ---
-    if LAYER3_AVAILABLE:
-        try:
-            print("\n--- Source: Layer3 ---")
-            layer3_scraper = Layer3Scraper()
-            layer3_quests = layer3_scraper.fetch_all_campaigns(max_pages=1)
-            if layer3_quests:
-                all_opportunities.extend(layer3_quests)
-                print(f"✅ Layer3: {len(layer3_quests)} opportunités récupérées.")
-            else:
-                print("⚠️ Layer3: Aucune opportunité récupérée.")
-        except Exception as e:
-            print(f"❌ Erreur lors du scraping de Layer3: {e}")
-    else:
-        print("\n--- Source: Layer3 ---")
-        print("❌ Scraper Layer3 non disponible (dépendances manquantes)")
+    # --- 1-4. Scraping concurrent des sources disponibles ---
+    for name, available in [("Galxe", GALXE_AVAILABLE), ("Zealy", ZEALY_AVAILABLE),
+                            ("Layer3", LAYER3_AVAILABLE), ("RSS/Twitter", RSS_AVAILABLE)]:
+        if not available:
+            print(f"❌ Scraper {name} non disponible (dépendances manquantes)")
 
-    # --- 4. Scraper RSS/Twitter ---
-    if RSS_AVAILABLE:
-        try:
-            print("\n--- Source: RSS/Twitter ---")
-            rss_scraper = TwitterRSSScraper()
-            
-            # Récupération des flux principaux
-            rss_entries = rss_scraper.fetch_opportunities(max_entries=30)
-            
-            # Récupération des fallbacks
-            fallback_entries = rss_scraper.fetch_fallback_opportunities(max_entries=20)
-            
-            # Combinaison des deux sources
-            all_rss_entries = rss_entries + fallback_entries
-            
-            if all_rss_entries:
-                rss_opportunities = rss_scraper.parse_rss_data(all_rss_entries)
-                all_opportunities.extend(rss_opportunities)
-                print(f"✅ RSS: {len(rss_opportunities)} opportunités récupérées.")
-            else:
-                print("⚠️ RSS: Aucune opportunité récupérée.")
-        except Exception as e:
-            print(f"❌ Erreur lors du scraping RSS: {e}")
-    else:
-        print("\n--- Source: RSS/Twitter ---")
-        print("❌ Scraper RSS non disponible (dépendances manquantes)")
+    all_opportunities, execution_report = run_sources(build_sources(), max_workers=4)
 
     # --- 4. Traitement et Sauvegarde ---
     if not all_opportunities:
         print("\n⚠️ Aucune opportunité n'a été récupérée au total. Fin du pipeline.")
+        all_opportunities.commit()  # Rien à stocker : l'état des sources peut avancer
         return
 
-    # Ajout d'un hash unique pour la déduplication
-    processed_opportunities = []
-    for opp in all_opportunities:
-        # Créer une chaîne de caractères unique pour chaque opportunité
-        unique_string = f"{opp.get('source')}-{opp.get('id', '')}-{opp.get('title')}"
-        opp['hash'] = hashlib.md5(unique_string.encode()).hexdigest()
-        processed_opportunities.append(opp)
-
-    # Sauvegarder les données consolidées
-    timestamp = int(time.time())
-    output_dir = "data/opportunities"
-    if not os.path.exists(output_dir):
-        os.makedirs(output_dir)
-        
-    filename = f"{output_dir}/opportunities_{timestamp}.json"
-    
-    with open(filename, "w", encoding='utf-8') as f:
-        json.dump(processed_opportunities, f, indent=2, ensure_ascii=False)
+    # Clé canonique (URL normalisée, identité propre à chaque source) posée sur chaque
+    # opportunité : les doublons entre sources disparaissent, l'index la réutilise
+    processed_opportunities = deduplicate_opportunities(all_opportunities)
+
+    # Seules les opportunités nouvelles ou modifiées depuis les cycles précédents sont réémises
+    # (le passage n'est enregistré dans l'index qu'une fois le run stocké)
+    seen_index = SeenIndex()
+    try:
+        unchanged_ops = seen_index.classify(processed_opportunities, commit=False)[2]
+        processed_opportunities = [opp for opp in processed_opportunities if opp['seen_status'] != UNCHANGED]
+        if not processed_opportunities:
+            print(f"\n✅ Rien de nouveau depuis le dernier cycle ({len(unchanged_ops)} opportunités inchangées).")
+            seen_index.commit()
+            all_opportunities.commit()
+            return
+
+        # Sauvegarder les données consolidées : un run, une transaction, upsert par clé canonique
+        store = OpportunityStore()
+        try:
+            store.save_run("main_py312", processed_opportunities, execution_report=execution_report)
+        finally:
+            store.close()
+        # Run stocké : index des opportunités vues, curseurs, marques et index des sources
+        # terminées à temps peuvent avancer
+        seen_index.commit()
+        all_opportunities.commit()
+    finally:
+        seen_index.close()
     
     # Statistiques détaillées
     galxe_count = len([opp for opp in processed_opportunities if opp.get('source') == 'Galxe'])
@@ -160,7 +144,7 @@ def run_pipeline():
     print(f"📊 Galxe: {galxe_count} opportunités")
     print(f"📊 Zealy: {zealy_count} opportunités")
     print(f"📊 RSS/Twitter: {rss_count} opportunités")
-    print(f"💾 {len(processed_opportunities)} opportunités totales sauvegardées dans {filename}")
+    print(f"💾 {len(processed_opportunities)} opportunités totales sauvegardées dans {store.path}")
     
     # Afficher quelques exemples
     if processed_opportunities:
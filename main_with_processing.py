@@ -2,7 +2,6 @@
 import sys
 import os
 import time
-import json
 from datetime import datetime
 import hashlib
 from dotenv import load_dotenv
@@ -17,106 +16,88 @@ from scrapers.galxe_scraper import GalxeScraperEnhanced
 from scrapers.zealy_scraper import ZealyScraper
 from scrapers.twitter_rss_scraper import TwitterRSSScraper
 from scrapers.layer3_scraper import Layer3Scraper
+from scrapers.source_executor import Source, SourceBatch, run_sources
+from processing.opportunity import Opportunity
 from processing.pipeline import process_opportunities
+from processing.seen_index import SeenIndex
+from storage.opportunity_store import OpportunityStore
+
+# Budget du crawl Zealy multi-communautés (s) ; la source dispose d'une marge au-delà
+ZEALY_CRAWL_BUDGET = 240
+
+def fetch_galxe(stop):
+    galxe_scraper = GalxeScraperEnhanced()
+    return galxe_scraper.scrape_galxe_campaigns(pages=1, stop=stop)
+
+def fetch_zealy(stop):
+    zealy_scraper = ZealyScraper()
+    # Passages et curseurs des communautés enregistrés seulement une fois le run stocké
+    zealy_raw_data = zealy_scraper.crawl_communities(time_budget=ZEALY_CRAWL_BUDGET, commit=False, stop=stop)
+    return SourceBatch(zealy_scraper.parse_quests(zealy_raw_data), zealy_raw_data.commits)
+
+def fetch_layer3(stop):
+    layer3_scraper = Layer3Scraper()
+    return layer3_scraper.fetch_all_campaigns(max_pages=1, stop=stop)
+
+def fetch_rss(stop):
+    rss_scraper = TwitterRSSScraper()
+    
+    # Seuls les flux dus (rythme de publication, santé) sont récupérés, en parallèle ;
+    # leur état n'avance qu'une fois le run stocké (commit du lot)
+    all_rss_entries = rss_scraper.fetch_due_opportunities(max_entries=30, commit=False)
+    if stop.is_set():
+        return SourceBatch()  # Source abandonnée : ni classification ni traduction
+    if not all_rss_entries:
+        return all_rss_entries
+    return SourceBatch(rss_scraper.parse_rss_data(all_rss_entries), all_rss_entries.commits)
+
+def build_sources():
+    """Liste des sources exécutées en parallèle, avec leur délai maximum (s)."""
+    return [
+        Source("Galxe", fetch_galxe, timeout=300),
+        Source("Zealy", fetch_zealy, timeout=ZEALY_CRAWL_BUDGET + 60),
+        Source("Layer3", fetch_layer3, timeout=120),
+        Source("RSS", fetch_rss, timeout=180),
+    ]
 
 def run_pipeline_with_processing():
     """
     Exécute le pipeline complet avec processing ROI et déduplication.
     """
     print(f"🚀 Démarrage du pipeline avec processing - {datetime.now().isoformat()}")
-    all_opportunities = []
 
-    # --- 1. Scraper Galxe ---
-    try:
-        print("\n--- Source: Galxe ---")
-        galxe_scraper = GalxeScraperEnhanced()
-        galxe_quests = galxe_scraper.scrape_galxe_campaigns(pages=1)
-        if galxe_quests:
-            all_opportunities.extend(galxe_quests)
-            print(f"✅ Galxe: {len(galxe_quests)} opportunités récupérées.")
-        else:
-            print("⚠️ Galxe: Aucune opportunité récupérée.")
-    except Exception as e:
-        print(f"❌ Erreur lors du scraping de Galxe: {e}")
-
-    # --- 2. Scraper Zealy ---
-    try:
-        print("\n--- Source: Zealy ---")
-        zealy_scraper = ZealyScraper()
-        zealy_raw_data = zealy_scraper.fetch_quests(limit=100)
-        zealy_quests = zealy_scraper.parse_quests(zealy_raw_data)
-        if zealy_quests:
-            all_opportunities.extend(zealy_quests)
-            print(f"✅ Zealy: {len(zealy_quests)} opportunités récupérées.")
-        else:
-            print("⚠️ Zealy: Aucune opportunité récupérée.")
-    except Exception as e:
-        print(f"❌ Erreur lors du scraping de Zealy: {e}")
-
-    # --- 3. Scraper Layer3 ---
-    try:
-        print("\n--- Source: Layer3 ---")
-        layer3_scraper = Layer3Scraper()
-        layer3_quests = layer3_scraper.fetch_all_campaigns(max_pages=1)
-        if layer3_quests:
-            all_opportunities.extend(layer3_quests)
-            print(f"✅ Layer3: {len(layer3_quests)} opportunités récupérées.")
-        else:
-            print("⚠️ Layer3: Aucune opportunité récupérée.")
-    except Exception as e:
-        print(f"❌ Erreur lors du scraping de Layer3: {e}")
-
-    # --- 4. Scraper RSS/Twitter ---
-    try:
-        print("\n--- Source: RSS/Twitter ---")
-        rss_scraper = TwitterRSSScraper()
-        
-        # Récupération des flux principaux
-        rss_entries = rss_scraper.fetch_opportunities(max_entries=30)
-        
-        # Récupération des fallbacks
-        fallback_entries = rss_scraper.fetch_fallback_opportunities(max_entries=20)
-        
-        # Combinaison des deux sources
-        all_rss_entries = rss_entries + fallback_entries
-        
-        if all_rss_entries:
-            rss_opportunities = rss_scraper.parse_rss_data(all_rss_entries)
-            all_opportunities.extend(rss_opportunities)
-            print(f"✅ RSS: {len(rss_opportunities)} opportunités récupérées.")
-        else:
-            print("⚠️ RSS: Aucune opportunité récupérée.")
-    except Exception as e:
-        print(f"❌ Erreur lors du scraping RSS: {e}")
+    # --- 1-4. Scraping concurrent de toutes les sources ---
+    all_opportunities, execution_report = run_sources(build_sources(), max_workers=4)
 
     # --- 5. Processing avec ROI et déduplication ---
     if not all_opportunities:
         print("\n⚠️ Aucune opportunité n'a été récupérée au total. Fin du pipeline.")
+        all_opportunities.commit()  # Rien à stocker : l'état des sources peut avancer
         return
 
     # Traitement avec le pipeline de processing Jour 6
-    result = process_opportunities(all_opportunities, min_roi=2.0)
+    # (les opportunités déjà émises et inchangées lors des cycles précédents sont écartées)
+    # Enregistrements compacts, aux noms de champs communs à toutes les sources
+    source_batch = all_opportunities
+    all_opportunities = Opportunity.from_records(all_opportunities)
+    seen_index = SeenIndex()
+    try:
+        result = process_opportunities(all_opportunities, min_roi=2.0, seen_index=seen_index)
 
-    # --- 6. Sauvegarde avec métadonnées complètes ---
-    timestamp = int(time.time())
-    output_dir = "data/opportunities"
-    if not os.path.exists(output_dir):
-        os.makedirs(output_dir)
-        
-    filename = f"{output_dir}/processed_opportunities_{timestamp}.json"
-    
-    # Ajouter métadonnées temporelles
-    final_result = {
-        'timestamp': timestamp,
-        'datetime': datetime.now().isoformat(),
-        'pipeline_version': 'Jour_6_Processing',
-        'processing_stats': result['stats'],
-        'categories': result['categories'],
-        'processed_opportunities': result['processed_opportunities']
-    }
-    
-    with open(filename, "w", encoding='utf-8') as f:
-        json.dump(final_result, f, indent=2, ensure_ascii=False)
+        # --- 6. Sauvegarde : un run dans la base (toutes les uniques, ROI et statistiques compris) ---
+        store = OpportunityStore()
+        try:
+            stored_ops = [opp for category in result['categories'].values() for opp in category]
+            store.save_run("main_with_processing", stored_ops, stats=result['stats'],
+                           execution_report=execution_report)
+        finally:
+            store.close()
+        # Run stocké : l'index des opportunités vues enregistre le passage
+        seen_index.commit()
+    finally:
+        seen_index.close()
+    # Curseurs, marques et index des sources terminées à temps peuvent avancer
+    source_batch.commit()
         
     # --- 7. Statistiques détaillées ---
     processed_ops = result['processed_opportunities']
@@ -126,7 +107,8 @@ def run_pipeline_with_processing():
     print(f"\n🎉 Pipeline avec processing terminé avec succès!")
     print(f"📊 Statistiques de processing:")
     print(f"   📥 Opportunités brutes: {stats['total_raw']}")
-    print(f"   🔄 Après déduplication: {stats['after_deduplication']}")
+    print(f"   🔄 Après déduplication: {stats['after_deduplication']} "
+          f"({stats['new']} nouvelles, {stats['updated']} mises à jour, {stats['unchanged']} inchangées)")
     print(f"   ⚡ Après filtrage ROI: {stats['after_roi_filter']}")
     print(f"   💎 ROI moyen: ${stats['avg_roi']}/min")
     print(f"   🚀 ROI maximum: ${stats['max_roi']}/min")
@@ -136,7 +118,8 @@ def run_pipeline_with_processing():
     print(f"   ⚡ Moyenne ($2-5/min): {len(categories['medium'])} opportunités")
     print(f"   📋 Faible (<$2/min): {len(categories['low'])} opportunités")
     
-    print(f"\n💾 {len(processed_ops)} opportunités finales sauvegardées dans {filename}")
+    print(f"\n💾 {len(stored_ops)} opportunités sauvegardées dans {store.path} "
+          f"({len(processed_ops)} au-dessus du seuil ROI)")
     
     # Afficher quelques exemples des meilleures opportunités
     if processed_ops:
@@ -147,6 +130,33 @@ def run_pipeline_with_processing():
             roi = opp.get('roi', 0)
             print(f"  {i+1}. [{source}] {title}... (${roi:.2f}/min)")
 
+def run_rss_watch():
+    """
+    Mode continu : le planificateur RSS interroge chaque flux à son propre rythme et
+    pousse les nouvelles opportunités dans le pipeline de processing dès leur apparition.
+    """
+    seen_index = SeenIndex()
+    store = OpportunityStore()
+
+    def on_opportunities(opportunities):
+        result = process_opportunities(Opportunity.from_records(opportunities), min_roi=2.0, seen_index=seen_index)
+        # Même lot que le mode batch : toutes les uniques nouvelles ou modifiées, ROI compris
+        stored_ops = [opp for category in result['categories'].values() for opp in category]
+        if stored_ops:
+            store.save_run("rss_watch", stored_ops, stats=result['stats'])
+        # Passage enregistré seulement si le stockage a réussi (sinon re-proposé au lot suivant)
+        seen_index.commit()
+
+    rss_scraper = TwitterRSSScraper()
+    rss_scraper.start_background_polling(on_opportunities)
+    try:
+        while True:
+            time.sleep(60)
+    finally:
+        rss_scraper.stop_background_polling()
+        seen_index.close()
+        store.close()
+
 def run_test_processing():
     """Test rapide du système de processing."""
     print("🧪 Test du système de processing\n")
@@ -195,6 +205,8 @@ if __name__ == "__main__":
         # Vérifier les arguments
         if len(sys.argv) > 1 and sys.argv[1] == "--test":
             run_test_processing()
+        elif len(sys.argv) > 1 and sys.argv[1] == "--watch-rss":
+            run_rss_watch()
         else:
             run_pipeline_with_processing()
     except KeyboardInterrupt:
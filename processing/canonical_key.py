@@ -0,0 +1,116 @@
+# processing/canonical_key.py - Clé canonique compacte des opportunités (URL normalisée + blake2b-64)
+import hashlib
+import re
+from functools import lru_cache
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+# Paramètres de suivi ajoutés par les partages (réseaux sociaux, newsletters, campagnes)
+TRACKING_PARAMS = frozenset({
+    'fbclid', 'gclid', 'dclid', 'gbraid', 'wbraid', 'msclkid', 'yclid', 'igshid', 'twclid',
+    'mc_cid', 'mc_eid', '_ga', '_gl', 'ref', 'ref_src', 'ref_url', 'referrer', 'src',
+})
+TRACKING_PREFIXES = ('utm_',)
+DEFAULT_PORTS = {':80', ':443'}
+
+# Champs d'identité stables par source, par ordre de préférence. Une identité tirée d'une
+# URL est globale (la même quête relayée par deux sources se recoupe) ; un id ou un titre
+# n'a de sens qu'au sein de sa source.
+SOURCE_IDENTITY = {
+    'zealy': ('community', 'id'),   # Pas d'URL : la quête est identifiée dans sa communauté
+    'galxe': ('link', 'url', 'id'),
+    'layer3': ('id', 'url', 'link'),
+}
+DEFAULT_IDENTITY = ('url', 'link', 'id')
+URL_FIELDS = frozenset({'url', 'link'})
+
+KEY_SIZE = 8  # blake2b-64 : 16 caractères hexadécimaux
+KEY_RE = re.compile(r'[0-9a-f]{%d}' % (KEY_SIZE * 2))
+_SPACES = re.compile(r'\s+')
+
+
+@lru_cache(maxsize=16384)  # Les mêmes URLs reviennent d'un run et d'une source à l'autre
+def canonical_url(url):
+    """
+    Forme canonique d'une URL : https, hôte en minuscules sans « www. » ni port par défaut,
+    sans paramètres de suivi (utm_*, fbclid...), paramètres triés, sans fragment ni « / » final.
+    Chemin et paramètres gardent leur casse : les identifiants Galxe y sont sensibles.
+    """
+    url = str(url or '').strip()
+    if not url:
+        return ''
+    scheme, sep, rest = url.partition('://')  # Schéma ignoré : toujours réécrit en https
+    if not sep:
+        rest = url.lstrip('/')
+    if '?' not in rest and '#' not in rest:  # Cas courant : découpage direct, sans urlsplit
+        netloc, _, path = rest.partition('/')
+        return f"https://{_host(netloc.lower())}/{path}".rstrip('/')
+    parts = urlsplit('https://' + rest)
+    query = sorted((name, value) for name, value in parse_qsl(parts.query, keep_blank_values=True)
+                   if name.lower() not in TRACKING_PARAMS and not name.lower().startswith(TRACKING_PREFIXES))
+    # Un fragment « #/... » est une route d'application monopage, pas une ancre
+    fragment = parts.fragment if parts.fragment.startswith(('/', '!')) else ''
+    return urlunsplit(('https', _host(parts.netloc.lower()), parts.path.rstrip('/'), urlencode(query),
+                       fragment.rstrip('/')))
+
+
+def _host(netloc):
+    """Hôte sans identifiants, port par défaut ni « www. »."""
+    netloc = netloc.rpartition('@')[2]
+    if netloc[-4:] in DEFAULT_PORTS or netloc[-3:] in DEFAULT_PORTS:
+        netloc = netloc.rpartition(':')[0]
+    return netloc[4:] if netloc.startswith('www.') else netloc
+
+
+@lru_cache(maxsize=256)
+def _source_identity(source):
+    source = str(source or '').strip().lower()
+    fields = next((fields for prefix, fields in SOURCE_IDENTITY.items() if source.startswith(prefix)),
+                  DEFAULT_IDENTITY)
+    return source, fields
+
+
+def identity(op):
+    """(espace de noms, valeur) identifiant une opportunité, selon les champs stables de sa source."""
+    source, fields = _source_identity(op.get('source'))
+    if fields[0] == 'community':
+        if op.get('id') is not None:
+            return source, f"{str(op.get('community') or '').strip().lower()}/{str(op['id']).strip()}"
+        fields = DEFAULT_IDENTITY
+
+    for field in fields:
+        value = op.get(field)
+        if value is None or value == '':
+            continue
+        if field in URL_FIELDS:
+            url = canonical_url(value)
+            if url:
+                return 'url', url
+        else:
+            return source, str(value).strip()   # Identifiants sensibles à la casse
+    # En dernier recours, le titre normalisé
+    return source, _SPACES.sub(' ', str(op.get('title') or '')).strip().lower()
+
+
+def compute_key(op):
+    """Empreinte blake2b-64 (hexadécimale) de l'identité canonique d'une opportunité."""
+    namespace, value = identity(op)
+    return hashlib.blake2b(f"{namespace}\x00{value}".encode('utf-8'), digest_size=KEY_SIZE).hexdigest()
+
+
+def opportunity_key(op):
+    """
+    Clé canonique d'une opportunité, calculée une seule fois et portée par l'enregistrement
+    (`op['hash']`) : les étapes suivantes la relisent au lieu de rehacher. Un ancien hash
+    (md5 des versions précédentes) est remplacé.
+    """
+    key = op.get('hash')
+    if not isinstance(key, str) or not KEY_RE.fullmatch(key):
+        key = op['hash'] = compute_key(op)
+    return key
+
+
+def assign_keys(opportunities):
+    """Pose la clé canonique sur chaque opportunité d'un lot ; retourne le lot."""
+    for op in opportunities:
+        opportunity_key(op)
+    return opportunities
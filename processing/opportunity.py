@@ -0,0 +1,139 @@
+# processing/opportunity.py - Enregistrement compact et canonique d'une opportunité (__slots__)
+import sys
+from operator import attrgetter
+
+# Champs canoniques, stockés dans des slots (pas de __dict__ par enregistrement)
+FIELDS = (
+    'source', 'id', 'title', 'url', 'description', 'reward', 'reward_currency', 'time_est_min',
+    'deadline', 'start_time', 'community', 'roi', 'hash',
+    # Annotations du pipeline de processing
+    'reward_amount_extracted', 'currency_detected', 'reward_confidence', 'time_estimated', 'seen_status',
+)
+FIELD_SET = frozenset(FIELDS)
+_field_values = attrgetter(*FIELDS)
+
+# Noms hérités des différents scrapers -> champ canonique
+ALIASES = {
+    'link': 'url',
+    'estimated_time': 'time_est_min',
+    'roi_usd_per_min': 'roi',
+    'end_time': 'deadline',
+    'endDate': 'deadline',
+}
+
+# Valeurs très répétées (quelques sources, devises et statuts) : une seule chaîne en mémoire
+INTERNED = frozenset({'source', 'reward_currency', 'currency_detected', 'seen_status'})
+
+
+def _resolve(key):
+    return ALIASES.get(key, key)
+
+
+class Opportunity:
+    """
+    Opportunité normalisée : un slot par champ canonique, les champs propres à une source
+    (chain, logo, tags...) dans `extra` (None s'il n'y en a pas).
+
+    L'accès par attribut est typé ; l'interface de mapping (`get`, `op['roi']`, `in`)
+    accepte aussi les noms hérités (`link`, `estimated_time`, `roi_usd_per_min`...) pour que
+    les étapes écrites pour des dicts fonctionnent telles quelles. Un champ à None est absent.
+    """
+
+    __slots__ = FIELDS + ('extra',)
+
+    def __init__(self, **fields):
+        # Affectations en ligne : bien plus rapides qu'une boucle de setattr sur FIELDS
+        self.source = self.id = self.title = self.url = self.description = None
+        self.reward = self.reward_currency = self.time_est_min = self.deadline = self.start_time = None
+        self.community = self.roi = self.hash = None
+        self.reward_amount_extracted = self.currency_detected = self.reward_confidence = None
+        self.time_estimated = self.seen_status = self.extra = None
+        for key, value in fields.items():
+            self[key] = value
+
+    @classmethod
+    def from_raw(cls, raw):
+        """Construit un enregistrement depuis la sortie brute d'un scraper (dict), en un passage."""
+        op = cls()
+        extra = None
+        for key, value in raw.items():
+            if key in FIELD_SET:
+                if key in INTERNED and type(value) is str:
+                    value = sys.intern(value)
+                setattr(op, key, value)
+            elif key in ALIASES:
+                name = ALIASES[key]
+                if raw.get(name) is None:  # Le nom canonique l'emporte s'il est présent
+                    setattr(op, name, value)
+            else:
+                if extra is None:
+                    extra = {}
+                extra[key] = value
+        if extra is not None:
+            op.extra = extra
+        return op
+
+    @classmethod
+    def from_records(cls, raws):
+        """Convertit un lot ; les enregistrements déjà normalisés sont repris tels quels."""
+        return [raw if isinstance(raw, cls) else cls.from_raw(raw) for raw in raws]
+
+    # --- Interface de mapping (compatibilité avec les étapes écrites pour des dicts) ---
+
+    def get(self, key, default=None):
+        name = _resolve(key)
+        if name in FIELD_SET:
+            value = getattr(self, name)
+        else:
+            value = self.extra.get(key) if self.extra else None
+        return default if value is None else value
+
+    def __getitem__(self, key):
+        value = self.get(key)
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key, value):
+        name = _resolve(key)
+        if name in FIELD_SET:
+            if name in INTERNED and type(value) is str:
+                value = sys.intern(value)
+            setattr(self, name, value)
+        else:
+            if self.extra is None:
+                self.extra = {}
+            self.extra[key] = value
+
+    def __contains__(self, key):
+        return self.get(key) is not None
+
+    def keys(self):
+        return self.to_dict().keys()
+
+    def to_dict(self):
+        """Dict canonique (champs renseignés puis `extra`), prêt pour json.dump."""
+        data = {name: value for name, value in zip(FIELDS, _field_values(self)) if value is not None}
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+    def __eq__(self, other):
+        if isinstance(other, Opportunity):
+            return self.to_dict() == other.to_dict()
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"Opportunity(source={self.source!r}, id={self.id!r}, title={self.title!r})"
+
+
+def json_default(obj):
+    """
+    Hook `default` de json.dump : les enregistrements sont sérialisés au fil de l'écriture,
+    sans convertir tout le lot en dicts au préalable.
+    """
+    if isinstance(obj, Opportunity):
+        return obj.to_dict()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
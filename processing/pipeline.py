@@ -1,33 +1,22 @@
 from .roi_calculator import calculate_roi
 from .deduplication import deduplicate_opportunities
-from .roi_filter import filter_by_roi, categorize_by_roi
-import re
+from .roi_filter import rank_by_roi, print_filter_summary, print_categories
+from .reward_parser import parse_reward, parse_rewards, reward_currency
+from .roi_vectorized import COLUMNAR_MIN_BATCH, columnar_available, compute_roi, select_by_roi
+from .seen_index import UNCHANGED
 
-def extract_reward_info(opportunity):
+def extract_reward_info(opportunity, reward=None):
     """Extrait les informations de récompense d'une opportunité."""
     reward_amount = 10  # Valeur par défaut
     currency = "USD"
     time_est_min = 5   # Valeur par défaut
     
-    # Extraire reward_amount et currency
-    if 'reward' in opportunity:
-        reward_str = str(opportunity['reward'])
-        
-        # Chercher des montants numériques
-        amount_match = re.search(r'(\d+(?:\.\d+)?)', reward_str)
-        if amount_match:
-            reward_amount = float(amount_match.group(1))
-        
-        # Déterminer la devise
-        reward_str_upper = reward_str.upper()
-        if 'XP' in reward_str_upper:
-            currency = 'XP'
-        elif 'GAL' in reward_str_upper:
-            currency = 'GAL'
-        elif 'POINTS' in reward_str_upper or 'POINT' in reward_str_upper:
-            currency = 'POINTS'
-        elif '$' in reward_str or 'USD' in reward_str_upper:
-            currency = 'USD'
+    # Extraire reward_amount et currency (analyse déjà faite en lot si `reward` est fourni)
+    if reward is None:
+        reward = parse_reward(opportunity.get('reward'), reward_currency(opportunity))
+    if reward.amount is not None:
+        reward_amount = reward.amount
+        currency = reward.currency
     
     # Extraire time_est_min
     if 'time_est_min' in opportunity:
@@ -37,47 +26,81 @@ def extract_reward_info(opportunity):
     
     return reward_amount, currency, time_est_min
 
-def process_opportunities(all_opportunities, min_roi=2.0):
-    """Pipeline complet de processing des opportunités."""
+def _annotate(op, roi, reward_info, reward):
+    """Écrit le ROI et les détails de l'extraction (traçabilité) sur l'opportunité."""
+    reward_amount, currency, time_est_min = reward_info
+    op['roi'] = round(roi, 4)
+    op['reward_amount_extracted'] = reward_amount
+    op['currency_detected'] = currency
+    op['reward_confidence'] = reward.confidence
+    op['time_estimated'] = time_est_min
+
+def process_opportunities(all_opportunities, min_roi=2.0, columnar=None, seen_index=None, top_k=None):
+    """
+    Pipeline complet de processing des opportunités.
+    
+    seen_index : SeenIndex persistant ; seules les opportunités nouvelles ou mises à jour
+    depuis les runs précédents continuent dans le pipeline (les inchangées sont comptées).
+    Le passage n'est enregistré qu'au `seen_index.commit()`, à appeler une fois le run stocké.
+    
+    top_k : ne garder (triées) que les k meilleures opportunités retenues, via un tas borné ;
+    les statistiques et catégories portent toujours sur l'ensemble du lot.
+    
+    columnar : calcul ROI / filtrage / catégorisation sur tableaux NumPy. Par défaut,
+    activé automatiquement pour les gros lots (≥ COLUMNAR_MIN_BATCH) si NumPy est installé ;
+    le résultat est identique à celui du chemin dict par dict.
+    """
+    if columnar is None:
+        columnar = columnar_available() and len(all_opportunities) >= COLUMNAR_MIN_BATCH
+    elif columnar and not columnar_available():
+        print("⚠️ NumPy non installé : processing dict par dict")
+        columnar = False
+    if columnar:
+        return _process_columnar(all_opportunities, min_roi, seen_index, top_k)
+    
     print(f"\n🔧 === DÉBUT DU PROCESSING ===")
     print(f"📊 Opportunités brutes: {len(all_opportunities)}")
     
     # 1. Calcul ROI pour chaque opportunité
     print(f"\n💰 Étape 1: Calcul du ROI...")
-    for op in all_opportunities:
-        reward_amount, currency, time_est_min = extract_reward_info(op)
+    rewards = parse_rewards(all_opportunities)
+    for op, reward in zip(all_opportunities, rewards):
+        reward_info = extract_reward_info(op, reward)
+        reward_amount, currency, time_est_min = reward_info
         
         # Calculer le ROI
-        roi = calculate_roi(reward_amount, time_est_min, currency)
-        op['roi'] = round(roi, 4)
-        
-        # Ajouter les détails pour traçabilité
-        op['reward_amount_extracted'] = reward_amount
-        op['currency_detected'] = currency
-        op['time_estimated'] = time_est_min
+        _annotate(op, calculate_roi(reward_amount, time_est_min, currency), reward_info, reward)
     
     # 2. Déduplication
     print(f"\n🔄 Étape 2: Déduplication...")
-    unique_ops = deduplicate_opportunities(all_opportunities)
+    unique_ops, seen_stats = _deduplicate(all_opportunities, seen_index)
     
-    # 3. Filtrage par ROI
-    print(f"\n⚡ Étape 3: Filtrage ROI (≥${min_roi}/min)...")
-    filtered_ops = filter_by_roi(unique_ops, min_roi=min_roi)
+    # 3-4. Filtrage, catégorisation et statistiques en un seul passage
+    print(f"\n⚡ Étapes 3-4: Filtrage ROI (≥${min_roi}/min) et catégorisation...")
+    # Catégories sur toutes les uniques, pas seulement filtrées
+    filtered_ops, categories, stats = rank_by_roi(unique_ops, min_roi, top_k=top_k)
+    print_filter_summary(min_roi, len(unique_ops), stats['count'], stats['min_roi'], stats['max_roi'], stats['avg_roi'])
+    print_categories(stats['high'], stats['medium'], stats['low'])
     
-    # 4. Catégorisation
-    print(f"\n🎯 Étape 4: Catégorisation...")
-    categories = categorize_by_roi(unique_ops)  # Sur toutes les uniques, pas seulement filtrées
-    
-    # 5. Statistiques finales
+    # 5. Statistiques finales (agrégats du même passage)
+    return _result(all_opportunities, unique_ops, filtered_ops, categories, stats, seen_stats)
+
+def _deduplicate(all_opportunities, seen_index):
+    """Doublons du lot, puis (avec un index) opportunités inchangées depuis les runs précédents."""
+    unique_ops = deduplicate_opportunities(all_opportunities)
+    if seen_index is None:
+        return unique_ops, None
+    new, updated, unchanged = seen_index.classify(unique_ops, commit=False)
+    fresh_ops = [op for op in unique_ops if op['seen_status'] != UNCHANGED]
+    return fresh_ops, {'new': len(new), 'updated': len(updated), 'unchanged': len(unchanged)}
+
+def _result(all_opportunities, unique_ops, filtered_ops, categories, stats, seen_stats=None):
     print(f"\n📈 === RÉSULTATS FINAUX ===")
-    print(f"📊 Opportunités après processing: {len(filtered_ops)}")
-    if filtered_ops:
-        avg_roi = sum(op['roi'] for op in filtered_ops) / len(filtered_ops)
-        max_roi = max(op['roi'] for op in filtered_ops)
-        min_roi_actual = min(op['roi'] for op in filtered_ops)
-        print(f"💎 ROI moyen: ${avg_roi:.2f}/min")
-        print(f"🚀 ROI maximum: ${max_roi:.2f}/min")
-        print(f"📋 ROI minimum: ${min_roi_actual:.2f}/min")
+    print(f"📊 Opportunités après processing: {stats['count']}")
+    if stats['count']:
+        print(f"💎 ROI moyen: ${stats['avg_roi']:.2f}/min")
+        print(f"🚀 ROI maximum: ${stats['max_roi']:.2f}/min")
+        print(f"📋 ROI minimum: ${stats['min_roi']:.2f}/min")
     
     result = {
         'processed_opportunities': filtered_ops,
@@ -85,10 +108,41 @@ def process_opportunities(all_opportunities, min_roi=2.0):
         'stats': {
             'total_raw': len(all_opportunities),
             'after_deduplication': len(unique_ops),
-            'after_roi_filter': len(filtered_ops),
-            'avg_roi': round(sum(op['roi'] for op in filtered_ops) / len(filtered_ops), 2) if filtered_ops else 0,
-            'max_roi': round(max(op['roi'] for op in filtered_ops), 2) if filtered_ops else 0,
+            'after_roi_filter': stats['count'],
+            'avg_roi': round(stats['avg_roi'], 2) if stats['count'] else 0,
+            'max_roi': round(stats['max_roi'], 2) if stats['count'] else 0,
         }
     }
+    if seen_stats is not None:
+        result['stats'].update(seen_stats)
     
     return result
+
+def _process_columnar(all_opportunities, min_roi, seen_index=None, top_k=None):
+    """Même pipeline, en colonnes : un calcul ROI vectorisé puis filtre, tri, catégories et stats en une fois."""
+    print(f"\n🔧 === DÉBUT DU PROCESSING (colonnes) ===")
+    print(f"📊 Opportunités brutes: {len(all_opportunities)}")
+    
+    # 1. Extraction en colonnes (montant, devise, minutes) puis ROI vectorisé
+    print(f"\n💰 Étape 1: Calcul du ROI...")
+    rewards = parse_rewards(all_opportunities)
+    reward_infos = [extract_reward_info(op, reward) for op, reward in zip(all_opportunities, rewards)]
+    amounts, currencies, minutes = zip(*reward_infos) if reward_infos else ((), (), ())
+    rois = compute_roi(amounts, currencies, minutes)
+    for op, roi, reward_info, reward in zip(all_opportunities, rois.tolist(), reward_infos, rewards):
+        _annotate(op, roi, reward_info, reward)
+    
+    # 2. Déduplication
+    print(f"\n🔄 Étape 2: Déduplication...")
+    unique_ops, seen_stats = _deduplicate(all_opportunities, seen_index)
+    
+    # 3-4. Filtrage, tri et catégorisation sur le même tableau de ROI
+    print(f"\n⚡ Étapes 3-4: Filtrage ROI (≥${min_roi}/min) et catégorisation...")
+    kept, category_indices, stats = select_by_roi([op['roi'] for op in unique_ops], min_roi, top_k=top_k)
+    filtered_ops = [unique_ops[i] for i in kept.tolist()]
+    categories = {name: [unique_ops[i] for i in indices.tolist()] for name, indices in category_indices.items()}
+    print_filter_summary(min_roi, len(unique_ops), stats['count'], stats['min_roi'], stats['max_roi'], stats['avg_roi'])
+    print_categories(len(categories['high']), len(categories['medium']), len(categories['low']))
+    
+    # 5. Statistiques finales
+    return _result(all_opportunities, unique_ops, filtered_ops, categories, stats, seen_stats)
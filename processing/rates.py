@@ -0,0 +1,157 @@
+# processing/rates.py - Taux de conversion token -> USD : source interchangeable, cache TTL
+import json
+import math
+import os
+import threading
+import time
+import urllib.request
+
+# Taux de repli (USD par unité), utilisés tant qu'aucune source n'a répondu
+DEFAULT_RATES = {
+    "USD": 1.0, "USDT": 1.0, "USDC": 1.0,
+    "XP": 0.01, "POINTS": 0.005, "GAL": 0.50, "TOKENS": 1.0,
+    "BTC": 100000.0,
+    # Jetons des chaînes reconnus par reward_parser : ordres de grandeur, affinés par la source
+    "ETH": 3500.0, "SOL": 150.0, "BNB": 600.0,
+    "ARB": 0.50, "OP": 1.50, "MATIC": 0.50, "L3T": 0.05,
+}
+# Devise inconnue : aucune valeur tant qu'une source ne la cote pas. Compter le montant
+# tel quel ferait passer « 1000 FOO » pour 1000 $ en tête du classement ROI.
+UNKNOWN_RATE = 0.0
+
+
+def _clean_rates(data):
+    """Garde les taux numériques positifs, symboles en majuscules ; accepte {'rates': {...}}."""
+    if isinstance(data, dict) and isinstance(data.get('rates'), dict):
+        data = data['rates']
+    if not isinstance(data, dict):
+        raise ValueError("format de taux invalide")
+    rates = {}
+    for symbol, value in data.items():
+        try:
+            value = float(value)
+        except (TypeError, ValueError):
+            continue
+        if math.isfinite(value) and value > 0:
+            rates[str(symbol).strip().upper()] = value
+    return rates
+
+
+class JSONRateSource:
+    """Fichier de prix local : {"GAL": 0.48, ...} ou {"rates": {...}}. Fichier absent : aucun taux."""
+
+    def __init__(self, path="data/token_rates.json"):
+        self.path = path
+
+    def fetch(self):
+        if not os.path.exists(self.path):
+            return {}
+        with open(self.path, encoding='utf-8') as f:
+            return _clean_rates(json.load(f))
+
+
+class HTTPRateSource:
+    """Endpoint de prix HTTP renvoyant le même JSON (un stub local peut le remplacer)."""
+
+    def __init__(self, url, timeout=5):
+        self.url = url
+        self.timeout = timeout
+
+    def fetch(self):
+        request = urllib.request.Request(self.url, headers={'Accept': 'application/json'})
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            return _clean_rates(json.loads(response.read().decode('utf-8')))
+
+
+class RateProvider:
+    """
+    Taux token -> USD en mémoire, servis en O(1) sans jamais attendre la source.
+
+    Les taux récupérés complètent DEFAULT_RATES et restent frais `ttl` secondes. Au-delà,
+    la lecture sert encore les taux périmés et lance une seule revalidation en arrière-plan
+    (stale-while-revalidate) ; un échec conserve les taux connus et n'est retenté qu'après
+    `retry_delay` secondes.
+    """
+
+    def __init__(self, source=None, ttl=3600, retry_delay=60, defaults=None, unknown_rate=UNKNOWN_RATE):
+        self.source = source
+        self.ttl = ttl
+        self.retry_delay = retry_delay
+        self.unknown_rate = unknown_rate
+        self.defaults = dict(DEFAULT_RATES if defaults is None else defaults)
+        self._rates = dict(self.defaults)
+        self._fresh_until = 0.0   # Aucune récupération : à revalider dès la première lecture
+        self._refreshing = False
+        self._lock = threading.Lock()
+
+    def _revalidate_if_stale(self):
+        if self.source is None or time.monotonic() < self._fresh_until:
+            return
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+        threading.Thread(target=self.refresh, name="rate-refresh", daemon=True).start()
+
+    def refresh(self):
+        """Récupère les taux auprès de la source (bloquant) ; retourne True en cas de succès."""
+        try:
+            fetched = self.source.fetch() if self.source is not None else {}
+        except Exception as e:
+            print(f"⚠️ Taux de conversion non mis à jour ({e}) : taux précédents conservés")
+            with self._lock:
+                self._fresh_until = time.monotonic() + self.retry_delay
+                self._refreshing = False
+            return False
+        rates = dict(self.defaults)
+        rates.update(fetched)
+        with self._lock:
+            self._rates = rates  # Remplacement atomique : les lectures en cours voient l'ancien ou le nouveau
+            self._fresh_until = time.monotonic() + self.ttl
+            self._refreshing = False
+        return True
+
+    def rate(self, currency):
+        """Valeur en USD d'une unité de `currency`."""
+        self._revalidate_if_stale()
+        return self._rates.get(currency, self.unknown_rate)
+
+    def rates_for(self, currencies):
+        """Taux d'un lot de devises (liste alignée), résolus sur un même instantané."""
+        self._revalidate_if_stale()
+        rates = self._rates
+        unknown = self.unknown_rate
+        return [rates.get(currency, unknown) for currency in currencies]
+
+    def snapshot(self):
+        return dict(self._rates)
+
+
+def default_source():
+    """Endpoint HTTP si TOKEN_RATES_URL est défini, sinon fichier local (TOKEN_RATES_FILE)."""
+    url = os.getenv("TOKEN_RATES_URL")
+    if url:
+        return HTTPRateSource(url)
+    return JSONRateSource(os.getenv("TOKEN_RATES_FILE", "data/token_rates.json"))
+
+
+_provider = None
+_provider_lock = threading.Lock()
+
+
+def get_rate_provider():
+    """Fournisseur partagé par tous les calculs de ROI (créé au premier appel)."""
+    global _provider
+    if _provider is None:
+        with _provider_lock:
+            if _provider is None:
+                _provider = RateProvider(default_source())
+    return _provider
+
+
+def set_rate_provider(provider):
+    """Remplace le fournisseur partagé (tests, scripts) ; retourne le précédent."""
+    global _provider
+    with _provider_lock:
+        previous, _provider = _provider, provider
+    return previous
@@ -0,0 +1,130 @@
+# processing/reward_parser.py - Analyse unifiée des récompenses (toutes sources)
+import re
+from collections import namedtuple
+from functools import lru_cache, partial
+
+RewardInfo = namedtuple('RewardInfo', ['amount', 'currency', 'confidence', 'low', 'high'])
+RewardInfo.__doc__ = """Récompense extraite : montant (moyenne pour une fourchette), devise, confiance [0-1]."""
+
+# Devises reconnues après un montant ; les alias sont ramenés à la forme canonique
+TOKEN_ALIASES = {'POINT': 'POINTS', 'PTS': 'POINTS', 'DOLLAR': 'USD', 'DOLLARS': 'USD'}
+TOKENS = ['XP', 'GAL', 'POINTS', 'POINT', 'PTS', 'USDT', 'USDC', 'USD', 'DOLLARS', 'DOLLAR',
+          'ETH', 'BTC', 'SOL', 'BNB', 'ARB', 'OP', 'MATIC', 'L3T']
+# Devises retenues dans un texte libre (articles RSS) : on évite « 50 million ARB » & co
+CRYPTO_CURRENCIES = frozenset(['USDT', 'USDC', 'ETH', 'BTC'])
+
+MULTIPLIERS = {'k': 1e3, 'thousand': 1e3, 'm': 1e6, 'million': 1e6, 'bn': 1e9, 'billion': 1e9}
+
+_NUM = r'\d{1,3}(?:,\d{3})+(?:\.\d+)?|\d+(?:\.\d+)?'
+_MULT = r'(?i:(?:k|m|bn)\b|\s*(?:thousand|million|billion)\b)?'
+_TOKENS = '|'.join(sorted(TOKENS, key=len, reverse=True))
+
+# Une seule expression, un seul passage, deux alternatives factorisées sur le nombre :
+#   "$" montant [fourchette]      -> dollars, ou fourchette si une borne haute suit
+#   montant [devise]              -> montant + devise, ou nombre nu
+REWARD_RE = re.compile(
+    rf'\$\s?({_NUM})({_MULT})(?:\s*(?:-|–|to)\s*\$?({_NUM})({_MULT}))?'
+    rf'|(?<![\w.,])({_NUM})(?![\d,])({_MULT})(?:\s*(?i:({_TOKENS}))\b)?'
+)
+ESTIMATED_RE = re.compile(r'estimat', re.IGNORECASE)
+
+NO_REWARD = RewardInfo(None, None, 0.0, None, None)
+
+
+# Construction directe du tuple : évite le __new__ Python de namedtuple sur le chemin chaud
+_reward_info = partial(tuple.__new__, RewardInfo)
+
+# Forme canonique de chaque devise, pour les casses usuelles (xp, XP, Xp)
+_CANONICAL_TOKENS = {}
+for _token in TOKENS:
+    for _variant in (_token, _token.lower(), _token.capitalize()):
+        _CANONICAL_TOKENS[_variant] = TOKEN_ALIASES.get(_token, _token)
+
+
+def _number(text, multiplier):
+    value = float(text.replace(',', '')) if ',' in text else float(text)
+    return value * MULTIPLIERS.get(multiplier.strip().lower(), 1) if multiplier else value
+
+
+def _from_match(match, default_currency):
+    """(type de correspondance, RewardInfo) pour un match de REWARD_RE."""
+    usd, usd_mult, high_text, high_mult, amount_text, multiplier, token = match.groups()
+    if usd is None:
+        amount = _number(amount_text, multiplier)
+        if token is None:
+            return 'bare', _reward_info((amount, default_currency, 0.6, amount, amount))
+        currency = _CANONICAL_TOKENS.get(token) or _CANONICAL_TOKENS[token.upper()]
+        return 'token', _reward_info((amount, currency, 0.9, amount, amount))
+    if high_text is None:
+        amount = _number(usd, usd_mult)
+        return 'usd', _reward_info((amount, 'USD', 0.9, amount, amount))
+    low, high = _number(usd, usd_mult or high_mult), _number(high_text, high_mult)
+    # Une fourchette annoncée comme estimation est moins fiable qu'une fourchette publiée
+    confidence = 0.3 if ESTIMATED_RE.search(match.string, match.end()) else 0.5
+    return 'range', _reward_info(((low + high) / 2, 'USD', confidence, low, high))
+
+
+@lru_cache(maxsize=4096)
+def _parse_text(text, default_currency):
+    # Les libellés se répètent beaucoup ("100 XP", "$10-30 estimated") : résultat mémoïsé
+    match = REWARD_RE.search(text)
+    if not match:
+        return NO_REWARD
+    return _from_match(match, default_currency)[1]
+
+
+def parse_reward(value, default_currency='USD'):
+    """
+    Analyse un champ récompense : nombre, "$1,000", "500 XP", "0.05 BTC", "100 USDT",
+    "$10-30 estimated"... Le premier montant trouvé l'emporte ; un nombre sans devise
+    prend `default_currency`. Retourne NO_REWARD si rien n'est reconnu.
+    """
+    if value.__class__ is str:
+        return _parse_text(value, default_currency)
+    if value is None or isinstance(value, bool):
+        return NO_REWARD
+    if isinstance(value, (int, float)):
+        return RewardInfo(float(value), default_currency, 1.0, float(value), float(value))
+    return _parse_text(str(value), default_currency)
+
+
+def find_reward(text, currencies=CRYPTO_CURRENCIES):
+    """
+    Cherche une récompense explicite dans un texte libre (titre + résumé) : un montant en
+    dollars l'emporte, sinon le premier montant suivi d'une devise de `currencies`.
+    Les nombres nus sont ignorés. Retourne None si rien n'est trouvé.
+    """
+    token_info = None
+    for match in REWARD_RE.finditer(text):
+        kind, info = _from_match(match, 'USD')
+        if kind == 'bare':
+            continue
+        if kind in ('range', 'usd') or info.currency == 'USD':
+            return info
+        if token_info is None and info.currency in currencies:
+            token_info = info
+    return token_info
+
+
+def reward_currency(opportunity, default='USD'):
+    """Devise déclarée par la source (reward_currency / currency), sinon `default`."""
+    return opportunity.get('reward_currency') or opportunity.get('currency') or default
+
+
+def parse_rewards(opportunities, field='reward', default_currency='USD'):
+    """Analyse en lot : une RewardInfo par opportunité (ordre conservé)."""
+    return [parse_reward(op.get(field), op.get('reward_currency') or op.get('currency') or default_currency)
+            for op in opportunities]
+
+
+def format_amount(amount):
+    return f"{amount:.0f}" if float(amount).is_integer() else f"{amount:g}"
+
+
+def format_reward(info):
+    """Libellé lisible : "$250", "$50-100", "0.5 BTC"."""
+    if info.currency == 'USD':
+        if info.low != info.high:
+            return f"${format_amount(info.low)}-{format_amount(info.high)}"
+        return f"${format_amount(info.amount)}"
+    return f"{format_amount(info.amount)} {info.currency}"
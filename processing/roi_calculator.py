@@ -1,5 +1,6 @@
+from .rates import get_rate_provider
+
 def calculate_roi(reward_amount, time_est_min, currency="USD"):
-    """Calcul du ROI en $/min."""
-    currency_rates = {"XP": 0.01, "GAL": 0.50, "POINTS": 0.005}
-    usd_value = reward_amount * currency_rates.get(currency, 1.0)
+    """Calcul du ROI en $/min (taux de conversion du fournisseur partagé)."""
+    usd_value = reward_amount * get_rate_provider().rate(currency)
     return usd_value / max(time_est_min, 1)
@@ -1,25 +1,76 @@
-def filter_by_roi(opportunities, min_roi=2.0):
-    """Filtre les opportunités par ROI minimum et les trie par ROI décroissant."""
-    filtered = []
+import heapq
+
+# Seuils de catégorisation ($/min)
+HIGH_ROI = 5.0
+MEDIUM_ROI = 2.0
+
+def rank_by_roi(opportunities, min_roi=2.0, top_k=None, collect_categories=True):
+    """
+    Filtrage, catégorisation et statistiques en un seul passage.
     
-    for op in opportunities:
-        roi = op.get('roi', 0)
-        if roi >= min_roi:
-            filtered.append(op)
+    Retourne (retenues triées par ROI décroissant, {catégorie: opportunités} ou None, stats).
+    Avec `top_k`, seules les k meilleures retenues sont gardées dans un tas borné (O(n log k)) ;
+    sans, toutes les retenues sont triées. Les stats (count, sum_roi, avg_roi, max_roi, min_roi,
+    effectifs high/medium/low) portent sur toutes les retenues / uniques, pas sur le seul top.
+    À ROI égal, l'ordre d'origine est conservé, comme avec sorted(..., reverse=True).
+    """
+    kept = []
+    categories = {'high': [], 'medium': [], 'low': []} if collect_categories else None
+    counts = {'high': 0, 'medium': 0, 'low': 0}
+    count = 0
+    total = 0.0
+    highest_roi = lowest_roi = None
     
-    # Trier par ROI décroissant
-    filtered_sorted = sorted(filtered, key=lambda x: x.get('roi', 0), reverse=True)
+    for index, op in enumerate(opportunities):
+        roi = op.get('roi', 0)
+        category = 'high' if roi >= HIGH_ROI else 'medium' if roi >= MEDIUM_ROI else 'low'
+        counts[category] += 1
+        if categories is not None:
+            categories[category].append(op)
+        if roi < min_roi:
+            continue
+        
+        count += 1
+        total += roi
+        if highest_roi is None or roi > highest_roi:
+            highest_roi = roi
+        if lowest_roi is None or roi < lowest_roi:
+            lowest_roi = roi
+        if top_k is None:
+            kept.append(op)
+        elif len(kept) < top_k:
+            heapq.heappush(kept, (roi, -index, op))
+        elif kept and roi > kept[0][0]:  # À ROI égal, la plus ancienne (déjà dans le tas) l'emporte
+            heapq.heapreplace(kept, (roi, -index, op))
     
-    print(f"💰 Filtrage ROI (≥${min_roi}/min): {len(opportunities)} → {len(filtered_sorted)} opportunités")
+    if top_k is None:
+        ranked = sorted(kept, key=lambda x: x.get('roi', 0), reverse=True)
+    else:
+        ranked = [op for _, _, op in sorted(kept, key=lambda item: item[:2], reverse=True)]
     
-    if filtered_sorted:
-        highest_roi = filtered_sorted[0].get('roi', 0)
-        lowest_roi = filtered_sorted[-1].get('roi', 0)
-        avg_roi = sum(op.get('roi', 0) for op in filtered_sorted) / len(filtered_sorted)
-        print(f"📊 ROI: Min=${lowest_roi:.2f}/min, Max=${highest_roi:.2f}/min, Avg=${avg_roi:.2f}/min")
+    stats = {
+        'count': count,
+        'sum_roi': total,
+        'avg_roi': total / count if count else 0,
+        'max_roi': highest_roi if count else 0,
+        'min_roi': lowest_roi if count else 0,
+        **counts,
+    }
+    return ranked, categories, stats
+
+def filter_by_roi(opportunities, min_roi=2.0, top_k=None):
+    """Filtre les opportunités par ROI minimum et les trie par ROI décroissant (les `top_k` meilleures si précisé)."""
+    filtered_sorted, _, stats = rank_by_roi(opportunities, min_roi, top_k, collect_categories=False)
+    print_filter_summary(min_roi, len(opportunities), stats['count'], stats['min_roi'], stats['max_roi'],
+                         stats['avg_roi'])
     
     return filtered_sorted
 
+def print_filter_summary(min_roi, total, kept, lowest_roi, highest_roi, avg_roi):
+    print(f"💰 Filtrage ROI (≥${min_roi}/min): {total} → {kept} opportunités")
+    if kept:
+        print(f"📊 ROI: Min=${lowest_roi:.2f}/min, Max=${highest_roi:.2f}/min, Avg=${avg_roi:.2f}/min")
+
 def categorize_by_roi(opportunities):
     """Catégorise les opportunités par niveau de ROI."""
     high_roi = []      # ≥ $5/min
@@ -28,20 +79,23 @@ def categorize_by_roi(opportunities):
     
     for op in opportunities:
         roi = op.get('roi', 0)
-        if roi >= 5.0:
+        if roi >= HIGH_ROI:
             high_roi.append(op)
-        elif roi >= 2.0:
+        elif roi >= MEDIUM_ROI:
             medium_roi.append(op)
         else:
             low_roi.append(op)
     
-    print(f"🎯 Catégorisation ROI:")
-    print(f"  🔥 Haute (≥$5/min): {len(high_roi)} opportunités")
-    print(f"  ⚡ Moyenne ($2-5/min): {len(medium_roi)} opportunités") 
-    print(f"  📋 Faible (<$2/min): {len(low_roi)} opportunités")
+    print_categories(len(high_roi), len(medium_roi), len(low_roi))
     
     return {
         'high': high_roi,
         'medium': medium_roi,
         'low': low_roi
     }
+
+def print_categories(high, medium, low):
+    print(f"🎯 Catégorisation ROI:")
+    print(f"  🔥 Haute (≥$5/min): {high} opportunités")
+    print(f"  ⚡ Moyenne ($2-5/min): {medium} opportunités") 
+    print(f"  📋 Faible (<$2/min): {low} opportunités")
@@ -0,0 +1,160 @@
+# processing/seen_index.py - Index persistant des opportunités déjà vues (SQLite)
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from .canonical_key import opportunity_key
+from .opportunity import ALIASES
+
+# Champs (noms canoniques) dont la modification fait d'une opportunité connue une opportunité « mise à jour »
+CONTENT_FIELDS = ('title', 'description', 'reward', 'reward_currency', 'deadline', 'time_est_min')
+# Noms hérités de chaque champ suivi (end_time/endDate -> deadline, estimated_time -> time_est_min)
+CONTENT_ALIASES = {field: tuple(alias for alias, name in ALIASES.items() if name == field)
+                   for field in CONTENT_FIELDS}
+
+NEW, UPDATED, UNCHANGED = 'new', 'updated', 'unchanged'
+
+
+def content_values(op):
+    """
+    Valeurs des champs suivis sous leur nom canonique, comme les résout Opportunity :
+    le nom canonique l'emporte, sinon le premier nom hérité renseigné.
+    Un dict brut et l'Opportunity qui en est tirée donnent les mêmes valeurs.
+    """
+    values = []
+    for field in CONTENT_FIELDS:
+        value = op.get(field)
+        if value is None:
+            value = next((op.get(alias) for alias in CONTENT_ALIASES[field] if op.get(alias) is not None), None)
+        values.append(value)
+    return values
+
+
+def content_fingerprint(op):
+    """Empreinte du contenu suivi (récompense, description, échéance...)."""
+    content = json.dumps(content_values(op), default=str, ensure_ascii=False)
+    return hashlib.md5(content.encode('utf-8')).hexdigest()
+
+
+class SeenIndex:
+    """
+    Opportunités déjà émises, d'un run à l'autre : clé canonique -> empreinte du contenu,
+    premier et dernier passage. Une table SQLite (clé primaire, sans rowid) donne
+    l'appartenance en O(log n) sur disque ; chaque lot est résolu en quelques requêtes.
+
+    Les entrées absentes depuis plus de `ttl` secondes sont purgées : l'index reste borné
+    et une opportunité qui réapparaît longtemps après redevient « nouvelle ».
+    """
+
+    LOOKUP_CHUNK = 500  # Sous la limite de variables d'une requête SQLite
+
+    def __init__(self, path="data/seen_opportunities.db", ttl=30 * 86400):
+        self.path = path or ":memory:"
+        self.ttl = ttl
+        if path:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._pending = None    # (lignes, now) d'une classification pas encore enregistrée
+        self.conn = sqlite3.connect(self.path, check_same_thread=False)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS seen (
+                key TEXT PRIMARY KEY,
+                fingerprint TEXT NOT NULL,
+                first_seen REAL NOT NULL,
+                last_seen REAL NOT NULL
+            ) WITHOUT ROWID
+        """)
+        self.conn.execute("CREATE INDEX IF NOT EXISTS seen_last_seen ON seen (last_seen)")
+        self.conn.commit()
+
+    def _lookup(self, keys):
+        known = {}
+        for start in range(0, len(keys), self.LOOKUP_CHUNK):
+            chunk = keys[start:start + self.LOOKUP_CHUNK]
+            placeholders = ",".join("?" * len(chunk))
+            known.update(self.conn.execute(
+                f"SELECT key, fingerprint FROM seen WHERE key IN ({placeholders})", chunk))
+        return known
+
+    def classify(self, opportunities, now=None, commit=True):
+        """
+        Sépare un lot en (nouvelles, mises à jour, inchangées) et enregistre le passage.
+        Chaque opportunité reçoit `seen_status` ; l'ordre du lot est conservé.
+
+        commit=False : le passage n'est enregistré qu'au `commit()`, une fois le lot stocké.
+        Une nouvelle classification remplace celle qui n'a pas été validée.
+        """
+        now = now or time.time()
+        keys = [opportunity_key(op) for op in opportunities]
+        fingerprints = [content_fingerprint(op) for op in opportunities]
+        new, updated, unchanged = [], [], []
+
+        with self._lock:
+            known = self._lookup(list(set(keys)))
+            rows = []
+            for op, key, fingerprint in zip(opportunities, keys, fingerprints):
+                previous = known.get(key)
+                if previous is None:
+                    status, target = NEW, new
+                elif previous != fingerprint:
+                    status, target = UPDATED, updated
+                else:
+                    status, target = UNCHANGED, unchanged
+                op['seen_status'] = status
+                target.append(op)
+                known[key] = fingerprint  # Une seconde occurrence dans le lot n'est pas « nouvelle »
+                rows.append((key, fingerprint, now, now))
+            self._pending = (rows, now)
+
+        print(f"🗂️ Index des opportunités vues: {len(new)} nouvelles, {len(updated)} mises à jour, "
+              f"{len(unchanged)} inchangées")
+        if commit:
+            self.commit()
+        return new, updated, unchanged
+
+    def commit(self):
+        """Enregistre le passage de la dernière classification (puis purge les entrées expirées)."""
+        with self._lock:
+            if self._pending is None:
+                return
+            rows, now = self._pending
+            with self.conn:
+                self.conn.executemany("""
+                    INSERT INTO seen (key, fingerprint, first_seen, last_seen) VALUES (?, ?, ?, ?)
+                    ON CONFLICT (key) DO UPDATE SET fingerprint = excluded.fingerprint,
+                                                    last_seen = excluded.last_seen
+                """, rows)
+            self._pending = None
+            self._prune(now)
+
+    def _prune(self, now):
+        with self.conn:
+            return self.conn.execute("DELETE FROM seen WHERE last_seen < ?", (now - self.ttl,)).rowcount
+
+    def prune(self, now=None):
+        """Supprime les entrées plus vues depuis `ttl` ; retourne le nombre supprimé."""
+        with self._lock:
+            return self._prune(now or time.time())
+
+    def get(self, op):
+        """(premier passage, dernier passage) d'une opportunité, ou None."""
+        with self._lock:
+            row = self.conn.execute("SELECT first_seen, last_seen FROM seen WHERE key = ?",
+                                    (opportunity_key(op),)).fetchone()
+        return row
+
+    def __contains__(self, op):
+        return self.get(op) is not None
+
+    def __len__(self):
+        with self._lock:
+            return self.conn.execute("SELECT COUNT(*) FROM seen").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
@@ -0,0 +1,160 @@
+import hashlib
+import os
+import sqlite3
+import time
+from datetime import datetime
+
+
+class QuotaExhausted(Exception):
+    """Aucun compte ScraperAPI ne dispose encore de quota."""
+
+
+def account_id_for(api_key):
+    """Identifiant stable d'un compte, sans stocker la clé d'API en clair."""
+    return hashlib.sha256(api_key.encode()).hexdigest()[:16]
+
+
+class QuotaLedger:
+    """
+    Registre de quotas persistant et partagé entre processus (SQLite).
+
+    Chaque compte a un token bucket (débit instantané), un budget journalier et un
+    budget mensuel. Toute réservation se fait dans une transaction BEGIN IMMEDIATE,
+    ce qui sérialise les workers concurrents : deux processus ne peuvent pas
+    consommer le même crédit.
+    """
+
+    def __init__(self, db_path="data/quota_ledger.db", daily_budget=20, monthly_budget=500,
+                 bucket_capacity=5, refill_per_minute=5):
+        self.db_path = db_path
+        self.daily_budget = daily_budget
+        self.monthly_budget = monthly_budget
+        self.bucket_capacity = bucket_capacity
+        self.refill_per_second = refill_per_minute / 60.0
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = self._connect()
+        try:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS quota_accounts (
+                    account_id TEXT PRIMARY KEY,
+                    tokens REAL NOT NULL,
+                    last_refill REAL NOT NULL,
+                    day TEXT NOT NULL,
+                    day_used INTEGER NOT NULL DEFAULT 0,
+                    month TEXT NOT NULL,
+                    month_used INTEGER NOT NULL DEFAULT 0,
+                    total_used INTEGER NOT NULL DEFAULT 0
+                )
+            """)
+        finally:
+            conn.close()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    @staticmethod
+    def _periods(now=None):
+        now = datetime.fromtimestamp(now or time.time())
+        return now.strftime('%Y-%m-%d'), now.strftime('%Y-%m')
+
+    def register(self, account_ids):
+        """Déclare les comptes (sans effet pour ceux déjà connus)."""
+        day, month = self._periods()
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.executemany(
+                "INSERT OR IGNORE INTO quota_accounts (account_id, tokens, last_refill, day, month) "
+                "VALUES (?, ?, ?, ?, ?)",
+                [(account_id, self.bucket_capacity, time.time(), day, month) for account_id in account_ids]
+            )
+            conn.execute("COMMIT")
+        finally:
+            conn.close()
+
+    def _refreshed(self, row, now):
+        """État d'un compte après recharge du bucket et changement de jour/mois."""
+        day, month = self._periods(now)
+        state = dict(row)
+        elapsed = max(0.0, now - state['last_refill'])
+        state['tokens'] = min(self.bucket_capacity, state['tokens'] + elapsed * self.refill_per_second)
+        state['last_refill'] = now
+        if state['day'] != day:
+            state['day'], state['day_used'] = day, 0
+        if state['month'] != month:
+            state['month'], state['month_used'] = month, 0
+        return state
+
+    def _has_budget(self, state):
+        return state['day_used'] < self.daily_budget and state['month_used'] < self.monthly_budget
+
+    def acquire(self, account_ids, prefer=None, cost=1):
+        """
+        Réserve `cost` crédits sur un compte parmi `account_ids` et retourne son identifiant.
+        Le compte `prefer` est choisi s'il est éligible, sinon le moins chargé.
+        Retourne None si aucun compte n'est disponible.
+        """
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            placeholders = ','.join('?' * len(account_ids))
+            rows = conn.execute(f"SELECT * FROM quota_accounts WHERE account_id IN ({placeholders})",
+                                list(account_ids)).fetchall()
+            states = {row['account_id']: self._refreshed(row, now) for row in rows}
+            eligible = [s for s in states.values() if s['tokens'] >= cost and self._has_budget(s)]
+
+            if not eligible:
+                conn.execute("ROLLBACK")
+                return None
+
+            chosen = states.get(prefer) if prefer in states and states[prefer] in eligible else None
+            if chosen is None:
+                chosen = min(eligible, key=lambda s: (s['month_used'], s['day_used']))
+
+            chosen['tokens'] -= cost
+            chosen['day_used'] += cost
+            chosen['month_used'] += cost
+            chosen['total_used'] += cost
+            conn.execute(
+                "UPDATE quota_accounts SET tokens=?, last_refill=?, day=?, day_used=?, month=?, "
+                "month_used=?, total_used=? WHERE account_id=?",
+                (chosen['tokens'], chosen['last_refill'], chosen['day'], chosen['day_used'],
+                 chosen['month'], chosen['month_used'], chosen['total_used'], chosen['account_id'])
+            )
+            conn.execute("COMMIT")
+            return chosen['account_id']
+        except Exception:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    def snapshot(self, account_ids=None):
+        """État courant (après recharge) de chaque compte, indexé par identifiant."""
+        now = time.time()
+        conn = self._connect()
+        try:
+            rows = conn.execute("SELECT * FROM quota_accounts").fetchall()
+        finally:
+            conn.close()
+        states = {row['account_id']: self._refreshed(row, now) for row in rows}
+        if account_ids is not None:
+            states = {a: states[a] for a in account_ids if a in states}
+        return states
+
+    def remaining_today(self, account_ids=None):
+        """Crédits encore disponibles aujourd'hui sur l'ensemble du pool."""
+        return sum(
+            max(0, min(self.daily_budget - s['day_used'], self.monthly_budget - s['month_used']))
+            for s in self.snapshot(account_ids).values()
+        )
+
+    def pool_exhausted(self, account_ids=None):
+        """Vrai seulement si plus aucun compte n'a de budget (jour ou mois) disponible."""
+        return self.remaining_today(account_ids) == 0
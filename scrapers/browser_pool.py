@@ -0,0 +1,206 @@
+# scrapers/browser_pool.py - Pool Playwright persistant partagé par les scrapers
+import asyncio
+import atexit
+import concurrent.futures
+import threading
+
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+LAUNCH_ARGS = ['--no-sandbox', '--disable-dev-shm-usage']
+
+
+class BrowserPool:
+    """
+    Navigateur Chromium longue durée, partagé entre les pages et entre les exécutions planifiées.
+
+    Playwright est piloté en asynchrone depuis un thread dédié : n'importe quel thread
+    (y compris les workers du SourceExecutor) peut demander un rendu via `render()`.
+    Chaque rendu obtient un contexte isolé (cookies, cache, stockage) fermé après usage.
+    Le navigateur est recyclé après `max_pages_per_browser` pages ou si la mémoire
+    des processus Chromium dépasse `max_memory_mb`.
+    """
+
+    def __init__(self, max_tabs=3, max_pages_per_browser=50, max_memory_mb=1500, headless=True):
+        self.max_tabs = max_tabs
+        self.max_pages_per_browser = max_pages_per_browser
+        self.max_memory_mb = max_memory_mb
+        self.headless = headless
+
+        self._lock = threading.Lock()
+        self._loop = None
+        self._thread = None
+
+        # État manipulé uniquement depuis la boucle asyncio du pool
+        self._playwright = None
+        self._browser = None
+        self._browser_pages = 0
+        self._open_contexts = {}    # navigateur -> nombre de contextes ouverts
+        self._retiring = []         # navigateurs à fermer dès qu'ils sont inactifs
+        self._tabs = None
+        self._launch_lock = None
+
+        self.stats = {'launches': 0, 'recycles': 0, 'pages_rendered': 0, 'errors': 0, 'timeouts': 0}
+
+    def _ensure_loop(self):
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(target=self._loop.run_forever,
+                                                name="browser-pool", daemon=True)
+                self._thread.start()
+            return self._loop
+
+    def render(self, url, actions=None, goto_timeout=60000, timeout=180):
+        """
+        Ouvre `url` dans un onglet isolé, exécute `actions(page)` (coroutine optionnelle)
+        puis retourne le HTML de la page. Bloquant pour l'appelant.
+
+        Au-delà de `timeout` secondes, le rendu est annulé sur la boucle du pool (onglet
+        fermé, slot libéré) et TimeoutError est levée.
+        """
+        loop = self._ensure_loop()
+        future = asyncio.run_coroutine_threadsafe(self._render(url, actions, goto_timeout), loop)
+        try:
+            return future.result(timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            self.stats['timeouts'] += 1
+            raise
+
+    async def _render(self, url, actions, goto_timeout):
+        if self._tabs is None:
+            self._tabs = asyncio.Semaphore(self.max_tabs)
+            self._launch_lock = asyncio.Lock()
+
+        async with self._tabs:
+            browser = await self._get_browser()
+            self._open_contexts[browser] = self._open_contexts.get(browser, 0) + 1
+            context = None
+            try:
+                context = await browser.new_context()
+                page = await context.new_page()
+                await page.goto(url, wait_until="domcontentloaded", timeout=goto_timeout)
+                if actions:
+                    await actions(page)
+                html = await page.content()
+                self.stats['pages_rendered'] += 1
+                return html
+            except Exception:
+                self.stats['errors'] += 1
+                raise
+            finally:
+                if context is not None:
+                    try:
+                        await context.close()
+                    except Exception:
+                        pass
+                self._open_contexts[browser] -= 1
+                await self._maybe_recycle(browser)
+
+    async def _get_browser(self):
+        async with self._launch_lock:
+            if self._browser is not None and not self._browser.is_connected():
+                print("⚠️ Navigateur déconnecté, relance...")
+                self._open_contexts.pop(self._browser, None)
+                self._browser = None
+
+            if self._browser is None:
+                if self._playwright is None:
+                    from playwright.async_api import async_playwright
+                    self._playwright = await async_playwright().start()
+                self._browser = await self._playwright.chromium.launch(headless=self.headless,
+                                                                       args=LAUNCH_ARGS)
+                self._browser_pages = 0
+                self.stats['launches'] += 1
+                print(f"🎭 Navigateur Chromium lancé (pool, lancement #{self.stats['launches']})")
+
+            self._browser_pages += 1
+            return self._browser
+
+    def _chromium_memory_mb(self):
+        """Mémoire RSS cumulée des processus enfants (driver + Chromium), en Mo."""
+        if not PSUTIL_AVAILABLE:
+            return 0
+        try:
+            children = psutil.Process().children(recursive=True)
+            return sum(child.memory_info().rss for child in children) / 1024 / 1024
+        except Exception:
+            return 0
+
+    async def _maybe_recycle(self, browser):
+        if browser is self._browser:
+            too_many_pages = self._browser_pages >= self.max_pages_per_browser
+            memory_mb = self._chromium_memory_mb()
+            too_much_memory = self.max_memory_mb and memory_mb > self.max_memory_mb
+            if too_many_pages or too_much_memory:
+                reason = f"{self._browser_pages} pages" if too_many_pages else f"{memory_mb:.0f} Mo"
+                print(f"♻️ Recyclage du navigateur ({reason})")
+                self._retiring.append(browser)
+                self._browser = None
+                self.stats['recycles'] += 1
+
+        # Fermer les navigateurs retirés qui n'ont plus d'onglet ouvert
+        for old in list(self._retiring):
+            if self._open_contexts.get(old, 0) <= 0:
+                self._retiring.remove(old)
+                self._open_contexts.pop(old, None)
+                try:
+                    await old.close()
+                except Exception:
+                    pass
+
+    async def _shutdown(self):
+        for browser in self._retiring + ([self._browser] if self._browser else []):
+            try:
+                await browser.close()
+            except Exception:
+                pass
+        self._retiring = []
+        self._browser = None
+        self._open_contexts = {}
+        if self._playwright is not None:
+            try:
+                await self._playwright.stop()
+            except Exception:
+                pass
+            self._playwright = None
+
+    def close(self, timeout=30):
+        """Ferme proprement le navigateur, Playwright et la boucle du pool."""
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = None
+            self._thread = None
+        if loop is None:
+            return
+        try:
+            asyncio.run_coroutine_threadsafe(self._shutdown(), loop).result(timeout)
+        except Exception as e:
+            print(f"⚠️ Erreur fermeture du pool navigateur: {e}")
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout)
+        loop.close()
+        self._tabs = None
+        self._launch_lock = None
+
+    def get_stats(self):
+        return dict(self.stats, max_tabs=self.max_tabs,
+                    pages_on_current_browser=self._browser_pages if self._browser else 0)
+
+
+_default_pool = None
+_default_pool_lock = threading.Lock()
+
+
+def get_browser_pool():
+    """Pool partagé par tout le processus, fermé automatiquement à la sortie."""
+    global _default_pool
+    with _default_pool_lock:
+        if _default_pool is None:
+            _default_pool = BrowserPool()
+            atexit.register(_default_pool.close)
+        return _default_pool
@@ -0,0 +1,137 @@
+# scrapers/feed_fetcher.py - Récupération concurrente des flux RSS avec GET conditionnel
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import feedparser
+import requests
+from requests.adapters import HTTPAdapter
+
+
+class FeedResult:
+    """Résultat de la récupération d'un flux : ok, not_modified (304) ou error."""
+
+    def __init__(self, url, status, feed=None, error=None, duration=0.0, http_status=None,
+                 validators=None):
+        self.url = url
+        self.status = status
+        self.feed = feed
+        self.error = error
+        self.duration = duration
+        self.http_status = http_status
+        # Nouveaux validateurs ETag / Last-Modified, appliqués par FeedFetcher.commit_validators()
+        self.validators = validators
+
+    @property
+    def entries(self):
+        return self.feed.entries if self.feed is not None else []
+
+
+class FeedFetcher:
+    """
+    Télécharge tous les flux en parallèle sur une session HTTP partagée (keep-alive),
+    avec un timeout par flux. Les validateurs ETag / Last-Modified sont conservés entre
+    les runs (JSON) : un flux inchangé répond 304 et n'est ni retéléchargé ni parsé.
+    Les validateurs d'un passage ne sont enregistrés qu'à `commit_validators()` : tant
+    que ses entrées ne sont pas stockées, le flux est retéléchargé en entier.
+    """
+
+    def __init__(self, validators_path="data/rss_validators.json", timeout=10,
+                 connect_timeout=5, max_workers=16, session=None, headers=None):
+        self.validators_path = validators_path
+        self.timeout = timeout
+        self.connect_timeout = connect_timeout
+        self.max_workers = max_workers
+        self.session = session or self._build_session(max_workers, headers)
+        self._lock = threading.Lock()
+        self.validators = self._load_validators()
+
+    @staticmethod
+    def _build_session(pool_size, headers=None):
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        session.headers.update(headers or {"User-Agent": "Mozilla/5.0 (compatible; OpportunityTracker RSS)"})
+        return session
+
+    def _load_validators(self):
+        if self.validators_path and os.path.exists(self.validators_path):
+            try:
+                with open(self.validators_path, "r", encoding="utf-8") as f:
+                    return json.load(f)
+            except (OSError, ValueError):
+                pass
+        return {}
+
+    def save_validators(self):
+        if not self.validators_path:
+            return
+        directory = os.path.dirname(self.validators_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._lock:
+            tmp_path = f"{self.validators_path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self.validators, f, indent=2)
+            os.replace(tmp_path, self.validators_path)
+
+    def _conditional_headers(self, url):
+        with self._lock:
+            validators = self.validators.get(url, {})
+        headers = {}
+        if validators.get("etag"):
+            headers["If-None-Match"] = validators["etag"]
+        if validators.get("last_modified"):
+            headers["If-Modified-Since"] = validators["last_modified"]
+        return headers
+
+    def fetch(self, url):
+        """Récupère et parse un flux ; ne lève jamais d'exception."""
+        start = time.time()
+        http_status = None
+        try:
+            response = self.session.get(url, headers=self._conditional_headers(url),
+                                        timeout=(self.connect_timeout, self.timeout))
+            http_status = response.status_code
+            if response.status_code == 304:
+                return FeedResult(url, "not_modified", duration=time.time() - start, http_status=304)
+            response.raise_for_status()
+
+            feed = feedparser.parse(response.content, response_headers=dict(response.headers))
+            validators = {
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+            }
+            return FeedResult(url, "ok", feed=feed, duration=time.time() - start, http_status=http_status,
+                              validators=validators)
+        except Exception as e:
+            return FeedResult(url, "error", error=str(e), duration=time.time() - start,
+                              http_status=http_status)
+
+    def fetch_all(self, urls, commit=True):
+        """
+        Récupère tous les flux en parallèle ; retourne {url: FeedResult} dans l'ordre d'entrée.
+        commit=False : les validateurs ne sont enregistrés qu'au `commit_validators(results)`.
+        """
+        if not urls:
+            return {}
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(urls))) as executor:
+            results = dict(zip(urls, executor.map(self.fetch, urls)))
+        if commit:
+            self.commit_validators(results.values())
+        return results
+
+    def commit_validators(self, results):
+        """Enregistre les validateurs des flux récupérés (200) une fois leurs entrées stockées."""
+        with self._lock:
+            for result in results:
+                if result.status != "ok" or result.validators is None:
+                    continue
+                if result.validators["etag"] or result.validators["last_modified"]:
+                    self.validators[result.url] = result.validators
+                else:
+                    self.validators.pop(result.url, None)
+        self.save_validators()
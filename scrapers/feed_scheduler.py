@@ -0,0 +1,236 @@
+# scrapers/feed_scheduler.py - Polling adaptatif par flux RSS + suivi de santé
+import json
+import os
+import random
+import threading
+import time
+
+from scrapers.feed_watermark import FeedWatermarks, entry_timestamp, oldest_entries
+
+
+class FeedScheduler:
+    """
+    Planifie chaque flux selon son rythme de publication observé.
+
+    - L'intervalle de polling suit une moyenne mobile exponentielle (EWMA) de la moitié
+      de l'écart moyen entre publications, bornée par [min_interval, max_interval].
+      Un 304 (rien de neuf) ralentit progressivement le flux.
+    - Chaque prochain passage reçoit un jitter pour ne pas synchroniser les flux.
+    - Santé : un flux en erreur (timeout, 4xx, 5xx) recule de façon exponentielle
+      jusqu'à max_backoff au lieu de coûter un timeout à chaque run.
+    """
+
+    def __init__(self, fetcher, feeds, state_path="data/rss_schedule.json", min_interval=300,
+                 max_interval=6 * 3600, default_interval=3600, alpha=0.3, jitter=0.1,
+                 max_backoff=24 * 3600, dead_after=3, watermarks=None):
+        self.fetcher = fetcher
+        self.feeds = list(feeds)
+        # Marques d'ingestion : seules les entrées jamais vues sont renvoyées
+        self.watermarks = watermarks or FeedWatermarks(path=None)
+        self.state_path = state_path
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.default_interval = default_interval
+        self.alpha = alpha
+        self.jitter = jitter
+        self.max_backoff = max_backoff
+        self.dead_after = dead_after
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self.state = self._load()
+
+    # --- Persistance ---
+
+    def _load(self):
+        if self.state_path and os.path.exists(self.state_path):
+            try:
+                with open(self.state_path, "r", encoding="utf-8") as f:
+                    return json.load(f)
+            except (OSError, ValueError):
+                pass
+        return {}
+
+    def save(self):
+        if not self.state_path:
+            return
+        directory = os.path.dirname(self.state_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._lock:
+            tmp_path = f"{self.state_path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self.state, f, indent=2)
+            os.replace(tmp_path, self.state_path)
+
+    def _feed_state(self, url):
+        return self.state.setdefault(url, {
+            'interval': self.default_interval, 'next_poll': 0, 'last_polled': 0,
+            'failures': 0, 'health': 'ok', 'last_error': None,
+        })
+
+    # --- Planification ---
+
+    def _clamp(self, interval):
+        return max(self.min_interval, min(self.max_interval, interval))
+
+    def _with_jitter(self, delay):
+        return delay * (1 + random.uniform(-self.jitter, self.jitter))
+
+    def learn_interval(self, url, timestamps):
+        """Met à jour l'intervalle d'un flux à partir des dates de ses entrées."""
+        with self._lock:
+            return self._learn_interval(self._feed_state(url), timestamps)
+
+    def _learn_interval(self, state, timestamps):
+        recent = sorted((ts for ts in timestamps if ts), reverse=True)[:20]
+        if len(recent) >= 2 and recent[0] > recent[-1]:
+            mean_gap = (recent[0] - recent[-1]) / (len(recent) - 1)
+            target = mean_gap / 2   # Deux passages par période de publication
+        else:
+            target = state['interval'] * 1.5
+        state['interval'] = self._clamp(self.alpha * target + (1 - self.alpha) * state['interval'])
+        return state['interval']
+
+    def due(self, now=None):
+        now = now or time.time()
+        with self._lock:
+            return [url for url in self.feeds if self._feed_state(url)['next_poll'] <= now]
+
+    def next_wakeup(self):
+        with self._lock:
+            return min((self._feed_state(url)['next_poll'] for url in self.feeds), default=0)
+
+    def _evaluate(self, result, now):
+        """(nouvel état du flux, entrées nouvelles) après un passage ; `self.state` n'est pas modifié."""
+        url = result.url
+        with self._lock:
+            state = dict(self._feed_state(url))
+
+        if result.status == 'error':
+            # Un 4xx (flux supprimé, accès refusé) est peu susceptible de revenir vite
+            state['failures'] += 2 if result.http_status and 400 <= result.http_status < 500 else 1
+            state['health'] = 'dead' if state['failures'] >= self.dead_after else 'degraded'
+            state['last_error'] = result.error
+            backoff = min(self.min_interval * 2 ** state['failures'], self.max_backoff)
+            state['last_polled'] = now
+            state['next_poll'] = now + self._with_jitter(backoff)
+            return state, []
+
+        new_entries = []
+        if result.status == 'ok':
+            self._learn_interval(state, [entry_timestamp(entry) for entry in result.entries])
+            new_entries = self.watermarks.filter_new(url, result.entries)
+        else:
+            # 304 : rien de neuf, le flux est ralenti
+            self._learn_interval(state, [])
+
+        state.update(failures=0, health='ok', last_error=None, last_polled=now)
+        state['next_poll'] = now + self._with_jitter(state['interval'])
+        return state, new_entries
+
+    def record_result(self, result, now=None):
+        """
+        Met à jour santé et prochain passage ; retourne les entrées nouvelles du flux.
+        Les entrées ne sont marquées vues qu'au `mark_seen()`, une fois stockées.
+        """
+        state, new_entries = self._evaluate(result, now or time.time())
+        with self._lock:
+            self.state[result.url] = state
+        return new_entries
+
+    def poll(self, now=None, max_entries=None):
+        """
+        Récupère les flux dus sans rien enregistrer. Retourne ({url: nouvelles entrées}, passage) ;
+        `commit(passage)` applique planning, validateurs et marques une fois les entrées stockées.
+        Un run interrompu avant laisse les flux dus, retéléchargés en entier au run suivant.
+
+        max_entries : au plus autant d'entrées par flux, les plus anciennes ; seules celles-ci
+        seront marquées vues, et le flux tronqué garde ses anciens validateurs pour que le
+        reste soit récupéré au passage suivant.
+        """
+        now = now or time.time()
+        urls = self.due(now)
+        if not urls:
+            return {}, None
+        results = self.fetcher.fetch_all(urls, commit=False)
+        states, new_entries, truncated = {}, {}, set()
+        for url in urls:
+            states[url], entries = self._evaluate(results[url], now)
+            kept = oldest_entries(entries, max_entries)
+            if len(kept) < len(entries):
+                truncated.add(url)
+            if kept:
+                new_entries[url] = kept
+        validated = {url: result for url, result in results.items() if url not in truncated}
+        return new_entries, {'states': states, 'results': validated, 'entries': new_entries}
+
+    def commit_schedule(self, pending):
+        """Applique et sauvegarde le planning (prochains passages, santé) d'un passage."""
+        if not pending:
+            return
+        with self._lock:
+            self.state.update(pending['states'])
+        self.save()
+
+    def commit(self, pending):
+        """Passage stocké : planning, validateurs HTTP et marques d'ingestion avancent."""
+        if not pending:
+            return
+        self.commit_schedule(pending)
+        self.fetcher.commit_validators(pending['results'].values())
+        self.mark_seen(pending['entries'])
+
+    def poll_once(self, now=None, max_entries=None):
+        """poll + commit immédiat ; retourne {url: nouvelles entrées} (flux sans nouveauté omis)."""
+        new_entries, pending = self.poll(now, max_entries)
+        self.commit(pending)
+        return new_entries
+
+    def mark_seen(self, new_entries):
+        """Marque comme vues les entrées {url: entrées} d'un passage stocké et sauvegarde les marques."""
+        for url, entries in new_entries.items():
+            self.watermarks.mark_seen(url, entries)
+        self.watermarks.save()
+
+    # --- Exécution en tâche de fond ---
+
+    def start(self, on_entries, max_sleep=60, max_entries=None):
+        """
+        Lance le polling en arrière-plan ; `on_entries({url: entrées})` reçoit les nouveautés.
+        Elles (et les validateurs HTTP) ne sont enregistrées que si le callback se termine sans erreur.
+        """
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+
+        def loop():
+            while not self._stop.is_set():
+                try:
+                    new_entries, pending = self.poll(max_entries=max_entries)
+                    try:
+                        if new_entries:
+                            on_entries(new_entries)
+                    except Exception:
+                        # Lot non stocké : le rythme est gardé, mais entrées et validateurs
+                        # restent à revoir au prochain passage du flux
+                        self.commit_schedule(pending)
+                        raise
+                    self.commit(pending)
+                except Exception as e:
+                    print(f"⚠️ Erreur du planificateur RSS: {e}")
+                wait = self.next_wakeup() - time.time()
+                self._stop.wait(max(1, min(wait, max_sleep)))
+
+        self._thread = threading.Thread(target=loop, name="feed-scheduler", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=10):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout)
+
+    def get_status(self):
+        with self._lock:
+            return {url: {k: self._feed_state(url)[k] for k in ('interval', 'next_poll', 'health', 'failures')}
+                    for url in self.feeds}
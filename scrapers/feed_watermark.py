@@ -0,0 +1,125 @@
+# scrapers/feed_watermark.py - High-water mark par flux RSS (date + GUID déjà vus)
+import calendar
+import hashlib
+import json
+import os
+import threading
+from collections import deque
+
+
+def entry_timestamp(entry):
+    """Horodatage UTC (epoch) d'une entrée feedparser, ou None."""
+    parsed = entry.get('published_parsed') or entry.get('updated_parsed')
+    return calendar.timegm(parsed) if parsed else None
+
+
+def entry_guid(entry):
+    """Identifiant stable d'une entrée : id/guid du flux, sinon lien, sinon hash du titre."""
+    guid = entry.get('id') or entry.get('guid') or entry.get('link')
+    if guid:
+        return guid
+    return hashlib.sha1((entry.get('title') or '').encode('utf-8')).hexdigest()
+
+
+def oldest_entries(entries, limit):
+    """
+    Les `limit` entrées les plus anciennes (ordre du flux conservé). Marquer un lot tronqué
+    ne fait alors jamais passer la marque au-dessus d'une entrée pas encore traitée.
+    """
+    if limit is None or len(entries) <= limit:
+        return entries
+    kept = set(sorted(range(len(entries)), key=lambda i: entry_timestamp(entries[i]) or 0)[:limit])
+    return [entry for i, entry in enumerate(entries) if i in kept]
+
+
+class FeedWatermarks:
+    """
+    Filtre d'ingestion incrémentale, persistant entre les runs (JSON).
+
+    Pour chaque flux : date de publication la plus récente déjà traitée et ensemble borné
+    (max_guids, FIFO) des GUID vus. Une entrée est nouvelle si son GUID est inconnu et
+    qu'elle n'est pas plus ancienne que la marque (les entrées sans date ne sont jugées
+    que sur leur GUID).
+    """
+
+    def __init__(self, path="data/rss_watermarks.json", max_guids=500):
+        self.path = path
+        self.max_guids = max_guids
+        self._lock = threading.Lock()
+        self.marks = {}
+        for url, mark in self._load().items():
+            self.marks[url] = {
+                'published': mark.get('published'),
+                'guids': deque(mark.get('guids', []), maxlen=max_guids),
+            }
+        self._seen = {url: set(mark['guids']) for url, mark in self.marks.items()}
+
+    def _load(self):
+        if self.path and os.path.exists(self.path):
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    return json.load(f)
+            except (OSError, ValueError):
+                pass
+        return {}
+
+    def save(self):
+        if not self.path:
+            return
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._lock:
+            data = {url: {'published': mark['published'], 'guids': list(mark['guids'])}
+                    for url, mark in self.marks.items()}
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.path)
+
+    def _mark(self, url):
+        if url not in self.marks:
+            self.marks[url] = {'published': None, 'guids': deque(maxlen=self.max_guids)}
+            self._seen[url] = set()
+        return self.marks[url]
+
+    def filter_new(self, url, entries):
+        """Entrées jamais vues et pas plus anciennes que la marque du flux (ordre conservé)."""
+        with self._lock:
+            mark = self._mark(url)
+            seen = self._seen[url]
+            watermark = mark['published']
+            new_entries, batch_guids = [], set()
+            for entry in entries:
+                guid = entry_guid(entry)
+                if guid in seen or guid in batch_guids:
+                    continue
+                ts = entry_timestamp(entry)
+                if ts is not None and watermark is not None and ts < watermark:
+                    continue
+                batch_guids.add(guid)
+                new_entries.append(entry)
+            return new_entries
+
+    def mark_seen(self, url, entries):
+        """Avance la marque et mémorise les GUID (les plus anciens sortent de l'ensemble)."""
+        with self._lock:
+            mark = self._mark(url)
+            seen = self._seen[url]
+            for entry in entries:
+                guid = entry_guid(entry)
+                if guid in seen:
+                    continue
+                if len(mark['guids']) == self.max_guids:
+                    seen.discard(mark['guids'][0])
+                mark['guids'].append(guid)
+                seen.add(guid)
+                ts = entry_timestamp(entry)
+                if ts is not None and (mark['published'] is None or ts > mark['published']):
+                    mark['published'] = ts
+
+    def take_new(self, url, entries):
+        """filter_new + mark_seen : retourne les nouvelles entrées et les marque comme vues."""
+        new_entries = self.filter_new(url, entries)
+        self.mark_seen(url, new_entries)
+        return new_entries
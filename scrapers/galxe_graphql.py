@@ -0,0 +1,166 @@
+# scrapers/galxe_graphql.py - Client GraphQL natif Galxe (sans rendu JS ScraperAPI)
+import requests
+import json
+import os
+
+GRAPHQL_URL = "https://graphigo.prd.galaxy.eco/query"
+SCHEMA_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'galxe_schema.json'))
+
+# Champs demandés : uniquement ce dont process_opportunities a besoin (titre, lien, récompense, dates)
+CAMPAIGN_FIELDS = {
+    'Campaign': ['id', 'name', 'type', 'status', 'startTime', 'endTime', 'rewardName', 'loyaltyPoints'],
+    'Space': ['alias', 'name'],
+    'TokenReward': ['userTokenAmount', 'tokenDecimal', 'tokenSymbol'],
+}
+
+_schema_types = None
+
+
+def load_schema_types(path=SCHEMA_PATH):
+    """Charge (une seule fois) les champs de chaque type depuis le dump d'introspection."""
+    global _schema_types
+    if _schema_types is None:
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                schema = json.load(f)['data']['__schema']
+            _schema_types = {
+                t['name']: {field['name'] for field in (t.get('fields') or [])}
+                for t in schema['types']
+            }
+        except Exception as e:
+            print(f"⚠️ Schéma Galxe illisible ({e}), sélection de champs non vérifiée")
+            _schema_types = {}
+    return _schema_types
+
+
+def select_fields(type_name):
+    """Retourne les champs demandés pour un type, limités à ceux présents dans le schéma."""
+    wanted = CAMPAIGN_FIELDS[type_name]
+    known = load_schema_types().get(type_name)
+    if not known:
+        return wanted
+    missing = [f for f in wanted if f not in known]
+    if missing:
+        print(f"⚠️ Champs absents du schéma {type_name}: {missing}")
+    return [f for f in wanted if f in known]
+
+
+class GalxeGraphQLClient:
+    """
+    Récupère les campagnes Galxe directement via l'API GraphQL.
+
+    Une seule requête HTTP par page transporte plusieurs listes (une par `list_types`)
+    grâce aux alias GraphQL ; chaque liste avance avec son propre curseur.
+    """
+
+    def __init__(self, session=None, list_types=("Trending", "Newest"), per_page=50, timeout=20):
+        self.session = session or requests.Session()
+        self.list_types = list(list_types)
+        self.per_page = per_page
+        self.timeout = timeout
+        self.headers = {
+            "Content-Type": "application/json",
+            "Origin": "https://app.galxe.com",
+            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+        }
+        self.requests_made = 0
+
+    def build_query(self, list_types):
+        """Construit une requête aliasée : une liste de campagnes par type de liste."""
+        campaign = ' '.join(select_fields('Campaign'))
+        space = ' '.join(select_fields('Space'))
+        token = ' '.join(select_fields('TokenReward'))
+        variables = ' '.join(f"$after{i}: String" for i in range(len(list_types)))
+        blocks = []
+        for i, list_type in enumerate(list_types):
+            blocks.append(
+                f"l{i}: campaigns(input: {{listType: {list_type}, statuses: [Active], "
+                f"first: {self.per_page}, after: $after{i}}}) {{ "
+                f"pageInfo {{ endCursor hasNextPage }} "
+                f"list {{ {campaign} space {{ {space} }} tokenReward {{ {token} }} }} }}"
+            )
+        return f"query ExploreCampaigns({variables}) {{ {' '.join(blocks)} }}"
+
+    def _post(self, query, variables):
+        response = self.session.post(GRAPHQL_URL, json={"query": query, "variables": variables},
+                                     headers=self.headers, timeout=self.timeout)
+        self.requests_made += 1
+        response.raise_for_status()
+        payload = response.json()
+        if payload.get('errors') and not payload.get('data'):
+            raise Exception(f"GraphQL: {payload['errors'][0].get('message', payload['errors'])}")
+        return payload.get('data') or {}
+
+    def fetch_campaigns(self, pages=1, stop=None):
+        """
+        Parcourt `pages` pages de chaque liste (pagination par curseur) et retourne les campagnes brutes.
+        stop : threading.Event testé avant chaque page (source abandonnée par l'exécuteur).
+        """
+        campaigns = {}
+        cursors = {list_type: None for list_type in self.list_types}
+
+        for page_num in range(1, pages + 1):
+            active = [lt for lt in self.list_types if lt in cursors]
+            if not active or (stop is not None and stop.is_set()):
+                break
+
+            query = self.build_query(active)
+            variables = {f"after{i}": cursors[lt] for i, lt in enumerate(active)}
+            data = self._post(query, variables)
+
+            for i, list_type in enumerate(active):
+                connection = data.get(f"l{i}") or {}
+                for campaign in connection.get('list') or []:
+                    campaigns.setdefault(campaign['id'], campaign)
+
+                page_info = connection.get('pageInfo') or {}
+                if page_info.get('hasNextPage') and page_info.get('endCursor'):
+                    cursors[list_type] = page_info['endCursor']
+                else:
+                    del cursors[list_type]
+
+            print(f"📄 GraphQL page {page_num}: {len(campaigns)} campagnes uniques")
+
+        return list(campaigns.values())
+
+    @staticmethod
+    def _format_reward(campaign):
+        token = campaign.get('tokenReward') or {}
+        amount = token.get('userTokenAmount')
+        symbol = token.get('tokenSymbol')
+        if amount and symbol:
+            try:
+                value = int(amount) / (10 ** int(token.get('tokenDecimal') or 0))
+                if value > 0:
+                    return f"{value:g} {symbol}"
+            except (TypeError, ValueError):
+                pass
+        if campaign.get('loyaltyPoints'):
+            return f"{campaign['loyaltyPoints']} POINTS"
+        return campaign.get('rewardName') or ""
+
+    def parse_campaigns(self, campaigns):
+        """Transforme les campagnes GraphQL au même format que le parsing HTML."""
+        quests = []
+        for campaign in campaigns:
+            space = campaign.get('space') or {}
+            alias = space.get('alias')
+            if alias:
+                link = f"https://app.galxe.com/quest/{alias}/{campaign['id']}"
+            else:
+                link = f"https://app.galxe.com/quest/{campaign['id']}"
+
+            quest = {
+                "id": campaign['id'],
+                "title": (campaign.get('name') or f"Campaign {campaign['id']}")[:100],
+                "link": link,
+                "source": "Galxe",
+                "space": space.get('name', ''),
+                "start_time": campaign.get('startTime') or "",
+                "end_time": campaign.get('endTime') or "",
+            }
+            reward = self._format_reward(campaign)
+            if reward:
+                quest["reward"] = reward
+            quests.append(quest)
+        return quests
@@ -0,0 +1,149 @@
+# scrapers/galxe_parser.py - Parsing rapide des pages explore Galxe
+try:
+    import lxml.html
+    LXML_AVAILABLE = True
+except ImportError:
+    from bs4 import BeautifulSoup
+    LXML_AVAILABLE = False
+
+GRID_CLASS = "GridFlowContainer_grid-flow__m_iqK"
+QUEST_PATHS = ('/space/', '/quest/', '/campaign/')
+
+# Stratégies équivalentes à l'ancienne liste de sélecteurs, par ordre de priorité :
+#   grid -> "div.GridFlowContainer... > *"   card -> "div[class*='card'|'Card']"
+#   item -> "div[class*='item'|'Item']"       link -> "a[href*='/space/'|...]"
+STRATEGIES = ('grid', 'card', 'item', 'link')
+
+
+class GalxeQuestParser:
+    """
+    Extrait les quêtes d'une page Galxe en un seul parcours des liens du document.
+
+    Chaque lien pertinent est classé selon les stratégies qu'il satisfait ; la stratégie
+    retenue est la première (par priorité) qui produit des résultats, en commençant par
+    celle qui a fonctionné la dernière fois pour le même type de page.
+    """
+
+    def __init__(self, max_title_length=100, normalize_whitespace=False):
+        self.max_title_length = max_title_length
+        self.normalize_whitespace = normalize_whitespace
+        self.preferred_strategy = {}    # type de page -> dernière stratégie gagnante
+        self.backend = "lxml" if LXML_AVAILABLE else "html.parser"
+
+    @staticmethod
+    def page_type(url):
+        """Type de page utilisé pour mémoriser la stratégie (ex: 'explore', 'space')."""
+        if not url:
+            return "default"
+        path = url.split('://', 1)[-1].split('/', 1)[-1].split('?', 1)[0]
+        return path.split('/', 1)[0] or "default"
+
+    def _clean_title(self, text):
+        text = text.strip()
+        if self.normalize_whitespace:
+            text = ' '.join(text.split())
+        return text[:self.max_title_length]
+
+    @staticmethod
+    def _build_link(href):
+        if href.startswith('/'):
+            return "https://galxe.com" + href
+        elif href.startswith('http'):
+            return href
+        return "https://galxe.com/" + href
+
+    def _iter_anchors(self, html):
+        """
+        Parcourt les liens du document et produit (href, texte du lien, texte de l'élément, stratégies).
+        L'élément est l'enfant direct du grid si le lien y est contenu, sinon le lien lui-même.
+        """
+        if LXML_AVAILABLE:
+            try:
+                root = lxml.html.fromstring(html)
+            except ValueError:
+                # Déclaration d'encodage XML dans une chaîne unicode
+                root = lxml.html.fromstring(html.encode('utf-8'))
+            anchors = root.iter('a')
+            get_class = lambda el: el.get('class') or ''
+            get_text = lambda el: el.text_content()
+            get_parents = lambda el: el.iterancestors()
+            get_tag = lambda el: el.tag
+        else:
+            soup = BeautifulSoup(html, 'html.parser')
+            anchors = soup.find_all('a', href=True)
+            get_class = lambda el: ' '.join(el.get('class') or [])
+            get_text = lambda el: el.get_text()
+            get_parents = lambda el: el.parents
+            get_tag = lambda el: el.name
+
+        for anchor in anchors:
+            href = anchor.get('href') or ''
+            if not href or not any(path in href for path in QUEST_PATHS):
+                continue
+
+            strategies = {'link'}
+            item = anchor
+            child = anchor
+            for ancestor in get_parents(anchor):
+                if get_tag(ancestor) != 'div':
+                    child = ancestor
+                    continue
+                css = get_class(ancestor)
+                if GRID_CLASS in css.split():
+                    strategies.add('grid')
+                    item = child
+                    break
+                if 'card' in css or 'Card' in css:
+                    strategies.add('card')
+                if 'item' in css or 'Item' in css:
+                    strategies.add('item')
+                child = ancestor
+
+            link_text = get_text(anchor)
+            item_text = get_text(item) if item is not anchor else ""
+            yield href, link_text, item_text, strategies
+
+    def parse(self, html, url=None):
+        """Parse le HTML et retourne la liste des quêtes uniques."""
+        if not html:
+            return []
+
+        page_type = self.page_type(url)
+        candidates = {strategy: [] for strategy in STRATEGIES}
+        for href, link_text, item_text, strategies in self._iter_anchors(html):
+            for strategy in strategies:
+                candidates[strategy].append((href, link_text, item_text))
+
+        preferred = self.preferred_strategy.get(page_type)
+        order = ([preferred] if preferred else []) + [s for s in STRATEGIES if s != preferred]
+        chosen = next((s for s in order if candidates[s]), None)
+        if not chosen:
+            print("❌ No quest items found with any strategy")
+            return []
+
+        if chosen != preferred:
+            self.preferred_strategy[page_type] = chosen
+        print(f"✅ {len(candidates[chosen])} liens via la stratégie '{chosen}' ({self.backend})")
+
+        seen_links = set()
+        quests = []
+        for href, link_text, item_text in candidates[chosen]:
+            full_link = self._build_link(href)
+            if full_link in seen_links:
+                continue
+            seen_links.add(full_link)
+
+            title = ""
+            for candidate in (link_text, item_text):
+                candidate = self._clean_title(candidate)
+                if len(candidate) > 3:  # Reasonable title length
+                    title = candidate
+                    break
+
+            quests.append({
+                "title": title or f"Quest from {href}",
+                "link": full_link,
+                "source": "Galxe"
+            })
+
+        return quests
@@ -1,9 +1,8 @@
 # scrapers/galxe_scraper_enhanced.py
 import requests
 from datetime import datetime
-from diskcache import Cache
-from bs4 import BeautifulSoup
 
+import threading
 import time
 import json
 import os
@@ -11,9 +10,13 @@ import sys
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 from galxe_requests import ScraperAPIBalancer
+from scrapers.browser_pool import get_browser_pool
+from scrapers.galxe_graphql import GalxeGraphQLClient
+from scrapers.galxe_parser import GalxeQuestParser
+from scrapers.http_cache import ResponseCache
 
 # Cache disque pour éviter les requêtes répétées
-cache = Cache("galxe_cache", expire=3600)
+cache = ResponseCache("galxe_cache", ttl=3600)
 
 class GalxeScraperEnhanced:
     def __init__(self):
@@ -23,6 +26,10 @@ class GalxeScraperEnhanced:
         self.daily_requests = 0
         self.fallback_active = False
         self.stats_file = "scraper_stats.json"
+        # "graphql" (API directe, sans crédit de rendu) ou "html" (ScraperAPI/Playwright)
+        self.fetch_mode = os.getenv("GALXE_FETCH_MODE", "graphql")
+        self.graphql = GalxeGraphQLClient(session=self.session)
+        self.parser = GalxeQuestParser()
         self._load_daily_stats()
         
     def _load_daily_stats(self):
@@ -53,28 +60,33 @@ class GalxeScraperEnhanced:
     
     def get_scraping_method(self):
         """Détermine la méthode de scraping optimale"""
-        if self.daily_requests > 150:  # Seuil critique
-            print("🚨 Seuil critique atteint - Activation Playwright")
+        if self.balancer.pool_exhausted():  # Plus aucun compte du pool n'a de budget
+            print("🚨 Quota ScraperAPI épuisé sur tout le pool - Activation Playwright")
             self.fallback_active = True
             return "playwright"
-        elif self.fallback_active:
-            print("🔄 Mode fallback actif")
-            return "playwright"
         else:
+            # Le pool a de nouveau du budget (nouveau jour/mois) : retour à ScraperAPI
+            self.fallback_active = False
             return "scraperapi"
     
     def scrape_page(self, url, priority=False, max_retries=3):
         """Scrape une page avec retry et fallback intelligent"""
+        # Page déjà rendue récemment : aucun appel réseau ni crédit consommé
+        cached_html = cache.get_fresh(self._cache_key(url))
+        if cached_html is not None:
+            print(f"💾 Cache frais - {url}")
+            return self.parse_quests(cached_html, url=url)
+        
         method = self.get_scraping_method()
         
         for attempt in range(max_retries):
             try:
                 if method == "scraperapi":
                     html = self._scrape_with_api(url, priority, attempt)
-                    return self.parse_quests(html)
+                    return self.parse_quests(html, url=url)
                 else:
                     html = self._scrape_with_playwright(url, attempt)
-                    return self.parse_quests(html)
+                    return self.parse_quests(html, url=url)
                     
             except Exception as e:
                 print(f"❌ Tentative {attempt + 1}/{max_retries} échouée: {str(e)}")
@@ -83,9 +95,9 @@ class GalxeScraperEnhanced:
                     # Basculer vers Playwright en cas d'erreur API
                     if method == "scraperapi" and any(keyword in str(e).lower() 
                                                     for keyword in ["quota", "limit", "timeout", "timed out"]):
+                        # Bascule limitée à cette page : le mode global ne dépend que du quota du pool
                         print("🔄 Basculement vers Playwright")
                         method = "playwright"
-                        self.fallback_active = True
                     
                     # Délai progressif
                     wait_time = 2 ** attempt
@@ -111,174 +123,98 @@ class GalxeScraperEnhanced:
         
         print(f"🔄 ScraperAPI - Tentative {attempt + 1} - {url} - Compte {account_key[:8]}...")
         
-        response = self.session.get(
-            "http://api.scraperapi.com", 
+        status_code, text, origin = cache.fetch(
+            self.session,
+            "http://api.scraperapi.com",
+            key=self._cache_key(url),
             params=params,
-            timeout=120  # Timeout HTTP augmenté pour le contenu dynamique
+            timeout=120,  # Timeout HTTP augmenté pour le contenu dynamique
+            conditional_params={"keep_headers": "true"},  # Transmettre If-None-Match / If-Modified-Since
+            page_url=url
         )
         
-        if response.status_code == 200:
-            self.daily_requests += 1
-            self._save_daily_stats()
-            print(f"✅ ScraperAPI réussi - {len(response.text)} caractères")
-            return response.text
+        if status_code == 200:
+            if origin != "cache":
+                self.daily_requests += 1
+                self._save_daily_stats()
+            print(f"✅ ScraperAPI réussi ({origin}) - {len(text)} caractères")
+            return text
         else:
-            raise Exception(f"HTTP {response.status_code}: {response.text}")
+            raise Exception(f"HTTP {status_code}: {text}")
+
+    @staticmethod
+    def _cache_key(url):
+        """Clé du cache de réponses : une page rendue (ScraperAPI ou Playwright) par URL"""
+        return cache.make_key(url, variant="rendered")
     
     def _scrape_with_playwright(self, url, attempt=0):
-        """Scraping avec Playwright"""
+        """Scraping avec Playwright (navigateur persistant du pool partagé)"""
         try:
-            from playwright.sync_api import sync_playwright
-            
             print(f"🎭 Playwright - Tentative {attempt + 1} - {url}")
             
-            with sync_playwright() as p:
-                browser = p.chromium.launch(headless=True, args=['--no-sandbox', '--disable-dev-shm-usage'])
-                page = browser.new_page()
-                page.goto(url, wait_until="domcontentloaded", timeout=60000)
-                
-                try:
-                    # Wait for the main grid container
-                    page.wait_for_selector("div.GridFlowContainer_grid-flow__m_iqK", timeout=30000)
-                    # Wait a bit more for content to load
-                    page.wait_for_timeout(5000)
-                    # Try to wait for actual quest cards to appear
-                    page.wait_for_selector("div.GridFlowContainer_grid-flow__m_iqK > *", timeout=30000)
-                except Exception as e:
-                    print(f"⚠️  Grid container or quest items not found, trying anyway... Erreur: {e}")
-                    # Even if we can't find items, continue - sometimes they load after timeout
-                
-                page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-                time.sleep(3)
-                
-                html = page.content()
-                browser.close()
-                
-                print(f"✅ Playwright réussi - {len(html)} caractères")
-                return html
+            html = get_browser_pool().render(url, actions=self._wait_for_quest_grid)
+            cache.record_miss()
+            cache.store(self._cache_key(url), html, url=url)
+            
+            print(f"✅ Playwright réussi - {len(html)} caractères")
+            return html
                 
         except Exception as e:
             print(f"❌ Playwright échoué: {str(e)}")
             raise
 
-    def parse_quests(self, html):
-        """Parse le HTML pour extraire les données des quêtes en JSON."""
-        if not html:
-            return []
-        soup = BeautifulSoup(html, 'html.parser')
-        quests = []
-        
-        # Debug: Print some HTML to understand the structure
-        print(f"🔍 Analyzing HTML structure...")
-        
-        # Look for the main grid container
-        grid_container = soup.select_one("div.GridFlowContainer_grid-flow__m_iqK")
-        if grid_container:
-            print(f"✅ Found grid container with {len(grid_container.find_all())} child elements")
-        else:
-            print("❌ Grid container not found")
-        
-        # Try multiple possible selectors for quest cards
-        selectors_to_try = [
-            # Grid items
-            "div.GridFlowContainer_grid-flow__m_iqK > div",
-            "div.GridFlowContainer_grid-flow__m_iqK > *",
-            # Card-like elements
-            "div[class*='card']",
-            "div[class*='Card']", 
-            "div[class*='item']",
-            "div[class*='Item']",
-            # Links to spaces/campaigns
-            "a[href*='/space/']",
-            "a[href*='/quest/']",
-            "a[href*='/campaign/']",
-            # Look for any links in the main content area
-            "main a[href]"
-        ]
-        
-        found_items = []
-        for selector in selectors_to_try:
-            items = soup.select(selector)
-            if items:
-                print(f"✅ Found {len(items)} items with selector: {selector}")
-                found_items.extend(items)
-                break  # Use the first working selector
-        
-        if not found_items:
-            print("❌ No quest items found with any selector")
-            # Debug: show some sample HTML
-            print("Sample HTML structure:")
-            main_content = soup.select_one("main")
-            if main_content:
-                print(main_content.prettify()[:1000] + "...")
-            return []
+    @staticmethod
+    async def _wait_for_quest_grid(page):
+        """Attend le chargement du grid de quêtes puis scrolle pour déclencher le lazy-loading"""
+        try:
+            # Wait for the main grid container
+            await page.wait_for_selector("div.GridFlowContainer_grid-flow__m_iqK", timeout=30000)
+            # Wait a bit more for content to load
+            await page.wait_for_timeout(5000)
+            # Try to wait for actual quest cards to appear
+            await page.wait_for_selector("div.GridFlowContainer_grid-flow__m_iqK > *", timeout=30000)
+        except Exception as e:
+            print(f"⚠️  Grid container or quest items not found, trying anyway... Erreur: {e}")
+            # Even if we can't find items, continue - sometimes they load after timeout
         
-        # Extract quest information from found items
-        for item in found_items:
+        await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
+        await page.wait_for_timeout(3000)
+
+    def parse_quests(self, html, url=None):
+        """Parse le HTML pour extraire les données des quêtes en JSON."""
+        quests = self.parser.parse(html, url=url)
+        print(f"📊 {len(quests)} unique quêtes parsées.")
+        return quests
+
+    def scrape_with_graphql(self, pages=5, stop=None):
+        """Récupère les campagnes via l'API GraphQL (aucun rendu JS, aucun crédit ScraperAPI)"""
+        start_time = time.time()
+        campaigns = self.graphql.fetch_campaigns(pages=pages, stop=stop)
+        quests = self.graphql.parse_campaigns(campaigns)
+        print(f"✅ GraphQL: {len(quests)} campagnes en {time.time() - start_time:.2f}s")
+        return quests
+
+    def scrape_galxe_campaigns(self, pages=5, delay=3, stop=None):
+        """
+        Scrape plusieurs pages de campagnes Galxe (GraphQL, puis HTML en fallback).
+        stop : threading.Event levé quand la source est abandonnée ; testé avant chaque page.
+        """
+        stop = stop or threading.Event()
+        if self.fetch_mode == "graphql":
             try:
-                # Try to find a link
-                link_element = item if item.name == 'a' else item.select_one('a')
-                if not link_element:
-                    continue
-                    
-                href = link_element.get('href', '')
-                if not href:
-                    continue
-                    
-                # Only keep links that look like space/quest/campaign links  
-                if not any(path in href for path in ['/space/', '/quest/', '/campaign/']):
-                    continue
-                    
-                # Extract title
-                title = ""
-                # Try different ways to get the title
-                title_candidates = [
-                    link_element.get_text().strip(),
-                    item.get_text().strip() if item != link_element else "",
-                ]
-                
-                for candidate in title_candidates:
-                    if candidate and len(candidate) > 3:  # Reasonable title length
-                        title = candidate[:100]  # Limit title length
-                        break
-                
-                if not title:
-                    title = f"Quest from {href}"
-                
-                # Build full URL
-                if href.startswith('/'):
-                    full_link = "https://galxe.com" + href
-                elif href.startswith('http'):
-                    full_link = href
-                else:
-                    full_link = "https://galxe.com/" + href
-                
-                quests.append({
-                    "title": title,
-                    "link": full_link,
-                    "source": "Galxe"
-                })
-                
+                quests = self.scrape_with_graphql(pages=pages, stop=stop)
+                if quests or stop.is_set():
+                    return quests
+                print("⚠️ GraphQL: aucune campagne, fallback vers le scraping HTML")
             except Exception as e:
-                print(f"⚠️  Error parsing item: {e}")
-                continue
+                print(f"❌ GraphQL échoué ({str(e)}), fallback vers le scraping HTML")
         
-        # Remove duplicates based on link
-        seen_links = set()
-        unique_quests = []
-        for quest in quests:
-            if quest['link'] not in seen_links:
-                seen_links.add(quest['link'])
-                unique_quests.append(quest)
-        
-        print(f"📊 {len(unique_quests)} unique quêtes parsées.")
-        return unique_quests
-
-    def scrape_galxe_campaigns(self, pages=5, delay=3):
-        """Scrape plusieurs pages de campagnes Galxe"""
         all_quests = []
         
         for page_num in range(1, pages + 1):
+            if stop.is_set():
+                print("🛑 Scraping Galxe interrompu (source abandonnée)")
+                break
             url = f"https://galxe.com/explore?page={page_num}"
             
             try:
@@ -286,10 +222,10 @@ class GalxeScraperEnhanced:
                 quests_data = self.scrape_page(url, priority=True)
                 all_quests.extend(quests_data)
                 
-                # Délai entre les pages
+                # Délai entre les pages (interrompu dès que la source est abandonnée)
                 if page_num < pages:
                     print(f"⏳ Pause {delay}s...")
-                    time.sleep(delay)
+                    stop.wait(delay)
                     
             except Exception as e:
                 print(f"❌ Échec page {page_num}: {str(e)}")
@@ -304,7 +240,11 @@ class GalxeScraperEnhanced:
             "fallback_active": self.fallback_active,
             "last_account_used": self.last_used_account[:8] if self.last_used_account else None,
             "scraping_method": self.get_scraping_method(),
-            "remaining_quota": 166 - self.daily_requests
+            "fetch_mode": self.fetch_mode,
+            "graphql_requests": self.graphql.requests_made,
+            "browser_pool": get_browser_pool().get_stats(),
+            "response_cache": cache.get_stats(),
+            "remaining_quota": self.balancer.remaining_quota()
         }
 
 
@@ -1,13 +1,20 @@
 # scrapers/galxe_scraper_py312.py
 import requests
 from datetime import datetime
-from bs4 import BeautifulSoup
+import threading
 import time
 import json
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from scrapers.browser_pool import get_browser_pool
+from scrapers.galxe_parser import GalxeQuestParser
 
 class GalxeScraperPy312:
     def __init__(self):
         self.session = requests.Session()
+        self.parser = GalxeQuestParser(max_title_length=150, normalize_whitespace=True)
         self.daily_requests = 0
         self.stats_file = "scraper_stats.json"
         self._load_daily_stats()
@@ -37,38 +44,15 @@ class GalxeScraperPy312:
             pass
     
     def scrape_page_with_playwright(self, url, max_retries=2):
-        """Scrape une page avec Playwright pour le contenu dynamique"""
+        """Scrape une page avec Playwright pour le contenu dynamique (navigateur du pool partagé)"""
         for attempt in range(max_retries):
             try:
-                from playwright.sync_api import sync_playwright
-                
                 print(f"🎭 Playwright - Tentative {attempt + 1} - {url}")
                 
-                with sync_playwright() as p:
-                    browser = p.chromium.launch(headless=True, args=['--no-sandbox', '--disable-dev-shm-usage'])
-                    page = browser.new_page()
-                    page.goto(url, wait_until="domcontentloaded", timeout=60000)
-                    
-                    try:
-                        # Attendre le container grid
-                        page.wait_for_selector("div.GridFlowContainer_grid-flow__m_iqK", timeout=30000)
-                        # Attendre le contenu dynamique
-                        page.wait_for_timeout(8000)
-                        # Essayer d'attendre les éléments de quête
-                        page.wait_for_selector("div.GridFlowContainer_grid-flow__m_iqK > *", timeout=25000)
-                        print("✅ Éléments détectés dans le grid!")
-                    except Exception as e:
-                        print(f"⚠️  Éléments non détectés dans le délai, continuons... {e}")
-                    
-                    # Scroll pour déclencher plus de contenu
-                    page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-                    time.sleep(3)
-                    
-                    html = page.content()
-                    browser.close()
-                    
-                    print(f"✅ Playwright réussi - {len(html)} caractères")
-                    return self.parse_quests(html)
+                html = get_browser_pool().render(url, actions=self._wait_for_quest_grid)
+                
+                print(f"✅ Playwright réussi - {len(html)} caractères")
+                return self.parse_quests(html, url=url)
                     
             except ImportError:
                 print("❌ Playwright non disponible, fallback vers requête simple")
@@ -82,6 +66,24 @@ class GalxeScraperPy312:
                     return self.scrape_page_simple(url)
         
         return []
+
+    @staticmethod
+    async def _wait_for_quest_grid(page):
+        """Attend le contenu dynamique du grid puis scrolle pour déclencher plus de contenu"""
+        try:
+            # Attendre le container grid
+            await page.wait_for_selector("div.GridFlowContainer_grid-flow__m_iqK", timeout=30000)
+            # Attendre le contenu dynamique
+            await page.wait_for_timeout(8000)
+            # Essayer d'attendre les éléments de quête
+            await page.wait_for_selector("div.GridFlowContainer_grid-flow__m_iqK > *", timeout=25000)
+            print("✅ Éléments détectés dans le grid!")
+        except Exception as e:
+            print(f"⚠️  Éléments non détectés dans le délai, continuons... {e}")
+        
+        # Scroll pour déclencher plus de contenu
+        await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
+        await page.wait_for_timeout(3000)
     
     def scrape_page_simple(self, url):
         """Scrape avec requête HTTP simple (fallback)"""
@@ -94,121 +96,29 @@ class GalxeScraperPy312:
             self._save_daily_stats()
             
             print(f"✅ Requête simple réussie - {len(response.text)} caractères")
-            return self.parse_quests(response.text)
+            return self.parse_quests(response.text, url=url)
         except Exception as e:
             print(f"❌ Requête simple échouée: {e}")
             return []
 
-    def parse_quests(self, html):
+    def parse_quests(self, html, url=None):
         """Parse le HTML pour extraire les données des quêtes"""
-        if not html:
-            return []
-        
-        soup = BeautifulSoup(html, 'html.parser')
-        quests = []
-        
-        print("🔍 Analyse du HTML...")
-        
-        # Vérifier le container grid
-        grid_container = soup.select_one("div.GridFlowContainer_grid-flow__m_iqK")
-        if grid_container:
-            child_count = len(grid_container.find_all())
-            print(f"✅ Container grid trouvé avec {child_count} éléments enfants")
-        else:
-            print("❌ Container grid non trouvé")
-        
-        # Sélecteurs à tester dans l'ordre de priorité
-        selectors_to_try = [
-            "div.GridFlowContainer_grid-flow__m_iqK > div",
-            "div.GridFlowContainer_grid-flow__m_iqK > *",
-            "div[class*='card']",
-            "div[class*='Card']", 
-            "a[href*='/space/']",
-            "a[href*='/quest/']",
-            "a[href*='/campaign/']",
-            "main a[href]"
-        ]
-        
-        found_items = []
-        for selector in selectors_to_try:
-            items = soup.select(selector)
-            if items:
-                print(f"✅ {selector}: {len(items)} éléments trouvés")
-                found_items = items
-                break
-        
-        if not found_items:
-            print("❌ Aucun élément trouvé")
-            return []
-        
-        print(f"🔄 Traitement de {len(found_items)} éléments...")
-        
-        for item in found_items:
-            try:
-                # Chercher un lien
-                link_element = item if item.name == 'a' else item.select_one('a')
-                if not link_element:
-                    continue
-                    
-                href = link_element.get('href', '')
-                if not href:
-                    continue
-                    
-                # Filtrer les liens pertinents
-                if not any(path in href for path in ['/space/', '/quest/', '/campaign/']):
-                    continue
-                    
-                # Extraire le titre
-                title = ""
-                title_candidates = [
-                    link_element.get_text().strip(),
-                    item.get_text().strip() if item != link_element else "",
-                ]
-                
-                for candidate in title_candidates:
-                    if candidate and len(candidate) > 3:
-                        # Nettoyer le titre (supprimer les caractères indésirables)
-                        title = candidate.replace('\n', ' ').replace('\t', ' ')
-                        title = ' '.join(title.split())  # Normaliser les espaces
-                        title = title[:150]  # Limiter la longueur
-                        break
-                
-                if not title:
-                    title = f"Quest from {href}"
-                
-                # Construire l'URL complète
-                if href.startswith('/'):
-                    full_link = "https://galxe.com" + href
-                elif href.startswith('http'):
-                    full_link = href
-                else:
-                    full_link = "https://galxe.com/" + href
-                
-                quests.append({
-                    "title": title,
-                    "link": full_link,
-                    "source": "Galxe"
-                })
-                
-            except Exception as e:
-                continue
-        
-        # Supprimer les doublons
-        seen_links = set()
-        unique_quests = []
-        for quest in quests:
-            if quest['link'] not in seen_links:
-                seen_links.add(quest['link'])
-                unique_quests.append(quest)
-        
-        print(f"📊 {len(unique_quests)} quêtes uniques parsées.")
-        return unique_quests
+        quests = self.parser.parse(html, url=url)
+        print(f"📊 {len(quests)} unique quêtes parsées.")
+        return quests
 
-    def scrape_galxe_campaigns(self, pages=5, delay=3):
-        """Scrape plusieurs pages de campagnes Galxe"""
+    def scrape_galxe_campaigns(self, pages=5, delay=3, stop=None):
+        """
+        Scrape plusieurs pages de campagnes Galxe.
+        stop : threading.Event levé quand la source est abandonnée ; testé avant chaque page.
+        """
+        stop = stop or threading.Event()
         all_quests = []
         
         for page_num in range(1, pages + 1):
+            if stop.is_set():
+                print("🛑 Scraping Galxe interrompu (source abandonnée)")
+                break
             url = f"https://galxe.com/explore?page={page_num}"
             
             try:
@@ -219,7 +129,7 @@ class GalxeScraperPy312:
                 # Délai entre les pages
                 if page_num < pages:
                     print(f"⏳ Pause {delay}s...")
-                    time.sleep(delay)
+                    stop.wait(delay)
                     
             except Exception as e:
                 print(f"❌ Échec page {page_num}: {str(e)}")
@@ -0,0 +1,128 @@
+# scrapers/http_cache.py - Cache disque des réponses HTTP avec revalidation conditionnelle
+import hashlib
+import threading
+import time
+import zlib
+from diskcache import Cache
+
+
+class ResponseCache:
+    """
+    Cache de réponses HTTP sur disque (diskcache), borné en taille avec éviction LRU.
+
+    Les corps sont stockés compressés avec l'heure de récupération et les validateurs
+    (ETag / Last-Modified). Une entrée fraîche (< ttl) est servie sans aucun appel réseau ;
+    une entrée périmée est revalidée par requête conditionnelle quand l'origine le permet.
+    """
+
+    def __init__(self, directory="galxe_cache", ttl=3600, max_stale=86400,
+                 size_limit=256 * 1024 * 1024):
+        self.ttl = ttl
+        self.max_stale = max_stale   # Durée de conservation d'une entrée périmée (pour revalidation)
+        self.cache = Cache(directory, size_limit=size_limit,
+                           eviction_policy='least-recently-used')
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0, 'revalidated': 0, 'stores': 0, 'bytes_saved': 0}
+
+    def _count(self, name, value=1):
+        with self._lock:
+            self.stats[name] += value
+
+    @staticmethod
+    def make_key(url, params=None, variant=""):
+        """Clé de cache : URL + paramètres pertinents (jamais la clé d'API)."""
+        relevant = sorted((k, str(v)) for k, v in (params or {}).items() if k != 'api_key')
+        raw = f"{variant}|{url}|{relevant}"
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def get(self, key):
+        return self.cache.get(key)
+
+    def is_fresh(self, entry):
+        return entry is not None and time.time() - entry['fetched_at'] < self.ttl
+
+    @staticmethod
+    def body(entry):
+        return zlib.decompress(entry['body']).decode('utf-8')
+
+    def get_fresh(self, key):
+        """Retourne le corps si une entrée fraîche existe (comptée comme hit), sinon None."""
+        entry = self.get(key)
+        if not self.is_fresh(entry):
+            return None
+        self._count('hits')
+        self._count('bytes_saved', entry['size'])
+        return self.body(entry)
+
+    @staticmethod
+    def conditional_headers(entry):
+        headers = {}
+        if entry and entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry and entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def store(self, key, text, headers=None, url=None):
+        headers = headers or {}
+        raw = text.encode('utf-8')
+        entry = {
+            'url': url,
+            'body': zlib.compress(raw, 6),
+            'size': len(raw),
+            'fetched_at': time.time(),
+            'etag': headers.get('ETag'),
+            'last_modified': headers.get('Last-Modified'),
+        }
+        self.cache.set(key, entry, expire=self.ttl + self.max_stale)
+        self._count('stores')
+
+    def record_miss(self):
+        """Compte un téléchargement effectué hors de fetch() (ex: rendu Playwright)."""
+        self._count('misses')
+
+    def fetch(self, session, url, key, params=None, headers=None, timeout=30,
+              conditional_params=None, page_url=None):
+        """
+        GET avec cache : retourne (status_code, texte, origine) où origine vaut
+        'cache' (entrée fraîche), 'revalidated' (304) ou 'network'.
+        `conditional_params` est ajouté aux paramètres uniquement pour une requête
+        conditionnelle (ex: keep_headers pour que ScraperAPI transmette les validateurs).
+        `page_url` : URL de la page réellement demandée, enregistrée avec l'entrée quand
+        `url` est un intermédiaire (endpoint ScraperAPI).
+        """
+        entry = self.get(key)
+        if self.is_fresh(entry):
+            self._count('hits')
+            self._count('bytes_saved', entry['size'])
+            return 200, self.body(entry), 'cache'
+
+        request_headers = dict(headers or {})
+        request_params = dict(params or {})
+        validators = self.conditional_headers(entry)
+        if validators:
+            request_headers.update(validators)
+            request_params.update(conditional_params or {})
+        response = session.get(url, params=request_params, headers=request_headers, timeout=timeout)
+
+        if response.status_code == 304 and entry is not None:
+            # Contenu inchangé : on rafraîchit l'horodatage sans retélécharger le corps
+            entry['fetched_at'] = time.time()
+            self.cache.set(key, entry, expire=self.ttl + self.max_stale)
+            self._count('revalidated')
+            self._count('bytes_saved', entry['size'])
+            return 200, self.body(entry), 'revalidated'
+
+        self._count('misses')
+        if response.status_code == 200:
+            self.store(key, response.text, response.headers, url=page_url or url)
+        return response.status_code, response.text, 'network'
+
+    def get_stats(self):
+        with self._lock:
+            stats = dict(self.stats)
+        lookups = stats['hits'] + stats['revalidated'] + stats['misses']
+        stats['hit_rate'] = round((stats['hits'] + stats['revalidated']) / lookups, 3) if lookups else 0
+        stats['entries'] = len(self.cache)
+        stats['disk_bytes'] = self.cache.volume()
+        return stats
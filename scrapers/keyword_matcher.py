@@ -0,0 +1,88 @@
+# scrapers/keyword_matcher.py - Recherche multi-mots-clés précompilée (regex en trie)
+import re
+
+
+def trie_pattern(keywords):
+    """
+    Regex équivalente à l'alternation des mots-clés, factorisée en trie : à chaque
+    position le moteur ne teste qu'une branche par caractère, et renvoie le mot-clé
+    le plus long qui commence à cette position.
+    """
+    if not keywords:
+        return '(?!)'   # Ne correspond jamais, comme any() sur une liste vide
+    trie = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[''] = True
+
+    def build(node):
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        return f'(?:{body})?' if '' in node else body
+
+    return build(trie)
+
+
+class KeywordMatcher:
+    """
+    Détection de catégories de mots-clés (recherche de sous-chaînes, comme `kw in text`).
+
+    Construit une seule fois : une regex trie par catégorie (test court-circuité) et une
+    regex trie globale qui renvoie toutes les catégories présentes en un seul parcours.
+    Les textes doivent être fournis déjà en minuscules, comme avec l'ancien `any(...)`.
+    """
+
+    def __init__(self, categories):
+        self.categories = {name: list(dict.fromkeys(words)) for name, words in categories.items()}
+        self.keyword_categories = {}
+        for name, words in self.categories.items():
+            for word in words:
+                self.keyword_categories.setdefault(word, set()).add(name)
+        keywords = list(self.keyword_categories)
+
+        self._category_res = {name: re.compile(trie_pattern(words)) for name, words in self.categories.items()}
+        self._all_re = re.compile(trie_pattern(keywords))
+
+        # Le parcours global ne renvoie pas de correspondances qui se chevauchent :
+        # - les mots-clés contenus dans un mot trouvé sont ajoutés d'office ;
+        # - ceux qui commencent à l'intérieur et débordent après sont vérifiés à part.
+        self._contained = {
+            word: set().union(*(self.keyword_categories[other] for other in keywords if other in word))
+            for word in keywords
+        }
+        self._overlaps = {}
+        for word in keywords:
+            candidates = [
+                (offset, other)
+                for offset in range(1, len(word))
+                for other in keywords
+                if len(other) > len(word) - offset and other.startswith(word[offset:])
+            ]
+            if candidates:
+                self._overlaps[word] = candidates
+
+    def has(self, text, category):
+        """Vrai si un mot-clé de la catégorie apparaît (arrêt à la première occurrence)."""
+        return self._category_res[category].search(text) is not None
+
+    def first(self, text, categories):
+        """Première catégorie présente, dans l'ordre de priorité donné (ou None)."""
+        for category in categories:
+            if self.has(text, category):
+                return category
+        return None
+
+    def match(self, text):
+        """Ensemble de toutes les catégories présentes dans le texte, en un seul parcours."""
+        found = set()
+        for match in self._all_re.finditer(text):
+            word = match.group()
+            found |= self._contained[word]
+            for offset, other in self._overlaps.get(word, ()):
+                if text.startswith(other, match.start() + offset):
+                    found |= self.keyword_categories[other]
+        return found
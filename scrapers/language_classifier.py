@@ -0,0 +1,181 @@
+# scrapers/language_classifier.py - Détection de langue en une passe, avec cache persistant
+import hashlib
+import json
+import os
+import re
+import threading
+
+try:
+    from langdetect import detect, DetectorFactory
+    # Assurer des résultats reproductibles pour langdetect
+    DetectorFactory.seed = 0
+    LANGDETECT_AVAILABLE = True
+except ImportError:
+    LANGDETECT_AVAILABLE = False
+
+# Langues conservées par le pipeline RSS
+# (lt : faux positif fréquent de langdetect sur des textes anglais courts)
+SUPPORTED_LANGUAGES = {'en', 'fr', 'es', 'pt', 'lt'}
+UNKNOWN = 'unknown'
+
+# Écritures non latines : une seule plage suffit à trancher
+SCRIPT_RANGES = [
+    ('ko', 0xAC00, 0xD7AF),
+    ('ja', 0x3040, 0x30FF),
+    ('zh-cn', 0x4E00, 0x9FFF),
+    ('ru', 0x0400, 0x04FF),
+    ('ar', 0x0600, 0x06FF),
+    ('el', 0x0370, 0x03FF),
+    ('th', 0x0E00, 0x0E7F),
+    ('hi', 0x0900, 0x097F),
+]
+
+STOP_WORDS = {
+    'en': {'the', 'and', 'of', 'to', 'is', 'for', 'with', 'on', 'this', 'that', 'are', 'from',
+           'by', 'be', 'will', 'has', 'have', 'its', 'it', 'at', 'as', 'you', 'your', 'new', 'how'},
+    'fr': {'le', 'la', 'les', 'des', 'et', 'est', 'une', 'un', 'du', 'pour', 'dans', 'sur', 'qui',
+           'que', 'pas', 'avec', 'au', 'aux', 'ce', 'cette', 'sont', 'plus', 'par', 'nous', 'vous'},
+    # Listes concurrentes : empêchent de prendre un texte espagnol/portugais pour du français
+    'es': {'el', 'la', 'los', 'las', 'del', 'y', 'en', 'por', 'con', 'para', 'una', 'un', 'es',
+           'que', 'se', 'su', 'al', 'lo', 'como', 'más', 'este', 'esta'},
+    'pt': {'o', 'os', 'as', 'do', 'da', 'dos', 'das', 'em', 'para', 'com', 'não', 'uma', 'um',
+           'que', 'se', 'no', 'na', 'ao', 'mais', 'é'},
+}
+# Seuls l'anglais et le français sont tranchés par les mots-outils
+STOP_WORD_DECIDES = {'en', 'fr'}
+
+WORD_RE = re.compile(r"[a-zàâäçéèêëîïôöùûüÿœæ']+")
+
+
+class LanguageClassifier:
+    """
+    Classe les textes par langue au plus une fois par contenu distinct.
+
+    1. Cache par hash de contenu, persistant entre les runs (JSON).
+    2. Pré-classification bon marché : écriture non latine, ou mots-outils
+       anglais/français nettement majoritaires face aux autres langues latines.
+    3. langdetect uniquement pour les cas restants (espagnol, portugais, textes ambigus).
+    """
+
+    VERSION = 1
+
+    def __init__(self, cache_path="data/language_cache.json", max_entries=50000, min_length=10):
+        self.cache_path = cache_path
+        self.max_entries = max_entries
+        self.min_length = min_length
+        self._lock = threading.Lock()
+        self.cache = self._load()
+        self.stats = {'cache_hits': 0, 'heuristic': 0, 'langdetect': 0}
+
+    def _load(self):
+        if self.cache_path and os.path.exists(self.cache_path):
+            try:
+                with open(self.cache_path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                if data.get("version") == self.VERSION:
+                    return data.get("entries", {})
+            except (OSError, ValueError):
+                pass
+        return {}
+
+    def save(self):
+        if not self.cache_path:
+            return
+        directory = os.path.dirname(self.cache_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._lock:
+            # Les entrées les plus anciennes (ordre d'insertion) sont évincées en premier
+            overflow = len(self.cache) - self.max_entries
+            if overflow > 0:
+                for key in list(self.cache)[:overflow]:
+                    del self.cache[key]
+            tmp_path = f"{self.cache_path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"version": self.VERSION, "entries": self.cache}, f)
+            os.replace(tmp_path, self.cache_path)
+
+    @staticmethod
+    def _clean(text):
+        return ' '.join((text or '').split())
+
+    @staticmethod
+    def _key(clean_text):
+        return hashlib.blake2b(clean_text.encode('utf-8'), digest_size=8).hexdigest()
+
+    @staticmethod
+    def _script_language(text):
+        letters = [c for c in text if c.isalpha()]
+        if not letters:
+            return None
+        for lang, low, high in SCRIPT_RANGES:
+            count = sum(1 for c in letters if low <= ord(c) <= high)
+            if count / len(letters) > 0.3:
+                return lang
+        return None
+
+    @staticmethod
+    def _stop_word_language(text, min_hits=3):
+        counts = {lang: 0 for lang in STOP_WORDS}
+        for word in WORD_RE.findall(text.lower()):
+            for lang, words in STOP_WORDS.items():
+                if word in words:
+                    counts[lang] += 1
+        ranked = sorted(counts.items(), key=lambda item: item[1], reverse=True)
+        (best, best_hits), (_, second_hits) = ranked[0], ranked[1]
+        if best in STOP_WORD_DECIDES and best_hits >= min_hits and best_hits >= 3 * max(second_hits, 1):
+            return best
+        return None
+
+    def pre_classify(self, clean_text):
+        """Langue évidente sans langdetect, sinon None."""
+        if len(clean_text) < self.min_length:
+            return UNKNOWN   # Trop court pour détecter
+        return self._script_language(clean_text) or self._stop_word_language(clean_text)
+
+    def _detect(self, clean_text):
+        try:
+            return detect(clean_text)
+        except Exception:
+            return UNKNOWN
+
+    def classify_batch(self, texts, persist=True):
+        """Code langue de chaque texte ('unknown' si indéterminable), dans l'ordre d'entrée."""
+        cleaned = [self._clean(text) for text in texts]
+        keys = [self._key(text) for text in cleaned]
+        pending = {}
+
+        with self._lock:
+            for key, text in zip(keys, cleaned):
+                if key in self.cache:
+                    self.stats['cache_hits'] += 1
+                elif key not in pending:
+                    pending[key] = text
+
+        new_entries, uncached = {}, {}
+        for key, text in pending.items():
+            lang = self.pre_classify(text)
+            if lang is not None:
+                self.stats['heuristic'] += 1
+                new_entries[key] = lang
+            elif LANGDETECT_AVAILABLE:
+                new_entries[key] = self._detect(text)
+                self.stats['langdetect'] += 1
+            else:
+                # Sans langdetect, on ne fige pas un « unknown » dans le cache
+                uncached[key] = UNKNOWN
+
+        with self._lock:
+            self.cache.update(new_entries)
+            languages = [self.cache.get(key) or uncached[key] for key in keys]
+        if persist and new_entries:
+            self.save()
+        return languages
+
+    def classify(self, text, persist=False):
+        return self.classify_batch([text], persist=persist)[0]
+
+    @staticmethod
+    def is_supported(lang):
+        """Les textes indéterminables sont conservés, comme avant."""
+        return lang == UNKNOWN or lang in SUPPORTED_LANGUAGES
@@ -13,6 +13,7 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')
 
 from vault_manager import VaultManager
 from utils import get_today_date_str
+from scrapers.layer3_trpc import Layer3TRPCClient, ProcedureCircuitBreaker
 
 class Layer3Scraper:
     def __init__(self):
@@ -21,6 +22,12 @@ class Layer3Scraper:
         self.base_url = "https://layer3.xyz/api/trpc"
         self.output_dir = "data"
         os.makedirs(self.output_dir, exist_ok=True)
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        self.trpc = Layer3TRPCClient(
+            self.session, self.base_url,
+            breaker=ProcedureCircuitBreaker(os.path.join(self.output_dir, "layer3_circuit.json"))
+        )
 
     def _get_auth_headers(self) -> dict:
         headers = {
@@ -60,8 +67,8 @@ class Layer3Scraper:
             print(f"[✖] Erreur TRPC {procedure}: {e}")
             return None
     
-    def fetch_quests(self, limit=50):
-        """Récupérer les quêtes via différentes méthodes"""
+    def fetch_quests(self, limit=50, stop=None):
+        """Récupérer les quêtes via différentes méthodes (stop : arrêt avant la méthode suivante)"""
         print("[🎯] Tentative de récupération des quêtes Layer3...")
         
         # Méthode 1: Essayer les endpoints TRPC découverts
@@ -73,21 +80,19 @@ class Layer3Scraper:
             "activation.getActiveActivations"
         ]
         
-        for procedure in trpc_procedures:
-            data = self.fetch_trpc_data(procedure)
-            if data and isinstance(data, dict):
-                # Analyser la structure de réponse
-                if 'result' in data and 'data' in data['result']:
-                    quests = data['result']['data']
-                    if quests:
-                        print(f"[✅] {len(quests)} quêtes trouvées via {procedure}")
-                        return quests
+        # Un seul aller-retour pour toutes les procédures encore vivantes (circuit breaker)
+        procedure, quests = self.trpc.fetch_first_available(trpc_procedures)
+        if quests:
+            print(f"[✅] {len(quests)} quêtes trouvées via {procedure}")
+            return quests
+        if stop is not None and stop.is_set():
+            return []
         
         # Méthode 2: Essayer l'API Li.Quest découverte
         try:
             print("[🔍] Test de l'API Li.Quest (partenaire Layer3)")
             lifi_endpoint = "https://li.quest/v1/chains?chainTypes=EVM%2CSVM"
-            response = requests.get(lifi_endpoint, headers=self.headers, timeout=15)
+            response = self.session.get(lifi_endpoint, timeout=15)
             
             if response.status_code == 200:
                 data = response.json()
@@ -119,12 +124,15 @@ class Layer3Scraper:
         print("[❌] Aucune méthode fonctionnelle trouvée")
         return []
 
-    def fetch_all_campaigns(self, max_pages=20, delay=0.5):
-        """Récupère toutes les campagnes/quêtes Layer3"""
+    def fetch_all_campaigns(self, max_pages=20, delay=0.5, stop=None):
+        """Récupère toutes les campagnes/quêtes Layer3 (stop : source abandonnée, rien n'est sauvegardé)"""
         print("[🚀] Récupération des campagnes Layer3...")
         
         # Utiliser notre méthode TRPC améliorée
-        quests = self.fetch_quests(limit=50)
+        quests = self.fetch_quests(limit=50, stop=stop)
+        if stop is not None and stop.is_set():
+            print("[🛑] Récupération Layer3 interrompue (source abandonnée)")
+            return []
         
         if quests:
             self.save_campaigns(quests)
@@ -0,0 +1,171 @@
+# scrapers/layer3_trpc.py - Client tRPC Layer3 : requêtes batchées + circuit breaker par procédure
+import json
+import os
+import threading
+import time
+import urllib.parse
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+
+class ProcedureCircuitBreaker:
+    """
+    Circuit breaker persistant (JSON) par procédure tRPC.
+
+    Après `failure_threshold` échecs consécutifs, la procédure est ouverte : elle n'est
+    plus appelée pendant `cooldown` secondes. Ensuite une seule sonde (half-open) est
+    autorisée ; un succès referme le circuit, un échec le rouvre avec un délai doublé
+    (plafonné à `max_cooldown`).
+    """
+
+    def __init__(self, path="data/layer3_circuit.json", failure_threshold=2,
+                 cooldown=6 * 3600, max_cooldown=7 * 24 * 3600):
+        self.path = path
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self._lock = threading.Lock()
+        self.states = self._load()
+
+    def _load(self):
+        if self.path and os.path.exists(self.path):
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    return json.load(f)
+            except (OSError, ValueError):
+                pass
+        return {}
+
+    def save(self):
+        if not self.path:
+            return
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._lock:
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self.states, f, indent=2)
+            os.replace(tmp_path, self.path)
+
+    def _state(self, procedure):
+        return self.states.setdefault(procedure, {
+            "state": CLOSED, "failures": 0, "opened_at": 0, "cooldown": self.cooldown,
+        })
+
+    def allow(self, procedure, now=None):
+        """
+        Vrai si la procédure peut être appelée : circuit fermé, ou sonde half-open.
+        Une seule sonde est admise ; si elle reste sans verdict (erreur réseau, crash),
+        une nouvelle sonde est autorisée après un nouveau délai.
+        """
+        now = now or time.time()
+        with self._lock:
+            state = self._state(procedure)
+            if state["state"] == CLOSED:
+                return True
+            if now - state["opened_at"] < state["cooldown"]:
+                return False
+            # Délai écoulé (circuit ouvert ou sonde abandonnée) : on admet une sonde
+            state["state"], state["opened_at"] = HALF_OPEN, now
+            return True
+
+    def record_success(self, procedure):
+        with self._lock:
+            self.states[procedure] = {
+                "state": CLOSED, "failures": 0, "opened_at": 0, "cooldown": self.cooldown,
+            }
+
+    def record_failure(self, procedure, now=None):
+        now = now or time.time()
+        with self._lock:
+            state = self._state(procedure)
+            state["failures"] += 1
+            if state["state"] == HALF_OPEN:
+                # Sonde en échec : on rouvre plus longtemps
+                state["cooldown"] = min(state["cooldown"] * 2, self.max_cooldown)
+                state["state"], state["opened_at"] = OPEN, now
+            elif state["failures"] >= self.failure_threshold:
+                state["state"], state["opened_at"] = OPEN, now
+
+    def status(self):
+        with self._lock:
+            return {procedure: state["state"] for procedure, state in self.states.items()}
+
+
+class Layer3TRPCClient:
+    """Appelle plusieurs procédures tRPC Layer3 en une seule requête HTTP (`?batch=1`)."""
+
+    DEFAULT_INPUT = {"json": None, "meta": {"values": ["undefined"]}}
+
+    def __init__(self, session, base_url="https://layer3.xyz/api/trpc", breaker=None, timeout=15):
+        self.session = session
+        self.base_url = base_url
+        self.breaker = breaker or ProcedureCircuitBreaker()
+        self.timeout = timeout
+        self.requests_made = 0
+
+    def build_batch_url(self, procedures, input_data=None):
+        input_data = self.DEFAULT_INPUT if input_data is None else input_data
+        batch_input = {str(i): input_data for i in range(len(procedures))}
+        path = ",".join(procedures)
+        return f"{self.base_url}/{path}?batch=1&input={urllib.parse.quote(json.dumps(batch_input))}"
+
+    @staticmethod
+    def _unwrap(item):
+        """Extrait les données d'un élément de réponse tRPC (avec ou sans superjson)."""
+        data = item.get("result", {}).get("data")
+        if isinstance(data, dict) and "json" in data:
+            data = data["json"]
+        return data
+
+    def call_batch(self, procedures, input_data=None):
+        """
+        Appelle en une requête toutes les procédures autorisées par le circuit breaker.
+        Retourne {procédure: données} pour celles qui ont répondu sans erreur.
+        """
+        allowed = [p for p in procedures if self.breaker.allow(p)]
+        skipped = [p for p in procedures if p not in allowed]
+        if skipped:
+            print(f"[⏭] TRPC ignorées (circuit ouvert): {', '.join(skipped)}")
+        if not allowed:
+            return {}
+
+        url = self.build_batch_url(allowed, input_data)
+        print(f"[🔍] TRPC batch ({len(allowed)} procédures)")
+        self.requests_made += 1
+        try:
+            response = self.session.get(url, timeout=self.timeout)
+            # tRPC renvoie 207 (multi-status) quand une partie du batch échoue
+            payload = response.json()
+        except Exception as e:
+            # Erreur réseau : ce n'est pas la faute d'une procédure, le circuit n'est pas modifié
+            print(f"[✖] Erreur TRPC batch: {e}")
+            return {}
+
+        if not isinstance(payload, list):
+            # Erreur de l'endpoint entier (503, 429...) : aucune procédure n'est en cause,
+            # le circuit n'est pas modifié
+            print(f"[✖] Erreur TRPC batch: HTTP {response.status_code}")
+            return {}
+
+        results = {}
+        for index, procedure in enumerate(allowed):
+            item = payload[index] if index < len(payload) and isinstance(payload[index], dict) else {}
+            if "result" in item:
+                self.breaker.record_success(procedure)
+                results[procedure] = self._unwrap(item)
+            else:
+                self.breaker.record_failure(procedure)
+                print(f"[⚠] TRPC en échec: {procedure}")
+        self.breaker.save()
+        return results
+
+    def fetch_first_available(self, procedures, input_data=None):
+        """Données non vides de la première procédure (ordre de priorité) qui en renvoie."""
+        results = self.call_batch(procedures, input_data)
+        for procedure in procedures:
+            data = results.get(procedure)
+            if data:
+                return procedure, data
+        return None, None
@@ -0,0 +1,224 @@
+# scrapers/near_duplicates.py - Regroupement des articles syndiqués (MinHash + LSH)
+import array
+import base64
+import hashlib
+import html
+import json
+import os
+import random
+import re
+import threading
+import time
+
+TAG_RE = re.compile(r'<[^>]+>')
+WORD_RE = re.compile(r'\w+')
+
+# Permutations universelles (a*h + b) mod P : graine fixe, les signatures persistées
+# restent comparables d'un run à l'autre
+MERSENNE_PRIME = (1 << 61) - 1
+SIGNATURE_MASK = 0xFFFFFFFF
+
+
+def shingles(title, summary='', size=2, max_tokens=150):
+    """Ensemble des n-grammes de mots (titre + résumé sans HTML, en minuscules)."""
+    result = set()
+    for text in (title, summary):
+        tokens = [word for word in WORD_RE.findall(TAG_RE.sub(' ', html.unescape(text or '')).lower())
+                  if len(word) > 1][:max_tokens]
+        if len(tokens) < size:
+            result.update(tokens)
+            continue
+        result.update(' '.join(tokens[i:i + size]) for i in range(len(tokens) - size + 1))
+    return result
+
+
+class NearDuplicateIndex:
+    """
+    Détecte les copies d'un même article publiées par plusieurs flux sous des URL différentes.
+
+    Chaque entrée reçoit une signature MinHash de ses bigrammes de mots ; la signature est
+    découpée en `bands` bandes de `rows` valeurs et deux entrées ne sont comparées que si
+    elles partagent au moins une bande (LSH), d'où un coût quasi linéaire. Une paire est
+    un doublon si sa similarité de Jaccard estimée atteint `threshold`.
+
+    Seule l'entrée canonique de chaque groupe est indexée ; l'index est persisté (JSON)
+    pour écarter aussi les copies qui arrivent lors des runs suivants.
+    """
+
+    def __init__(self, path="data/rss_fingerprints.json", threshold=0.5, bands=20, rows=3,
+                 max_age=7 * 86400, max_entries=5000, seed=1):
+        self.path = path
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = rows
+        self.max_age = max_age
+        self.max_entries = max_entries
+        rng = random.Random(seed)
+        self._perms = [(rng.randrange(1, MERSENNE_PRIME), rng.randrange(0, MERSENNE_PRIME))
+                       for _ in range(bands * rows)]
+        self._lock = threading.Lock()
+        self.records = {}
+        self._buckets = [{} for _ in range(bands)]
+        for key, record in self._load().items():
+            try:
+                signature = tuple(array.array('I', base64.b64decode(record['signature'])))
+            except (KeyError, ValueError, TypeError):
+                continue
+            if len(signature) == len(self._perms):
+                self._add(key, signature, record.get('title', ''), record.get('seen', 0))
+        self._prune(time.time())
+
+    # --- Persistance ---
+
+    def _load(self):
+        if self.path and os.path.exists(self.path):
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    return json.load(f)
+            except (OSError, ValueError):
+                pass
+        return {}
+
+    def save(self):
+        if not self.path:
+            return
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._lock:
+            self._prune(time.time())
+            data = {key: {'signature': base64.b64encode(array.array('I', record['signature']).tobytes()).decode('ascii'),
+                          'title': record['title'], 'seen': record['seen']}
+                    for key, record in self.records.items()}
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.path)
+
+    # --- Index ---
+
+    def signature(self, title, summary=''):
+        """Signature MinHash (tuple d'entiers 32 bits), ou None si le texte est vide."""
+        hashes = [int.from_bytes(hashlib.blake2b(shingle.encode('utf-8'), digest_size=8).digest(), 'big')
+                  for shingle in shingles(title, summary)]
+        if not hashes:
+            return None
+        return tuple(min((a * h + b) % MERSENNE_PRIME for h in hashes) & SIGNATURE_MASK
+                     for a, b in self._perms)
+
+    def _band_keys(self, signature):
+        rows = self.rows
+        return [signature[i * rows:(i + 1) * rows] for i in range(self.bands)]
+
+    def similarity(self, sig_a, sig_b):
+        """Similarité de Jaccard estimée (part des minima identiques)."""
+        return sum(1 for a, b in zip(sig_a, sig_b) if a == b) / len(sig_a)
+
+    def _add(self, key, signature, title, seen):
+        self.records[key] = {'signature': signature, 'title': title, 'seen': seen}
+        for band, band_key in zip(self._buckets, self._band_keys(signature)):
+            band.setdefault(band_key, set()).add(key)
+
+    def _remove(self, key):
+        record = self.records.pop(key)
+        for band, band_key in zip(self._buckets, self._band_keys(record['signature'])):
+            keys = band.get(band_key)
+            if keys:
+                keys.discard(key)
+                if not keys:
+                    del band[band_key]
+
+    def _prune(self, now):
+        expired = [key for key, record in self.records.items() if now - record['seen'] > self.max_age]
+        for key in expired:
+            self._remove(key)
+        overflow = len(self.records) - self.max_entries
+        if overflow > 0:
+            for key in sorted(self.records, key=lambda k: self.records[k]['seen'])[:overflow]:
+                self._remove(key)
+
+    def _candidates(self, buckets, signature):
+        candidates = set()
+        for band, band_key in zip(buckets, self._band_keys(signature)):
+            candidates.update(band.get(band_key, ()))
+        return candidates
+
+    def _best_match(self, signature, batch=None):
+        """(clé, dans le lot) de l'entrée la plus proche au-delà du seuil, parmi l'index et le lot en cours."""
+        scored = [(key, self.records[key]['signature'], False)
+                  for key in self._candidates(self._buckets, signature)]
+        if batch is not None:
+            buckets, signatures = batch
+            scored.extend((key, signatures[key], True) for key in self._candidates(buckets, signature))
+        best, best_score = (None, False), self.threshold
+        for key, other, in_batch in scored:
+            score = self.similarity(signature, other)
+            if score >= best_score:
+                best, best_score = (key, in_batch), score
+        return best
+
+    def find(self, signature):
+        """Clé de l'entrée indexée la plus proche au-delà du seuil, ou None."""
+        return self._best_match(signature)[0]
+
+    def match(self, entries, now=None):
+        """
+        Garde une entrée canonique par article (la première rencontrée, donc les flux
+        principaux avant les fallback). Les liens des copies du lot sont ajoutés à
+        `duplicates` sur l'entrée canonique ; les copies d'articles déjà vus lors d'un run
+        précédent sont écartées.
+
+        L'index n'est pas modifié : retourne (entrées canoniques, lot à indexer). Le lot
+        n'est indexé que par `commit`, une fois les entrées stockées ; d'ici là, les mêmes
+        articles restent nouveaux pour l'index.
+        """
+        now = now or time.time()
+        canonical, by_key = [], {}
+        batch = ([{} for _ in range(self.bands)], {})   # Bandes et signatures du lot en cours
+        pending = {'now': now, 'add': [], 'seen': set()}
+        skipped = 0
+        with self._lock:
+            for entry in entries:
+                signature = self.signature(entry.get('title', ''), entry.get('summary', ''))
+                if signature is None:
+                    canonical.append(entry)
+                    continue
+                match, in_batch = self._best_match(signature, batch)
+                if match is not None:
+                    if in_batch:
+                        by_key[match].setdefault('duplicates', []).append(entry['link'])
+                    else:
+                        pending['seen'].add(match)
+                        skipped += 1
+                    continue
+                key = entry['link']
+                batch[1][key] = signature
+                for band, band_key in zip(batch[0], self._band_keys(signature)):
+                    band.setdefault(band_key, set()).add(key)
+                pending['add'].append((key, signature, entry.get('title', '')))
+                by_key[key] = entry
+                canonical.append(entry)
+
+        clustered = len(entries) - len(canonical) - skipped
+        if clustered or skipped:
+            print(f"🧬 Articles syndiqués: {clustered} copies regroupées, {skipped} déjà vus → "
+                  f"{len(canonical)} entrées")
+        return canonical, pending
+
+    def commit(self, pending):
+        """Indexe un lot renvoyé par `match` (à persister ensuite avec `save`)."""
+        now = pending['now']
+        with self._lock:
+            for key in pending['seen']:
+                if key in self.records:
+                    self.records[key]['seen'] = now
+            for key, signature, title in pending['add']:
+                if key in self.records:
+                    self._remove(key)
+                self._add(key, signature, title, now)
+
+    def deduplicate(self, entries, now=None):
+        """`match` puis `commit` : regroupe le lot et l'indexe aussitôt."""
+        canonical, pending = self.match(entries, now)
+        self.commit(pending)
+        return canonical
@@ -0,0 +1,227 @@
+# scrapers/source_executor.py - Exécution concurrente des sources de scraping
+import queue
+import threading
+import time
+
+
+class SourceBatch(list):
+    """
+    Opportunités renvoyées par une source, avec la validation différée de son état
+    persistant (curseurs, marques d'ingestion, index). `commit()` n'est appelé qu'une
+    fois le run stocké : un lot abandonné ou perdu ne fait jamais avancer la source.
+    """
+
+    def __init__(self, opportunities=(), commits=()):
+        super().__init__(opportunities)
+        self.commits = [commit for commit in commits if commit]
+
+    def on_commit(self, commit):
+        if commit:
+            self.commits.append(commit)
+        return self
+
+    def commit(self):
+        """Valide l'état de la source ; une validation en échec n'empêche pas les autres."""
+        for commit in self.commits:
+            try:
+                commit()
+            except Exception as e:
+                print(f"⚠️ Erreur de validation de l'état d'une source: {e}")
+        self.commits = []
+
+
+class Source:
+    """
+    Une source de scraping : un nom, une fonction de récupération et un délai maximum.
+
+    `fetch(stop)` reçoit un threading.Event levé quand la source est abandonnée (délai
+    dépassé ou exécution annulée) : elle doit le tester entre ses pages / requêtes et
+    s'arrêter au plus tôt, pour ne pas garder navigateur, quota ou connexions au run suivant.
+    """
+
+    def __init__(self, name, fetch, timeout=None):
+        self.name = name
+        self.fetch = fetch          # fetch(stop) -> liste d'opportunités ou SourceBatch
+        self.timeout = timeout      # Délai propre à la source (None = délai par défaut de l'exécuteur)
+
+
+class SourceResult:
+    """Résultat d'exécution d'une source."""
+
+    def __init__(self, name, status, opportunities=None, duration=0.0, error=None):
+        self.name = name
+        self.status = status        # 'ok', 'empty', 'error', 'timeout' ou 'cancelled'
+        self.opportunities = opportunities or []
+        self.duration = duration
+        self.error = error
+        # Validation différée de l'état de la source (SourceBatch), à appeler après stockage
+        self.commit = getattr(opportunities, 'commit', None)
+
+    def to_dict(self):
+        return {
+            'name': self.name,
+            'status': self.status,
+            'count': len(self.opportunities),
+            'duration': round(self.duration, 2),
+            'error': str(self.error) if self.error else None
+        }
+
+
+class SourceExecutor:
+    """
+    Exécute plusieurs sources en parallèle avec un nombre borné de workers,
+    un délai maximum par source et une annulation coopérative.
+
+    Les résultats sont collectés au fil de l'eau : une source lente ou en échec
+    ne retarde jamais les autres. Une source dépassant son délai libère immédiatement
+    son slot et son événement `stop` est levé : elle s'arrête à son prochain point de
+    contrôle (thread daemon d'ici là). Son résultat tardif est ignoré et son état
+    (SourceBatch) n'est donc jamais validé.
+    """
+
+    def __init__(self, max_workers=4, default_timeout=180, poll_interval=0.5):
+        self.max_workers = max(1, max_workers)
+        self.default_timeout = default_timeout
+        self.poll_interval = poll_interval
+        self.cancel_event = threading.Event()
+        self.last_report = None
+
+    def cancel(self):
+        """Annule l'exécution : les sources non démarrées ne seront pas lancées, les autres sont arrêtées."""
+        self.cancel_event.set()
+
+    def _run_source(self, source, ticket, stop, results_queue):
+        started = time.perf_counter()
+        try:
+            opportunities = source.fetch(stop) or []
+            status = 'ok' if opportunities else 'empty'
+            results_queue.put((ticket, SourceResult(source.name, status, opportunities,
+                                                    time.perf_counter() - started)))
+        except Exception as e:
+            results_queue.put((ticket, SourceResult(source.name, 'error', [],
+                                                    time.perf_counter() - started, e)))
+
+    def run(self, sources, on_result=None):
+        """
+        Lance toutes les sources et retourne la liste des SourceResult
+        dans l'ordre de terminaison. `on_result` est appelé pour chaque
+        résultat dès qu'il est disponible.
+        """
+        self.cancel_event.clear()
+        results_queue = queue.Queue()
+        pending = list(sources)
+        # ticket d'exécution -> (source, instant de démarrage, événement d'arrêt) ;
+        # deux sources homonymes restent distinctes
+        running = {}
+        results = []
+        run_started = time.perf_counter()
+
+        def collect(result):
+            results.append(result)
+            if on_result:
+                try:
+                    on_result(result)
+                except Exception as e:
+                    print(f"⚠️ Erreur callback résultat {result.name}: {e}")
+
+        while pending or running:
+            # Démarrer les sources tant qu'il reste des slots libres
+            while pending and len(running) < self.max_workers and not self.cancel_event.is_set():
+                source = pending.pop(0)
+                ticket, stop = object(), threading.Event()
+                thread = threading.Thread(target=self._run_source, args=(source, ticket, stop, results_queue),
+                                          name=f"source-{source.name}", daemon=True)
+                running[ticket] = (source, time.perf_counter(), stop)
+                thread.start()
+
+            if self.cancel_event.is_set():
+                for source in pending:
+                    collect(SourceResult(source.name, 'cancelled'))
+                pending = []
+                for source, started, stop in running.values():
+                    stop.set()
+                    collect(SourceResult(source.name, 'cancelled', duration=time.perf_counter() - started))
+                running.clear()
+                break
+
+            # Attendre le prochain résultat, au plus jusqu'à la prochaine échéance
+            now = time.perf_counter()
+            next_deadline = min(started + (source.timeout or self.default_timeout)
+                                for source, started, _ in running.values())
+            wait = max(0.0, min(self.poll_interval, next_deadline - now))
+            try:
+                ticket, result = results_queue.get(timeout=wait)
+                if ticket in running:  # Ignorer les résultats de sources déjà abandonnées
+                    del running[ticket]
+                    collect(result)
+            except queue.Empty:
+                pass
+
+            # Abandonner les sources qui ont dépassé leur délai
+            now = time.perf_counter()
+            for ticket, (source, started, stop) in list(running.items()):
+                timeout = source.timeout or self.default_timeout
+                if now - started >= timeout:
+                    stop.set()
+                    del running[ticket]
+                    collect(SourceResult(source.name, 'timeout', duration=now - started,
+                                         error=TimeoutError(f"Délai de {timeout}s dépassé")))
+
+        wall_time = time.perf_counter() - run_started
+        sum_time = sum(r.duration for r in results)
+        self.last_report = {
+            'wall_time': round(wall_time, 2),
+            'sum_source_time': round(sum_time, 2),
+            'speedup': round(sum_time / wall_time, 2) if wall_time > 0 else 0,
+            'sources': [r.to_dict() for r in results]
+        }
+        return results
+
+    def print_report(self):
+        """Affiche le temps réel comparé à la somme des temps par source."""
+        report = self.last_report
+        if not report:
+            return
+        print(f"\n⏱️ Exécution des sources:")
+        for source in report['sources']:
+            print(f"   - {source['name']}: {source['status']} "
+                  f"({source['count']} opp., {source['duration']}s)")
+        print(f"   🕒 Temps réel: {report['wall_time']}s | "
+              f"Somme des sources: {report['sum_source_time']}s | "
+              f"Gain: x{report['speedup']}")
+
+
+def run_sources(sources, max_workers=4, default_timeout=180):
+    """
+    Raccourci : exécute les sources en parallèle, affiche chaque résultat dès
+    qu'il arrive et retourne (opportunités fusionnées, rapport d'exécution).
+
+    Les opportunités fusionnées forment un SourceBatch : l'appelant appelle `commit()`
+    une fois le run stocké, ce qui valide l'état des seules sources terminées à temps.
+    """
+    executor = SourceExecutor(max_workers=max_workers, default_timeout=default_timeout)
+
+    def announce(result):
+        if result.status == 'ok':
+            print(f"✅ {result.name}: {len(result.opportunities)} opportunités récupérées ({result.duration:.1f}s).")
+        elif result.status == 'empty':
+            print(f"⚠️ {result.name}: Aucune opportunité récupérée.")
+        elif result.status == 'timeout':
+            print(f"⏰ {result.name}: abandonné après {result.duration:.0f}s.")
+        elif result.status == 'cancelled':
+            print(f"🛑 {result.name}: annulé.")
+        else:
+            print(f"❌ Erreur lors du scraping de {result.name}: {result.error}")
+
+    all_opportunities = SourceBatch()
+    try:
+        results = executor.run(sources, on_result=announce)
+    except KeyboardInterrupt:
+        executor.cancel()
+        raise
+    for result in results:
+        all_opportunities.extend(result.opportunities)
+        all_opportunities.on_commit(result.commit)
+
+    executor.print_report()
+    return all_opportunities, executor.last_report
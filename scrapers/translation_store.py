@@ -0,0 +1,84 @@
+# scrapers/translation_store.py - Cache disque des traductions + traduction par lots
+import hashlib
+import threading
+from diskcache import Cache
+
+
+class TranslationStore:
+    """
+    Traductions persistantes (diskcache, éviction LRU bornée en taille), adressées par
+    le hash du texte complet et la paire de langues. Les textes absents du cache sont
+    envoyés au traducteur par lots (nombre de textes et taille cumulée bornés).
+    """
+
+    def __init__(self, directory="data/translation_cache", size_limit=64 * 1024 * 1024,
+                 batch_size=25, max_batch_chars=4500):
+        self.cache = Cache(directory, size_limit=size_limit, eviction_policy='least-recently-used')
+        self.batch_size = batch_size
+        self.max_batch_chars = max_batch_chars
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0, 'batches': 0, 'errors': 0, 'chars_translated': 0}
+
+    def _count(self, name, value=1):
+        with self._lock:
+            self.stats[name] += value
+
+    @staticmethod
+    def make_key(text, source_lang, dest_lang):
+        raw = f"{source_lang}>{dest_lang}\x00{text}"
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def _batches(self, texts):
+        batch, size = [], 0
+        for text in texts:
+            if batch and (len(batch) >= self.batch_size or size + len(text) > self.max_batch_chars):
+                yield batch
+                batch, size = [], 0
+            batch.append(text)
+            size += len(text)
+        if batch:
+            yield batch
+
+    def translate(self, texts, translator, source_lang='auto', dest_lang='en'):
+        """
+        Traduit une liste de textes (ordre conservé). Seuls les textes distincts absents du
+        cache partent au traducteur ; en cas d'erreur, le texte original est renvoyé et
+        n'est pas mis en cache.
+        """
+        results = {}
+        pending = []
+        for text in dict.fromkeys(texts):
+            if not text or not text.strip():
+                results[text] = text
+                continue
+            cached = self.cache.get(self.make_key(text, source_lang, dest_lang))
+            if cached is not None:
+                results[text] = cached
+                self._count('hits')
+            else:
+                pending.append(text)
+                self._count('misses')
+
+        for batch in self._batches(pending):
+            self._count('batches')
+            try:
+                translations = translator.translate(batch, src=source_lang, dest=dest_lang)
+                if not isinstance(translations, list):
+                    translations = [translations]
+                for text, translation in zip(batch, translations):
+                    results[text] = translation.text
+                    self.cache.set(self.make_key(text, source_lang, dest_lang), translation.text)
+                    self._count('chars_translated', len(text))
+            except Exception as e:
+                print(f"⚠️ Erreur de traduction (lot de {len(batch)}): {str(e)}")
+                self._count('errors')
+            for text in batch:
+                results.setdefault(text, text)
+
+        return [results[text] for text in texts]
+
+    def get_stats(self):
+        with self._lock:
+            stats = dict(self.stats)
+        stats['entries'] = len(self.cache)
+        return stats
@@ -1,14 +1,76 @@
 import feedparser
 import requests
 from datetime import datetime
-from langdetect import detect, DetectorFactory
 import hashlib
 import re
 import time
+import os
+import sys
 from googletrans import Translator
 
-# Assurer des résultats reproductibles pour langdetect
-DetectorFactory.seed = 0
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from scrapers.feed_fetcher import FeedFetcher
+from scrapers.feed_scheduler import FeedScheduler
+from scrapers.feed_watermark import FeedWatermarks, oldest_entries
+from scrapers.near_duplicates import NearDuplicateIndex
+from scrapers.source_executor import SourceBatch
+from scrapers.language_classifier import LanguageClassifier
+from scrapers.keyword_matcher import KeywordMatcher
+from scrapers.translation_store import TranslationStore
+from processing.reward_parser import find_reward, format_reward
+
+# Fallbacks: mots-clés directs d'opportunités
+FALLBACK_KEYWORDS = [
+    # Anglais
+    'airdrop', 'free', 'earn', 'reward', 'giveaway', 'claim',
+    'bonus', 'incentive', 'campaign', 'contest', 'competition',
+    'whitelist', 'presale', 'launch', 'testnet', 'mainnet',
+    # Français
+    'gratuit', 'gagner', 'récompense', 'cadeau', 'concours',
+    'campagne', 'bonus', 'lancement'
+]
+
+# Principaux: mots-clés crypto + opportunités
+MAIN_KEYWORDS = [
+    # Opportunités directes (anglais)
+    'airdrop', 'quest', 'task', 'reward', 'earn', 'free',
+    'giveaway', 'bonus', 'incentive', 'campaign', 'event',
+    'contest', 'competition', 'opportunity', 'program',
+    # Crypto/DeFi terms (anglais)
+    'defi', 'nft', 'token', 'staking', 'yield', 'farming',
+    'trading', 'swap', 'liquidity', 'bridge', 'layer2',
+    'whitelist', 'presale', 'ido', 'ico', 'launch',
+    'testnet', 'mainnet', 'alpha', 'beta',
+    # Termes français
+    'gratuit', 'gagner', 'récompense', 'jeton', 'crypto',
+    'blockchain', 'opportunité', 'programme', 'concours',
+    'campagne', 'lancement', 'finance', 'investir'
+]
+
+# Espagnol: pré-filtre des titres avant traduction (seuls ceux-là partent au traducteur)
+SPANISH_KEYWORDS = [
+    'gratis', 'ganar', 'recompensa', 'premio', 'sorteo', 'regalo', 'concurso',
+    'campaña', 'lanzamiento', 'tarea', 'misión', 'preventa', 'lista blanca',
+    'bono', 'incentivo', 'oportunidad', 'programa', 'cripto', 'minería',
+    'finanzas', 'invertir', 'puente', 'liquidez', 'rendimiento', 'intercambio'
+]
+
+# Estimation de la récompense, par ordre de priorité
+REWARD_TIERS = [
+    ('reward_major', ['major', 'huge', 'massive', 'big'], "$50-100 estimated"),
+    ('reward_medium', ['medium', 'good', 'decent'], "$20-50 estimated"),
+    ('reward_small', ['small', 'mini', 'quick'], "$5-20 estimated"),
+]
+REWARD_TIER_NAMES = [name for name, _, _ in REWARD_TIERS]
+REWARD_LABELS = {name: label for name, _, label in REWARD_TIERS}
+
+
+def build_keyword_matcher():
+    """Moteur de mots-clés partagé par le filtrage et l'estimation des récompenses"""
+    categories = {'main': MAIN_KEYWORDS, 'fallback': FALLBACK_KEYWORDS, 'spanish': SPANISH_KEYWORDS}
+    categories.update({name: words for name, words, _ in REWARD_TIERS})
+    return KeywordMatcher(categories)
 
 class TwitterRSSScraper:
     def __init__(self):
@@ -44,10 +106,20 @@ class TwitterRSSScraper:
         # Configuration
         self.timeout = 10
         self.max_retries = 2
+        self.fetcher = FeedFetcher(timeout=self.timeout)
+        # Marques d'ingestion persistantes : seules les entrées jamais vues sont traitées
+        self.watermarks = FeedWatermarks()
+        # Polling adaptatif par flux (rythme de publication + santé)
+        self.scheduler = FeedScheduler(self.fetcher, self.feeds + self.fallback_feeds,
+                                       watermarks=self.watermarks)
+        # Regroupement des articles syndiqués sur plusieurs flux (index persistant)
+        self.story_index = NearDuplicateIndex()
+        self.language_classifier = LanguageClassifier()
+        self.keyword_matcher = build_keyword_matcher()
         
         # Traducteur Google
         self.translator = Translator()
-        self.translation_cache = {}  # Cache pour éviter les traductions répétées
+        self.translation_store = TranslationStore()  # Cache disque entre les runs
         
     def test_connection(self):
         """Test la connectivité aux feeds RSS"""
@@ -76,77 +148,163 @@ class TwitterRSSScraper:
         except Exception as e:
             print(f"❌ {feed_url}: {str(e)}")
             
-    def fetch_opportunities(self, max_entries=20):
-        """Récupère les opportunités depuis les flux RSS principaux"""
-        print(f"📡 Récupération des opportunités RSS (max: {max_entries})...")
-        all_entries = []
-        
-        for feed_url in self.feeds:
+    def _collect_entries(self, feed_urls, max_entries, is_fallback, results=None, commit=True):
+        """
+        Transforme les flux récupérés (en parallèle) en entrées RSS.
+        Retourne un SourceBatch : avec commit=False, les entrées ne sont marquées vues (et les
+        validateurs HTTP enregistrés) qu'au `commit()` du lot.
+        """
+        if results is None:
+            results = self.fetcher.fetch_all(feed_urls, commit=False)
+        entries = []
+        new_entries = {}
+        truncated = set()
+
+        for feed_url in feed_urls:
+            result = results.get(feed_url)
+            if result is None:
+                continue
+            if result.status == "not_modified":
+                print(f"  ⏭️ {feed_url}: inchangé (304)")
+                continue
+            if result.status == "error":
+                print(f"  ❌ Erreur {feed_url}: {result.error}")
+                continue
+
             try:
-                print(f"📊 Scraping {feed_url}")
-                feed = feedparser.parse(feed_url)
-                
-                if hasattr(feed, 'entries') and feed.entries:
-                    for entry in feed.entries[:max_entries]:
-                        all_entries.append({
-                            'title': entry.title,
-                            'link': entry.link,
-                            'published': entry.get('published', ''),
-                            'summary': entry.get('summary', entry.get('description', '')),
-                            'source_feed': feed_url,
-                            'is_fallback': False
-                        })
-                    print(f"  ✅ {len(feed.entries[:max_entries])} entrées récupérées")
-                else:
-                    print(f"  ⚠️ Aucune entrée trouvée")
-                    
+                if not result.entries:
+                    print(f"  ⚠️ Aucune entrée trouvée ({feed_url})")
+                    continue
+                # Les mêmes entrées sont traitées et marquées vues (les plus anciennes d'abord)
+                fresh = self.watermarks.filter_new(feed_url, result.entries)
+                feed_entries = oldest_entries(fresh, max_entries)
+                if len(feed_entries) < len(fresh):
+                    truncated.add(feed_url)
+                new_entries[feed_url] = feed_entries
+                entries.extend(self._entries_from_feed(feed_url, feed_entries, is_fallback))
+                print(f"  ✅ {feed_url}: {len(feed_entries)} nouvelles entrées traitées "
+                      f"sur {len(fresh)} ({result.duration:.1f}s)")
             except Exception as e:
                 print(f"  ❌ Erreur {feed_url}: {str(e)}")
                 continue
-                
+
+        # Un flux tronqué garde ses validateurs : le reste sera retéléchargé au prochain passage
+        fetched = [results[feed_url] for feed_url in feed_urls
+                   if feed_url in results and feed_url not in truncated]
+        batch = SourceBatch(entries, [lambda: self._commit_feeds(new_entries, fetched)])
+        if commit:
+            batch.commit()
+        return batch
+
+    def _commit_feeds(self, new_entries, results):
+        """Entrées stockées : marques d'ingestion et validateurs HTTP des flux avancent."""
+        self.scheduler.mark_seen(new_entries)
+        self.fetcher.commit_validators(results)
+
+    @staticmethod
+    def _entries_from_feed(feed_url, feed_entries, is_fallback):
+        """Entrées feedparser -> format d'entrée RSS du pipeline"""
+        return [{
+            'title': entry.title,
+            'link': entry.link,
+            'published': entry.get('published', ''),
+            'summary': entry.get('summary', entry.get('description', '')),
+            'source_feed': feed_url,
+            'is_fallback': is_fallback
+        } for entry in feed_entries]
+
+    def _scheduled_entries(self, new_entries, commit=True):
+        """Entrées du planificateur (déjà limitées par flux : ce sont celles qui seront marquées vues)."""
+        entries = []
+        for feed_url, feed_entries in new_entries.items():
+            try:
+                entries.extend(self._entries_from_feed(feed_url, feed_entries,
+                                                       feed_url in self.fallback_feeds))
+            except Exception as e:
+                print(f"  ❌ Erreur {feed_url}: {str(e)}")
+        return self._cluster_stories(entries, commit)
+
+    def _cluster_stories(self, entries, commit=True):
+        """
+        Une seule entrée par article, même publié sous des URL différentes.
+        Retourne un SourceBatch : avec commit=False, l'index des articles n'est mis à jour
+        qu'au `commit()` du lot (après stockage des opportunités).
+        """
+        entries, pending = self.story_index.match(entries)
+        batch = SourceBatch(entries, [lambda: self._index_stories(pending)])
+        if commit:
+            batch.commit()
+        return batch
+
+    def _index_stories(self, pending):
+        self.story_index.commit(pending)
+        self.story_index.save()
+
+    def fetch_due_opportunities(self, max_entries=30, commit=True):
+        """
+        Récupère uniquement les flux dus selon le planificateur, et seulement leurs nouvelles entrées.
+        commit=False : l'état persistant n'avance qu'au `commit()` du SourceBatch retourné.
+        """
+        due = self.scheduler.due()
+        print(f"📡 {len(due)}/{len(self.scheduler.feeds)} flux RSS à rafraîchir")
+        new_entries, pending = self.scheduler.poll(max_entries=max_entries)
+        entries = self._scheduled_entries(new_entries, commit=False)
+        entries.on_commit(lambda: self.scheduler.commit(pending))
+        if commit:
+            entries.commit()
+        print(f"📊 Total: {len(entries)} nouvelles entrées RSS")
+        return entries
+
+    def start_background_polling(self, on_opportunities, max_entries=30):
+        """
+        Polling continu en arrière-plan : les nouvelles opportunités sont poussées au callback.
+        L'état du lot n'est validé que si le callback (stockage) se termine sans erreur.
+        """
+        def on_entries(new_entries):
+            entries = self._scheduled_entries(new_entries, commit=False)
+            opportunities = SourceBatch(self.parse_rss_data(entries), entries.commits)
+            if opportunities:
+                on_opportunities(opportunities)
+            opportunities.commit()
+
+        self.scheduler.start(on_entries, max_entries=max_entries)
+        print("🛰️ Planificateur RSS démarré en arrière-plan")
+
+    def stop_background_polling(self):
+        self.scheduler.stop()
+
+    def fetch_opportunities(self, max_entries=20, results=None, commit=True):
+        """Récupère les opportunités depuis les flux RSS principaux"""
+        print(f"📡 Récupération des opportunités RSS (max: {max_entries})...")
+        all_entries = self._collect_entries(self.feeds, max_entries, False, results, commit)
         print(f"📊 Total: {len(all_entries)} entrées RSS principales")
         return all_entries
         
-    def fetch_fallback_opportunities(self, max_entries=15):
+    def fetch_fallback_opportunities(self, max_entries=15, results=None, commit=True):
         """Récupère depuis les sources fallback"""
         print(f"🔄 Récupération fallback (max: {max_entries})...")
-        fallback_entries = []
-        
-        for feed_url in self.fallback_feeds:
-            try:
-                print(f"🔄 Fallback scraping {feed_url}")
-                feed = feedparser.parse(feed_url)
-                
-                if hasattr(feed, 'entries') and feed.entries:
-                    for entry in feed.entries[:max_entries]:
-                        fallback_entries.append({
-                            'title': entry.title,
-                            'link': entry.link,
-                            'published': entry.get('published', ''),
-                            'summary': entry.get('summary', entry.get('description', '')),
-                            'source_feed': feed_url,
-                            'is_fallback': True
-                        })
-                    print(f"  ✅ {len(feed.entries[:max_entries])} entrées fallback")
-                else:
-                    print(f"  ⚠️ Aucune entrée fallback")
-                    
-            except Exception as e:
-                print(f"  ⚠️ Fallback failed {feed_url}: {str(e)}")
-                continue
-                
+        fallback_entries = self._collect_entries(self.fallback_feeds, max_entries, True, results, commit)
         print(f"🔄 Total fallback: {len(fallback_entries)} entrées")
         return fallback_entries
         
-    def fetch_all_opportunities(self, max_entries=15):
-        """Récupère toutes les opportunités (principales + fallback) avec déduplication"""
+    def fetch_all_opportunities(self, max_entries=15, commit=True):
+        """
+        Récupère toutes les opportunités (principales + fallback) avec déduplication.
+        commit=False : marques d'ingestion et index des articles n'avancent qu'au `commit()`
+        du SourceBatch retourné.
+        """
         print(f"🚀 Récupération complète des opportunités (max: {max_entries} par source)...")
         
+        # Tous les flux (principaux + fallback) sont téléchargés en une seule vague parallèle
+        start = time.time()
+        results = self.fetcher.fetch_all(self.feeds + self.fallback_feeds, commit=False)
+        print(f"⚡ {len(results)} flux récupérés en {time.time() - start:.1f}s")
+        
         # Récupération des flux principaux
-        main_entries = self.fetch_opportunities(max_entries)
+        main_entries = self.fetch_opportunities(max_entries, results, commit=False)
         
         # Récupération des flux fallback
-        fallback_entries = self.fetch_fallback_opportunities(max_entries)
+        fallback_entries = self.fetch_fallback_opportunities(max_entries, results, commit=False)
         
         # Combinaison
         all_entries = main_entries + fallback_entries
@@ -162,142 +320,87 @@ class TwitterRSSScraper:
             else:
                 print(f"🔄 Duplicate removed: {entry['title'][:30]}...")
         
-        print(f"📊 Total après déduplication: {len(deduplicated_entries)} entrées uniques")
-        return deduplicated_entries
+        # Copies d'un même article sous des URL différentes
+        deduplicated_entries = self._cluster_stories(deduplicated_entries, commit=False)
+        batch = SourceBatch(deduplicated_entries,
+                            main_entries.commits + fallback_entries.commits + deduplicated_entries.commits)
+        if commit:
+            batch.commit()
+        
+        print(f"📊 Total après déduplication: {len(batch)} entrées uniques")
+        return batch
         
     def is_supported_language(self, text):
         """Détecte si le contenu est en anglais, français OU espagnol"""
-        try:
-            # Nettoyer le texte
-            clean_text = text.replace('\n', ' ').replace('\t', ' ').strip()
-            if len(clean_text) < 10:
-                return True  # Trop court pour détecter, on garde
-            
-            detected_lang = detect(clean_text)
-            # Accepter l'anglais, le français, l'espagnol, le portugais
-            # + langues parfois confondues par langdetect (lt=lituanien, ko=coréen peuvent être des faux positifs)
-            return detected_lang in ['en', 'fr', 'es', 'pt', 'lt']
-            
-        except Exception as e:
-            # En cas d'erreur, on garde le contenu
-            return True
+        # Textes trop courts ou indétectables : on garde le contenu
+        return self.language_classifier.is_supported(self.language_classifier.classify(text))
             
     def translate_to_english(self, text, source_lang='auto'):
         """Traduit un texte vers l'anglais en utilisant Google Translate"""
-        try:
-            # Vérifier le cache
-            cache_key = f"{source_lang}:{text[:50]}"
-            if cache_key in self.translation_cache:
-                return self.translation_cache[cache_key]
+        return self.translate_batch_to_english([text], source_lang)[0]
             
-            # Traduire
-            translation = self.translator.translate(text, src=source_lang, dest='en')
-            translated_text = translation.text
-            
-            # Mettre en cache
-            self.translation_cache[cache_key] = translated_text
-            
-            return translated_text
-            
-        except Exception as e:
-            print(f"⚠️ Erreur de traduction: {str(e)}")
-            return text  # Retourner le texte original en cas d'erreur
+    def translate_batch_to_english(self, texts, source_lang='auto'):
+        """Traduit un lot de textes vers l'anglais (cache disque + appels groupés)"""
+        return self.translation_store.translate(texts, self.translator, source_lang, 'en')
             
     def _estimate_reward(self, title, summary):
         """Estime la récompense basée sur le titre et résumé"""
-        text = f"{title} {summary}".lower()
+        text = f"{title} {summary}"
         
-        # Recherche de montants explicites
-        amounts = re.findall(r'\$(\d+)', text)
-        if amounts:
-            return f"${amounts[0]}"
-            
-        # Recherche de crypto amounts
-        crypto_amounts = re.findall(r'(\d+)\s*(usdt|usdc|eth|btc)', text)
-        if crypto_amounts:
-            amount, token = crypto_amounts[0]
-            return f"{amount} {token.upper()}"
+        # Montant explicite : dollars en priorité, sinon USDT/USDC/ETH/BTC
+        reward = find_reward(text)
+        if reward:
+            return format_reward(reward)
         
         # Estimation basée sur des mots-clés
-        if any(word in text for word in ['major', 'huge', 'massive', 'big']):
-            return "$50-100 estimated"
-        elif any(word in text for word in ['medium', 'good', 'decent']):
-            return "$20-50 estimated"
-        elif any(word in text for word in ['small', 'mini', 'quick']):
-            return "$5-20 estimated"
-        else:
-            return "$10-30 estimated"
+        tier = self.keyword_matcher.first(text.lower(), REWARD_TIER_NAMES)
+        return REWARD_LABELS.get(tier, "$10-30 estimated")
+            
+    def _matches_keywords(self, title, is_fallback=False):
+        """Vrai si le titre contient un mot-clé de la liste (principale ou fallback)"""
+        return self.keyword_matcher.has(title.lower(), 'fallback' if is_fallback else 'main')
+            
+    def _worth_translating(self, title, is_fallback=False):
+        """Pré-filtre d'un titre espagnol : mots-clés habituels ou mots-clés espagnols"""
+        return self._matches_keywords(title, is_fallback) or self.keyword_matcher.has(title.lower(), 'spanish')
             
     def parse_rss_data(self, rss_entries):
         """Transforme les entrées RSS en format standard"""
         print(f"🔍 Parsing {len(rss_entries)} entrées RSS...")
         opportunities = []
         
-        for entry in rss_entries:
+        # Une seule classification par texte distinct, pour tout le lot (cache persistant)
+        languages = self.language_classifier.classify_batch(
+            [f"{entry['title']} {entry.get('summary', '')}" for entry in rss_entries]
+        )
+        
+        # Traduction groupée des seuls titres espagnols qui passent le pré-filtre
+        # (le titre traduit sert uniquement au filtrage, la sortie garde l'original)
+        to_translate = [
+            entry['title'] for entry, lang in zip(rss_entries, languages)
+            if lang == 'es' and self._worth_translating(entry['title'], entry.get('is_fallback', False))
+        ]
+        translations = {}
+        if to_translate:
+            print(f"🏪 Traducing {len(set(to_translate))} Spanish titles...")
+            translations = dict(zip(to_translate, self.translate_batch_to_english(to_translate, 'es')))
+        
+        for entry, detected_lang in zip(rss_entries, languages):
             try:
                 # Vérification de la langue (anglais, français ET espagnol)
-                full_text = f"{entry['title']} {entry.get('summary', '')}"
-                detected_lang = 'en'  # Par défaut
-                
-                try:
-                    detected_lang = detect(full_text)
-                except:
-                    pass
-                
-                if not self.is_supported_language(full_text):
+                if not self.language_classifier.is_supported(detected_lang):
                     print(f"🌐 Skipped ({detected_lang}): {entry['title'][:50]}...")
                     continue
                 
-                # Traduction si nécessaire (espagnol vers anglais)
-                original_title = entry['title']
-                original_summary = entry.get('summary', '')
-                
+                # Titre traduit si nécessaire (espagnol vers anglais)
+                title_for_filtering = entry['title']
                 if detected_lang == 'es':
-                    print(f"🏪 Traducing from Spanish: {original_title[:30]}...")
-                    translated_title = self.translate_to_english(original_title, 'es')
-                    translated_summary = self.translate_to_english(original_summary, 'es') if original_summary else ''
-                    
-                    # Utiliser les versions traduites pour le filtrage
-                    title_for_filtering = translated_title
-                    summary_for_filtering = translated_summary
-                else:
-                    title_for_filtering = original_title
-                    summary_for_filtering = original_summary
-                
-                # Filtrage basique des opportunités
-                title_lower = title_for_filtering.lower()
+                    if entry['title'] not in translations:
+                        continue  # Écarté par le pré-filtre, inutile de traduire
+                    title_for_filtering = translations[entry['title']]
                 
-                # Mots-clés élargis pour capturer plus d'opportunités (anglais + français)
-                if entry.get('is_fallback', False):
-                    # Fallbacks: mots-clés directs d'opportunités
-                    keywords = [
-                        # Anglais
-                        'airdrop', 'free', 'earn', 'reward', 'giveaway', 'claim',
-                        'bonus', 'incentive', 'campaign', 'contest', 'competition',
-                        'whitelist', 'presale', 'launch', 'testnet', 'mainnet',
-                        # Français
-                        'gratuit', 'gagner', 'récompense', 'cadeau', 'concours',
-                        'campagne', 'bonus', 'lancement'
-                    ]
-                else:
-                    # Principaux: mots-clés crypto + opportunités
-                    keywords = [
-                        # Opportunités directes (anglais)
-                        'airdrop', 'quest', 'task', 'reward', 'earn', 'free',
-                        'giveaway', 'bonus', 'incentive', 'campaign', 'event',
-                        'contest', 'competition', 'opportunity', 'program',
-                        # Crypto/DeFi terms (anglais)
-                        'defi', 'nft', 'token', 'staking', 'yield', 'farming',
-                        'trading', 'swap', 'liquidity', 'bridge', 'layer2',
-                        'whitelist', 'presale', 'ido', 'ico', 'launch',
-                        'testnet', 'mainnet', 'alpha', 'beta',
-                        # Termes français
-                        'gratuit', 'gagner', 'récompense', 'jeton', 'crypto',
-                        'blockchain', 'opportunité', 'programme', 'concours',
-                        'campagne', 'lancement', 'finance', 'investir'
-                    ]
-                
-                if any(keyword in title_lower for keyword in keywords):
+                # Filtrage basique des opportunités (mots-clés anglais + français)
+                if self._matches_keywords(title_for_filtering, entry.get('is_fallback', False)):
                     # Estimation de la récompense
                     estimated_reward = self._estimate_reward(entry['title'], entry.get('summary', ''))
                     
@@ -343,11 +446,7 @@ class TwitterRSSScraper:
             result = self.is_supported_language(text)
             
             # Debug: montrer quelle langue est détectée
-            try:
-                detected_lang = detect(text)
-                debug_info = f"(detected: {detected_lang})"
-            except:
-                debug_info = "(detection failed)"
+            debug_info = f"(detected: {self.language_classifier.classify(text)})"
             
             status = "✅" if result == expected else "❌"
             print(f"{status} {description}: {result} {debug_info} (expected: {expected})")
@@ -0,0 +1,86 @@
+# scrapers/zealy_registry.py - Registre des communautés Zealy à surveiller
+import json
+import os
+import threading
+import time
+
+DEFAULT_COMMUNITIES = ["aipioneers"]
+
+
+class ZealyCommunityRegistry:
+    """
+    Registre persistant (JSON) des communautés Zealy.
+
+    Pour chaque sous-domaine : intervalle de polling, date du dernier passage et
+    curseur « dernier vu » (date de la quête la plus récente déjà récupérée).
+    Le crawler ne visite que les communautés dues et ignore les quêtes déjà vues.
+    """
+
+    def __init__(self, path="data/zealy_communities.json", default_interval=3600):
+        self.path = path
+        self.default_interval = default_interval
+        self._lock = threading.Lock()
+        self.communities = self._load()
+
+    def _load(self):
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    return json.load(f).get("communities", {})
+            except (OSError, ValueError) as e:
+                print(f"[⚠] Registre Zealy illisible ({e}), réinitialisation")
+        return {subdomain: self._new_entry() for subdomain in DEFAULT_COMMUNITIES}
+
+    def _new_entry(self, poll_interval=None):
+        return {
+            "poll_interval": poll_interval or self.default_interval,
+            "last_polled": 0,
+            "last_seen": None,
+            "enabled": True,
+        }
+
+    def save(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._lock:
+            data = {"communities": self.communities}
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=2, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+
+    def add(self, subdomain, poll_interval=None):
+        """Ajoute une communauté (ou met à jour son intervalle si elle existe déjà)."""
+        with self._lock:
+            entry = self.communities.setdefault(subdomain, self._new_entry(poll_interval))
+            if poll_interval:
+                entry["poll_interval"] = poll_interval
+            entry["enabled"] = True
+
+    def remove(self, subdomain):
+        with self._lock:
+            self.communities.pop(subdomain, None)
+
+    def due(self, now=None):
+        """Sous-domaines dont l'intervalle de polling est écoulé, les plus en retard d'abord."""
+        now = now or time.time()
+        with self._lock:
+            ready = [
+                (entry["last_polled"] + entry["poll_interval"], subdomain)
+                for subdomain, entry in self.communities.items()
+                if entry.get("enabled", True) and entry["last_polled"] + entry["poll_interval"] <= now
+            ]
+        return [subdomain for _, subdomain in sorted(ready)]
+
+    def cursor(self, subdomain):
+        with self._lock:
+            return self.communities.get(subdomain, {}).get("last_seen")
+
+    def mark_polled(self, subdomain, cursor=None, now=None):
+        """Enregistre un passage réussi ; le curseur n'avance jamais en arrière."""
+        with self._lock:
+            entry = self.communities.setdefault(subdomain, self._new_entry())
+            entry["last_polled"] = now or time.time()
+            if cursor and (not entry["last_seen"] or cursor > entry["last_seen"]):
+                entry["last_seen"] = cursor
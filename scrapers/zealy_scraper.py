@@ -1,6 +1,11 @@
 import requests
 import time
 import json
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+from email.utils import parsedate_to_datetime
+from requests.adapters import HTTPAdapter
 
 import os
 import sys
@@ -13,6 +18,34 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')
 
 from vault_manager import VaultManager
 from utils import get_today_date_str
+from scrapers.zealy_registry import ZealyCommunityRegistry
+from scrapers.source_executor import SourceBatch
+from processing.rates import get_rate_provider
+from processing.reward_parser import parse_reward
+
+
+class RateLimiter:
+    """Budget global de requêtes/seconde partagé par tous les workers (token bucket)"""
+
+    def __init__(self, rate_per_second, burst=None):
+        self.rate = float(rate_per_second)
+        self.capacity = float(burst or max(1, rate_per_second))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
 
 class ZealyScraper:
     def __init__(self):
@@ -23,6 +56,20 @@ class ZealyScraper:
         self.base_url = f"https://api-v1.zealy.io/communities/{self.subdomain}/quests"
         self.output_dir = "data"
         os.makedirs(self.output_dir, exist_ok=True)
+        self.max_concurrency = 4
+        self.session = self._build_session(self.max_concurrency)
+        # Pause partagée par tous les workers après un 429 (Retry-After)
+        self._pause_until = 0.0
+        self._pause_lock = threading.Lock()
+        self.rate_limiter = None
+
+    def _build_session(self, pool_size):
+        """Session HTTP réutilisant les connexions TCP/TLS entre les pages"""
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        session.mount("https://", adapter)
+        session.headers.update(self.headers)
+        return session
 
     def _get_auth_headers(self):
         # Utiliser directement les variables d'environnement au lieu du Vault
@@ -34,61 +81,257 @@ class ZealyScraper:
             "Content-Type": "application/json"
         }
 
-    def fetch_all_quests(self, max_pages=20, delay=0.5):
-        all_quests = []
-        page = 1
+    @staticmethod
+    def _retry_after_seconds(response, default):
+        """Délai demandé par l'API via Retry-After (secondes ou date HTTP)"""
+        value = response.headers.get("Retry-After")
+        if not value:
+            return default
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            try:
+                return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+            except Exception:
+                return default
+
+    def _wait_for_rate_limit(self):
+        with self._pause_lock:
+            wait = self._pause_until - time.time()
+        if wait > 0:
+            time.sleep(wait)
 
-        while page <= max_pages:
-            url = f"{self.base_url}?page={page}&limit=20"
+    def _pause_all(self, seconds):
+        with self._pause_lock:
+            self._pause_until = max(self._pause_until, time.time() + seconds)
+
+    @staticmethod
+    def _community_url(subdomain):
+        return f"https://api-v1.zealy.io/communities/{subdomain}/quests"
+
+    def _fetch_page(self, page, limit=20, max_retries=3, backoff=1.0, subdomain=None):
+        """Récupère une page ; réessaie cette page seule en cas de 429, 5xx ou erreur réseau"""
+        base_url = self._community_url(subdomain) if subdomain else self.base_url
+        url = f"{base_url}?page={page}&limit={limit}"
+        last_error = None
+
+        for attempt in range(max_retries + 1):
+            self._wait_for_rate_limit()
+            rate_limiter = self.rate_limiter  # Peut être retiré par crawl_communities entre-temps
+            if rate_limiter:
+                rate_limiter.acquire()
             try:
-                response = requests.get(url, headers=self.headers, timeout=15)
+                response = self.session.get(url, timeout=15)
+                if response.status_code == 429:
+                    wait = self._retry_after_seconds(response, backoff * 2 ** attempt)
+                    print(f"[⏳] Zealy 429 (page {page}) - pause {wait:.1f}s")
+                    self._pause_all(wait)
+                    last_error = Exception("HTTP 429 Too Many Requests")
+                    continue
+                if response.status_code >= 500:
+                    raise Exception(f"HTTP {response.status_code}")
                 response.raise_for_status()
                 data = response.json()
 
                 # La réponse est une liste ou dict avec clé 'data'
-                quests = data if isinstance(data, list) else data.get("data", [])
+                return data if isinstance(data, list) else data.get("data", [])
+            except Exception as e:
+                last_error = e
+                if attempt < max_retries:
+                    # Backoff exponentiel avec jitter pour ne pas resynchroniser les workers
+                    time.sleep(backoff * 2 ** attempt * (0.5 + random.random()))
+
+        raise Exception(f"page {page} abandonnée après {max_retries + 1} tentatives: {last_error}")
+
+    def fetch_all_quests(self, max_pages=20, delay=0, concurrency=None, limit=20):
+        """
+        Récupère toutes les pages de quêtes avec au plus `concurrency` requêtes en vol.
+        Les pages sont demandées par vagues ; le crawl s'arrête à la première page vide
+        ou incomplète. Une page en échec est réessayée seule et n'interrompt pas les autres.
+        """
+        concurrency = concurrency or self.max_concurrency
+        pages = {}
+        failed_pages = []
+        full_page_size = None
+        last_page = max_pages
+        next_page = 1
+
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            while next_page <= max_pages:
+                wave = list(range(next_page, min(next_page + concurrency, max_pages + 1)))
+                next_page = wave[-1] + 1
+                futures = {page: executor.submit(self._fetch_page, page, limit) for page in wave}
+
+                for page in wave:
+                    try:
+                        quests = futures[page].result()
+                    except Exception as e:
+                        print(f"[✖] Erreur Zealy API (page {page}): {e}")
+                        failed_pages.append(page)
+                        continue
+
+                    if not quests:
+                        print(f"[ℹ] Aucune quête trouvée à la page {page}. Fin du scraping.")
+                        last_page = min(last_page, page - 1)
+                        continue
 
-                if not quests:
-                    print(f"[ℹ] Aucune quête trouvée à la page {page}. Fin du scraping.")
+                    pages[page] = quests
+                    print(f"[→] Page {page} : {len(quests)} quêtes extraites")
+                    if full_page_size is None:
+                        full_page_size = len(quests)
+                    elif len(quests) < full_page_size:
+                        last_page = min(last_page, page)
+
+                if last_page < next_page:
                     break
+                if delay and next_page <= max_pages:
+                    time.sleep(delay)
 
-                all_quests.extend(quests)
-                print(f"[→] Page {page} : {len(quests)} quêtes extraites")
-                page += 1
-                time.sleep(delay)
-            except Exception as e:
-                print(f"[✖] Erreur Zealy API (page {page}): {e}")
-                break
+        # Remettre les pages dans l'ordre, en ignorant celles au-delà de la dernière page
+        all_quests = []
+        for page in sorted(pages):
+            if page <= last_page:
+                all_quests.extend(pages[page])
 
+        if failed_pages:
+            print(f"[⚠] Pages Zealy en échec: {failed_pages}")
         self.save_quests(all_quests)
         return all_quests
 
+    @staticmethod
+    def _quest_timestamp(quest):
+        """Date ISO de dernière modification de la quête, ou None si l'API n'en donne pas."""
+        return quest.get("updatedAt") or quest.get("createdAt") or None
+
+    def _is_fresh(self, quest, cursor):
+        """Postérieure au curseur ; une quête sans date est toujours retenue (l'index des vues la filtre)."""
+        timestamp = self._quest_timestamp(quest)
+        return not cursor or not timestamp or timestamp > cursor
+
+    def _crawl_community(self, subdomain, cursor, max_pages, limit, stop=None):
+        """
+        Parcourt toutes les pages d'une communauté et garde les quêtes postérieures au curseur.
+        L'API ne garantit aucun ordre de tri : le curseur filtre, il n'arrête pas le parcours.
+        Retourne (nouvelles quêtes, parcours complet) ; un parcours tronqué par `max_pages`
+        ne doit pas faire avancer le curseur. Retourne None si le crawl est interrompu
+        (`stop`) : la communauté reste due.
+        """
+        new_quests = []
+        for page in range(1, max_pages + 1):
+            if stop is not None and stop.is_set():
+                return None  # Budget écoulé ou source abandonnée : communauté reportée
+            quests = self._fetch_page(page, limit, subdomain=subdomain)
+            if not quests:
+                return new_quests, True
+            fresh = [q for q in quests if self._is_fresh(q, cursor)]
+            for quest in fresh:
+                quest["_community"] = subdomain
+            new_quests.extend(fresh)
+            if len(quests) < limit:
+                return new_quests, True
+        print(f"[⚠] Zealy ({subdomain}): plus de {max_pages} pages, curseur inchangé")
+        return new_quests, False
+
+    def crawl_communities(self, registry=None, max_concurrency=16, requests_per_second=10,
+                          max_pages=5, limit=20, time_budget=None, commit=True, stop=None):
+        """
+        Crawl de toutes les communautés dues du registre, en parallèle, sous un budget
+        global de `max_concurrency` requêtes en vol et `requests_per_second` req/s.
+        Retourne les quêtes brutes (nouvelles depuis le curseur), taguées `_community`,
+        dans un SourceBatch.
+
+        time_budget : durée maximale (s) du crawl. Les communautés non terminées à temps
+        s'arrêtent à la page suivante et restent dues (ni curseur ni passage enregistrés).
+        commit=False : passages et curseurs ne sont enregistrés qu'au `commit()` du lot,
+        une fois les quêtes stockées.
+        stop : threading.Event levé quand la source est abandonnée ; le crawl s'arrête
+        comme à l'épuisement du budget.
+        """
+        registry = registry or ZealyCommunityRegistry()
+        due = registry.due()
+        if not due:
+            print("[ℹ] Aucune communauté Zealy à rafraîchir pour le moment")
+            return SourceBatch()
+
+        if max_concurrency > self.max_concurrency:
+            self.max_concurrency = max_concurrency
+            self.session = self._build_session(max_concurrency)
+        self.rate_limiter = RateLimiter(requests_per_second)
+        print(f"[→] Crawl Zealy: {len(due)} communautés, {max_concurrency} en parallèle, "
+              f"{requests_per_second} req/s")
+
+        polled_at = time.time()
+        all_quests = []
+        polled = []     # (sous-domaine, nouveau curseur) à enregistrer au commit
+        failed = []
+        stop = stop or threading.Event()
+        deadline = time.monotonic() + time_budget if time_budget is not None else None
+        executor = ThreadPoolExecutor(max_workers=max_concurrency)
+        try:
+            futures = {
+                subdomain: executor.submit(self._crawl_community, subdomain,
+                                           registry.cursor(subdomain), max_pages, limit, stop)
+                for subdomain in due
+            }
+            not_done = set(futures.values())
+            # Attente par tranches d'une seconde : budget et arrêt externe sont surveillés
+            while not_done and not stop.is_set():
+                remaining = deadline - time.monotonic() if deadline is not None else 1.0
+                if remaining <= 0:
+                    break
+                not_done = wait(not_done, timeout=min(remaining, 1.0)).not_done
+            done = set(futures.values()) - not_done
+            if not_done:
+                reason = "source abandonnée" if stop.is_set() else f"budget de {time_budget}s écoulé"
+                stop.set()
+                for future in not_done:
+                    future.cancel()
+                print(f"[⏰] Crawl Zealy interrompu ({reason}) : {len(not_done)} communautés "
+                      f"reportées au prochain run")
+            for subdomain, future in futures.items():
+                if future not in done:
+                    continue
+                try:
+                    crawled = future.result()
+                except Exception as e:
+                    print(f"[✖] Erreur Zealy ({subdomain}): {e}")
+                    failed.append(subdomain)
+                    continue
+                if crawled is None:
+                    continue
+                quests, complete = crawled
+                timestamps = [ts for ts in map(self._quest_timestamp, quests) if ts]
+                cursor = max(timestamps, default=None) if complete else None
+                polled.append((subdomain, cursor))
+                all_quests.extend(quests)
+        finally:
+            # Pas d'attente des pages encore en vol quand le budget est épuisé : elles
+            # s'arrêtent d'elles-mêmes à la page suivante (stop)
+            executor.shutdown(wait=False, cancel_futures=True)
+            self.rate_limiter = None
+
+        def record_polls():
+            for subdomain, cursor in polled:
+                registry.mark_polled(subdomain, cursor, now=polled_at)
+            registry.save()
+
+        print(f"[✔] {len(all_quests)} nouvelles quêtes Zealy sur {len(polled)} communautés"
+              + (f" ({len(failed)} en échec)" if failed else ""))
+        batch = SourceBatch(all_quests, [record_polls])
+        if commit:
+            batch.commit()
+        return batch
+
     def calculate_roi(self, reward_amount, time_est_min, currency="XP"):
-        """Calcul ROI en $/min avec conversion des devises"""
-        # Taux de conversion approximatifs (à ajuster selon le marché)
-        currency_rates = {
-            "XP": 0.01,      # 1 XP = $0.01
-            "POINTS": 0.005, # 1 POINT = $0.005
-            "TOKENS": 1.0,   # 1 TOKEN = $1.00
-            "GAL": 2.5,      # 1 GAL = $2.50
-            "USD": 1.0       # 1 USD = $1.00
-        }
-        
-        usd_value = reward_amount * currency_rates.get(currency.upper(), 0.01)
+        """Calcul ROI en $/min avec conversion des devises (mêmes taux que le pipeline de processing)"""
+        usd_value = reward_amount * get_rate_provider().rate(currency.upper())
         return round(usd_value / max(time_est_min, 1), 4)  # Éviter division par 0
     
     def _extract_numeric_reward(self, value):
         """Extrait la valeur numérique d'un reward (gère les strings et nombres)"""
-        if isinstance(value, (int, float)):
-            return float(value)
-        elif isinstance(value, str):
-            # Essayer d'extraire le nombre d'une string comme "100 XP" ou "100"
-            import re
-            match = re.search(r'([0-9]+(?:\.[0-9]+)?)', str(value))
-            if match:
-                return float(match.group(1))
+        if not isinstance(value, (int, float, str)):
             return 0.0
-        return 0.0
+        return parse_reward(value).amount or 0.0
     
     def validate_quest_data(self, quest):
         """Valide les données d'une quête"""
@@ -140,7 +383,8 @@ class ZealyScraper:
                 "roi_usd_per_min": roi_usd_per_min,
                 "start_time": q.get("startDate", ""),
                 "end_time": q.get("endDate", ""),
-                "source": "Zealy"
+                "source": "Zealy",
+                "community": q.get("_community", self.subdomain)
             })
         
         # Trier par ROI décroissant
@@ -157,7 +401,7 @@ class ZealyScraper:
         """Méthode simplifiée pour récupérer un nombre limité de quêtes"""
         url = f"{self.base_url}?limit={limit}"
         try:
-            response = requests.get(url, headers=self.headers, timeout=15)
+            response = self.session.get(url, timeout=15)
             response.raise_for_status()
             data = response.json()
             
@@ -0,0 +1,246 @@
+# storage/opportunity_store.py - Stockage unique des opportunités (SQLite en mode WAL)
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from processing.canonical_key import opportunity_key
+from processing.opportunity import json_default
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    pipeline TEXT NOT NULL,
+    started_at REAL NOT NULL,
+    finished_at REAL,
+    stored INTEGER NOT NULL DEFAULT 0,
+    stats TEXT
+);
+CREATE TABLE IF NOT EXISTS opportunities (
+    hash TEXT PRIMARY KEY,
+    source TEXT,
+    title TEXT,
+    url TEXT,
+    reward TEXT,
+    reward_currency TEXT,
+    roi REAL,
+    time_est_min REAL,
+    deadline TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    run_id INTEGER REFERENCES runs (id),
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS opportunities_source_roi ON opportunities (source, roi DESC);
+CREATE INDEX IF NOT EXISTS opportunities_roi ON opportunities (roi DESC);
+CREATE INDEX IF NOT EXISTS opportunities_created_at ON opportunities (created_at);
+CREATE TABLE IF NOT EXISTS source_stats (
+    run_id INTEGER NOT NULL REFERENCES runs (id),
+    source TEXT NOT NULL,
+    status TEXT,
+    count INTEGER NOT NULL DEFAULT 0,
+    duration REAL,
+    error TEXT,
+    PRIMARY KEY (run_id, source)
+);
+"""
+
+# Première apparition conservée (created_at) ; le reste suit la dernière version vue
+UPSERT = """
+INSERT INTO opportunities (hash, source, title, url, reward, reward_currency, roi, time_est_min, deadline,
+                           created_at, updated_at, run_id, data)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (hash) DO UPDATE SET
+    source = excluded.source, title = excluded.title, url = excluded.url, reward = excluded.reward,
+    reward_currency = excluded.reward_currency, roi = excluded.roi, time_est_min = excluded.time_est_min,
+    deadline = excluded.deadline, updated_at = excluded.updated_at, run_id = excluded.run_id,
+    data = excluded.data
+"""
+
+
+def _number(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _json_default(obj):
+    try:
+        return json_default(obj)
+    except TypeError:
+        return str(obj)  # datetime, Decimal... : conservés sous forme de texte
+
+
+def _row(op, run_id, now):
+    """Colonnes indexées + document JSON complet d'une opportunité (dict ou Opportunity)."""
+    key = opportunity_key(op)
+    reward = op.get('reward')
+    return (key, op.get('source'), op.get('title'), op.get('url') or op.get('link'),
+            None if reward is None else str(reward), op.get('reward_currency') or op.get('currency_detected'),
+            _number(op.get('roi', op.get('roi_usd_per_min'))),
+            _number(op.get('time_est_min', op.get('estimated_time'))),
+            op.get('deadline') or op.get('end_time'), now, now, run_id,
+            json.dumps(op, default=_json_default, ensure_ascii=False))
+
+
+class OpportunityStore:
+    """
+    Base SQLite unique pour toutes les sources et tous les runs, à la place des dumps JSON.
+
+    Mode WAL : les lecteurs (dashboard, bots, scripts d'analyse) interrogent la base pendant
+    qu'un run écrit. Une opportunité est identifiée par sa clé canonique (`hash`) et mise à
+    jour sur place ; chaque run écrit son lot en une seule transaction. Les colonnes usuelles
+    (source, ROI, dates) sont indexées, le document complet est gardé en JSON.
+    """
+
+    def __init__(self, path="data/opportunities.db"):
+        self.path = path or ":memory:"
+        if path:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self.conn.execute("PRAGMA synchronous = NORMAL")  # Suffisant en WAL : durable au checkpoint
+        self.conn.executescript(SCHEMA)
+        self.conn.commit()
+
+    # --- Écriture ---
+
+    def start_run(self, pipeline, now=None):
+        """Ouvre un run ; retourne son identifiant."""
+        with self._lock, self.conn:
+            return self._start_run(pipeline, now)
+
+    def save_opportunities(self, opportunities, run_id=None, now=None):
+        """Upsert du lot par clé canonique, en une transaction ; retourne le nombre d'opportunités écrites."""
+        with self._lock, self.conn:
+            return self._save_opportunities(opportunities, run_id, now)
+
+    def record_source_stats(self, run_id, execution_report):
+        """Enregistre le rapport de run_sources (statut, volume, durée par source)."""
+        with self._lock, self.conn:
+            self._record_source_stats(run_id, execution_report)
+
+    def finish_run(self, run_id, stats=None, now=None):
+        with self._lock, self.conn:
+            self._finish_run(run_id, stats, now)
+
+    def save_run(self, pipeline, opportunities, stats=None, execution_report=None):
+        """
+        Raccourci : un run complet (lot, statistiques, rapport des sources) en une seule
+        transaction — un échec n'en laisse aucune trace ; retourne son identifiant.
+        """
+        with self._lock, self.conn:
+            run_id = self._start_run(pipeline)
+            self._save_opportunities(opportunities, run_id)
+            if execution_report:
+                self._record_source_stats(run_id, execution_report)
+            self._finish_run(run_id, stats)
+        print(f"🗄️ Run {run_id}: {len(opportunities)} opportunités enregistrées dans {self.path}")
+        return run_id
+
+    # Étapes d'écriture, sans verrou ni transaction : l'appelant les fournit
+
+    def _start_run(self, pipeline, now=None):
+        cursor = self.conn.execute("INSERT INTO runs (pipeline, started_at) VALUES (?, ?)",
+                                   (pipeline, now or time.time()))
+        return cursor.lastrowid
+
+    def _save_opportunities(self, opportunities, run_id=None, now=None):
+        now = now or time.time()
+        rows = [_row(op, run_id, now) for op in opportunities]
+        self.conn.executemany(UPSERT, rows)
+        if run_id is not None:
+            self.conn.execute("UPDATE runs SET stored = stored + ? WHERE id = ?", (len(rows), run_id))
+        return len(rows)
+
+    def _record_source_stats(self, run_id, execution_report):
+        rows = [(run_id, source['name'], source.get('status'), source.get('count') or 0, source.get('duration'),
+                 source.get('error'))
+                for source in (execution_report or {}).get('sources', [])]
+        self.conn.executemany("""
+            INSERT OR REPLACE INTO source_stats (run_id, source, status, count, duration, error)
+            VALUES (?, ?, ?, ?, ?, ?)
+        """, rows)
+
+    def _finish_run(self, run_id, stats=None, now=None):
+        self.conn.execute("UPDATE runs SET finished_at = ?, stats = ? WHERE id = ?",
+                          (now or time.time(), json.dumps(stats, default=str) if stats else None, run_id))
+
+    # --- Lecture (requêtes indexées) ---
+
+    def query(self, source=None, min_roi=None, since=None, limit=None, order_by='roi'):
+        """
+        Opportunités (documents complets, avec `created_at` / `updated_at`) filtrées par
+        source(s), ROI minimum et date de première apparition ; triées par ROI ou par date.
+        """
+        clauses, params = [], []
+        if source:
+            sources = [source] if isinstance(source, str) else list(source)
+            clauses.append(f"source IN ({','.join('?' * len(sources))})")
+            params.extend(sources)
+        if min_roi is not None:
+            clauses.append("roi >= ?")
+            params.append(min_roi)
+        if since is not None:
+            clauses.append("created_at >= ?")
+            params.append(since)
+        sql = "SELECT data, created_at, updated_at FROM opportunities"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY created_at DESC" if order_by == 'created_at' else " ORDER BY roi DESC"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        with self._lock:
+            rows = self.conn.execute(sql, params).fetchall()
+        opportunities = []
+        for row in rows:
+            op = json.loads(row['data'])
+            op['created_at'], op['updated_at'] = row['created_at'], row['updated_at']
+            opportunities.append(op)
+        return opportunities
+
+    def top(self, limit=5, min_roi=None, source=None):
+        return self.query(source=source, min_roi=min_roi, limit=limit)
+
+    def get(self, key):
+        with self._lock:
+            row = self.conn.execute("SELECT data FROM opportunities WHERE hash = ?", (key,)).fetchone()
+        return json.loads(row['data']) if row else None
+
+    def source_counts(self, since=None):
+        """{source: nombre d'opportunités} (apparues depuis `since` si précisé)."""
+        sql = "SELECT source, COUNT(*) FROM opportunities"
+        params = []
+        if since is not None:
+            sql += " WHERE created_at >= ?"
+            params.append(since)
+        with self._lock:
+            return dict(self.conn.execute(sql + " GROUP BY source", params).fetchall())
+
+    def runs(self, limit=10):
+        """Derniers runs, du plus récent au plus ancien."""
+        with self._lock:
+            rows = self.conn.execute("SELECT * FROM runs ORDER BY id DESC LIMIT ?", (limit,)).fetchall()
+        return [dict(row, stats=json.loads(row['stats']) if row['stats'] else None) for row in rows]
+
+    def source_stats(self, run_id):
+        with self._lock:
+            rows = self.conn.execute("SELECT * FROM source_stats WHERE run_id = ? ORDER BY source",
+                                     (run_id,)).fetchall()
+        return [dict(row) for row in rows]
+
+    def __len__(self):
+        with self._lock:
+            return self.conn.execute("SELECT COUNT(*) FROM opportunities").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
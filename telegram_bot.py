@@ -16,6 +16,8 @@ import pandas as pd
 import requests
 from pathlib import Path
 
+from storage.opportunity_store import OpportunityStore
+
 # Configuration de logging
 logging.basicConfig(
     level=logging.INFO,
@@ -36,6 +38,8 @@ class TelegramBot:
         self.base_url = f"https://api.telegram.org/bot{bot_token}"
         self.roi_threshold = 2.0  # Seuil minimum ROI $2/min
         self.last_notification = None
+        self.store_path = "data/opportunities.db"
+        self.store_limit = 500  # Meilleures opportunités chargées par vérification
         
     async def send_message(self, message: str, parse_mode: str = "HTML") -> bool:
         """Envoie un message Telegram avec retry automatique"""
@@ -71,9 +75,26 @@ class TelegramBot:
         logger.error(f"Échec envoi message après {max_retries} tentatives")
         return False
     
+    def load_store_opportunities(self) -> List[Dict]:
+        """Meilleures opportunités de la base SQLite au-dessus du seuil ROI (requête indexée, bornée)"""
+        if not os.path.exists(self.store_path):
+            return []
+        store = OpportunityStore(self.store_path)
+        try:
+            opportunities = store.top(limit=self.store_limit, min_roi=self.roi_threshold)
+        finally:
+            store.close()
+        for opp in opportunities:
+            opp['timestamp'] = datetime.fromtimestamp(opp['updated_at']).isoformat()
+        logger.info(f"Chargé {len(opportunities)} opportunités depuis {self.store_path}")
+        return opportunities
+    
     def load_opportunities_data(self) -> pd.DataFrame:
-        """Charge les données d'opportunités depuis les fichiers JSON"""
+        """Charge les données d'opportunités depuis la base SQLite (à défaut, les anciens fichiers JSON)"""
         try:
+            store_exists = os.path.exists(self.store_path)
+            all_opportunities = self.load_store_opportunities()
+            
             data_files = [
                 "data/opportunities_zealy.json",
                 "data/opportunities_galxe.json", 
@@ -82,21 +103,22 @@ class TelegramBot:
                 "data/opportunities_airdrops.json"
             ]
             
-            all_opportunities = []
-            
-            for file_path in data_files:
-                if os.path.exists(file_path):
-                    try:
-                        with open(file_path, 'r', encoding='utf-8') as f:
-                            data = json.load(f)
-                            if isinstance(data, list):
-                                all_opportunities.extend(data)
-                            logger.info(f"Chargé {len(data)} opportunités depuis {file_path}")
-                    except Exception as e:
-                        logger.warning(f"Erreur lecture {file_path}: {e}")
+            # Anciens fichiers JSON, tant que la base n'existe pas encore
+            # (une base sans opportunité au-dessus du seuil n'est pas une base absente)
+            if not store_exists:
+                for file_path in data_files:
+                    if os.path.exists(file_path):
+                        try:
+                            with open(file_path, 'r', encoding='utf-8') as f:
+                                data = json.load(f)
+                                if isinstance(data, list):
+                                    all_opportunities.extend(data)
+                                logger.info(f"Chargé {len(data)} opportunités depuis {file_path}")
+                        except Exception as e:
+                            logger.warning(f"Erreur lecture {file_path}: {e}")
             
             # Si pas de fichiers JSON, créer des données mock pour test
-            if not all_opportunities:
+            if not all_opportunities and not store_exists:
                 all_opportunities = self.generate_mock_data()
                 logger.info("Utilisation de données mock pour les tests")
             
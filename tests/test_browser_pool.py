@@ -0,0 +1,102 @@
+import unittest
+import sys
+import os
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Ajouter le chemin du projet pour les imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from scrapers.browser_pool import BrowserPool
+
+class FakePage:
+    def __init__(self, browser):
+        self.browser = browser
+
+    async def goto(self, url, wait_until=None, timeout=None):
+        self.url = url
+        await asyncio.sleep(self.browser.delays.get(url, 0.05))
+
+    async def content(self):
+        return f"<html>{self.url}</html>"
+
+class FakeContext:
+    def __init__(self, browser):
+        self.browser = browser
+        browser.open_tabs += 1
+        browser.max_open_tabs = max(browser.max_open_tabs, browser.open_tabs)
+
+    async def new_page(self):
+        return FakePage(self.browser)
+
+    async def close(self):
+        self.browser.open_tabs -= 1
+        self.browser.closed_contexts += 1
+
+class FakeBrowser:
+    def __init__(self, delays):
+        self.delays = delays
+        self.open_tabs = self.max_open_tabs = self.closed_contexts = 0
+
+    def is_connected(self):
+        return True
+
+    async def new_context(self):
+        return FakeContext(self)
+
+    async def close(self):
+        pass
+
+class FakePlaywright:
+    """Remplace Playwright : `chromium.launch` renvoie un navigateur factice."""
+
+    def __init__(self, delays=None):
+        self.chromium = self
+        self.browsers = []
+        self.delays = delays or {}
+
+    async def launch(self, headless=True, args=None):
+        self.browsers.append(FakeBrowser(self.delays))
+        return self.browsers[-1]
+
+    async def stop(self):
+        pass
+
+class TestBrowserPool(unittest.TestCase):
+
+    def make_pool(self, delays=None, **kwargs):
+        pool = BrowserPool(**kwargs)
+        pool._playwright = FakePlaywright(delays)
+        self.addCleanup(pool.close)
+        return pool
+
+    def test_browser_is_reused_and_tabs_are_bounded(self):
+        """Un seul lancement pour tous les rendus, jamais plus de `max_tabs` onglets ouverts."""
+        pool = self.make_pool(max_tabs=2)
+        urls = [f"https://galxe.com/explore?page={i}" for i in range(6)]
+        with ThreadPoolExecutor(max_workers=6) as executor:
+            pages = list(executor.map(pool.render, urls))
+
+        self.assertEqual(pages, [f"<html>{url}</html>" for url in urls])
+        self.assertEqual(pool.stats['launches'], 1)
+        browser = pool._playwright.browsers[0]
+        self.assertEqual(browser.max_open_tabs, 2)
+        self.assertEqual((browser.open_tabs, browser.closed_contexts), (0, 6))
+
+    def test_timeout_cancels_render_and_frees_tab(self):
+        """Un rendu trop long est annulé : l'onglet est fermé et le slot servi au rendu suivant."""
+        slow = "https://galxe.com/slow"
+        pool = self.make_pool(delays={slow: 30}, max_tabs=1)
+        start = time.monotonic()
+        with self.assertRaises(TimeoutError):
+            pool.render(slow, timeout=0.2)
+        self.assertLess(time.monotonic() - start, 5)
+        self.assertEqual(pool.stats['timeouts'], 1)
+
+        # Avec un seul onglet, ce rendu n'aboutit que si le slot du rendu annulé a été rendu
+        self.assertEqual(pool.render("https://galxe.com/fast", timeout=5), "<html>https://galxe.com/fast</html>")
+        self.assertEqual(pool._playwright.browsers[0].open_tabs, 0)
+
+if __name__ == '__main__':
+    unittest.main()
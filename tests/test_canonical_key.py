@@ -0,0 +1,63 @@
+import unittest
+import sys
+import os
+
+# Ajouter le chemin du projet pour les imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from processing.canonical_key import canonical_url, compute_key, opportunity_key
+from processing.deduplication import deduplicate_opportunities
+
+class TestCanonicalUrl(unittest.TestCase):
+
+    def test_variants_collapse(self):
+        variants = [
+            "https://GALXE.com/quest/abc",
+            "HTTP://www.galxe.com/quest/abc/",
+            "https://galxe.com:443/quest/abc?utm_source=twitter&utm_medium=social",
+            "galxe.com/quest/abc#section",
+            "https://galxe.com/quest/abc?ref=xyz&fbclid=123&UTM_Source=x",
+        ]
+        self.assertEqual({canonical_url(url) for url in variants}, {"https://galxe.com/quest/abc"})
+
+    def test_meaningful_parts_are_kept(self):
+        self.assertEqual(canonical_url("https://x.com/a?b=2&a=1&utm_campaign=c"), "https://x.com/a?a=1&b=2")
+        self.assertEqual(canonical_url("https://app.example.com/#/quest/7/"), "https://app.example.com#/quest/7")
+        self.assertNotEqual(canonical_url("https://x.com/a?id=1"), canonical_url("https://x.com/a?id=2"))
+        self.assertEqual(canonical_url(None), '')
+
+    def test_path_case_is_kept(self):
+        """Hôte insensible à la casse, mais pas les identifiants Galxe du chemin."""
+        self.assertEqual(canonical_url("https://WWW.Galxe.com/GCtLhUpwpZ/"), "https://galxe.com/GCtLhUpwpZ")
+        self.assertNotEqual(canonical_url("https://galxe.com/quest/GCabc"), canonical_url("https://galxe.com/quest/gcabc"))
+        self.assertEqual(canonical_url("https://Galxe.com/q?id=AbC"), "https://galxe.com/q?id=AbC")
+        self.assertNotEqual(compute_key({'source': 'Layer3', 'id': 'AbC'}), compute_key({'source': 'Layer3', 'id': 'abc'}))
+
+class TestOpportunityKey(unittest.TestCase):
+
+    def test_source_identity_fields(self):
+        # Galxe : le lien (parser) ou l'URL (scraper) désignent la même campagne
+        self.assertEqual(compute_key({'source': 'Galxe', 'link': "https://galxe.com/c/1", 'title': "A"}),
+                         compute_key({'source': 'Galxe', 'url': "https://galxe.com/c/1/", 'title': "B"}))
+        # Zealy : pas d'URL, l'id est propre à la communauté
+        zealy = {'source': 'Zealy', 'id': 'q1', 'community': 'alpha', 'title': "Quest"}
+        self.assertNotEqual(compute_key(zealy), compute_key(dict(zealy, community='beta')))
+        self.assertNotEqual(compute_key(zealy), compute_key(dict(zealy, source='Layer3')))
+
+    def test_cross_source_url_match(self):
+        galxe = {'source': 'Galxe', 'link': "https://galxe.com/quest/abc", 'title': "Galxe quest"}
+        rss = {'source': 'TwitterRSS', 'id': 'rss_1234', 'title': "New quest on Galxe",
+               'url': "http://www.galxe.com/quest/abc?utm_source=rss"}
+        unique = deduplicate_opportunities([galxe, rss])
+        self.assertEqual(unique, [galxe])
+
+    def test_key_is_compact_and_carried(self):
+        op = {'source': 'RSS', 'url': "https://example.com/a", 'hash': "0" * 32}  # Ancien md5
+        key = opportunity_key(op)
+        self.assertEqual(len(key), 16)
+        self.assertEqual(op['hash'], key)
+        op['url'] = "https://example.com/other"
+        self.assertEqual(opportunity_key(op), key)  # Relue, pas recalculée
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+import unittest
+import sys
+import os
+import tempfile
+import shutil
+from unittest.mock import MagicMock
+
+# Ajouter le chemin du projet pour les imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from scrapers.feed_fetcher import FeedFetcher
+
+RSS = b"""<?xml version="1.0"?><rss version="2.0"><channel><title>Test</title>
+<item><title>Free airdrop</title><link>https://example.com/a</link></item>
+<item><title>Testnet campaign</title><link>https://example.com/b</link></item>
+</channel></rss>"""
+
+def response(status_code, content=b"", headers=None):
+    mock = MagicMock(status_code=status_code, content=content, headers=headers or {})
+    mock.raise_for_status = MagicMock()
+    return mock
+
+class TestFeedFetcher(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp_dir, "validators.json")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_parses_feed_and_stores_validators(self):
+        """Un flux 200 est parsé et ses validateurs sont conservés entre les runs."""
+        session = MagicMock()
+        session.get.return_value = response(200, RSS, {"ETag": '"v1"', "Last-Modified": "Sat, 02 Aug 2025 10:00:00 GMT"})
+        results = FeedFetcher(self.path, session=session).fetch_all(["https://example.com/feed"])
+
+        result = results["https://example.com/feed"]
+        self.assertEqual(result.status, "ok")
+        self.assertEqual([e.title for e in result.entries], ["Free airdrop", "Testnet campaign"])
+        self.assertEqual(FeedFetcher(self.path, session=session).validators["https://example.com/feed"]["etag"], '"v1"')
+
+    def test_conditional_get_skips_unchanged_feed(self):
+        """Les validateurs sont renvoyés ; un 304 n'est pas parsé."""
+        session = MagicMock()
+        session.get.return_value = response(200, RSS, {"ETag": '"v1"'})
+        FeedFetcher(self.path, session=session).fetch_all(["https://example.com/feed"])
+
+        session.get.return_value = response(304)
+        result = FeedFetcher(self.path, session=session).fetch("https://example.com/feed")
+        self.assertEqual(session.get.call_args[1]["headers"], {"If-None-Match": '"v1"'})
+        self.assertEqual(result.status, "not_modified")
+        self.assertEqual(result.entries, [])
+
+    def test_validators_wait_for_commit(self):
+        """Avec commit=False, les validateurs ne sont enregistrés qu'au commit_validators."""
+        session = MagicMock()
+        session.get.return_value = response(200, RSS, {"ETag": '"v1"'})
+        fetcher = FeedFetcher(self.path, session=session)
+        results = fetcher.fetch_all(["https://example.com/feed"], commit=False)
+        self.assertEqual(fetcher.validators, {})
+        self.assertFalse(os.path.exists(self.path))
+
+        fetcher.fetch("https://example.com/feed")
+        self.assertEqual(session.get.call_args[1]["headers"], {})  # Toujours un GET complet
+
+        fetcher.commit_validators(results.values())
+        self.assertEqual(FeedFetcher(self.path, session=session).validators["https://example.com/feed"]["etag"], '"v1"')
+
+    def test_error_is_isolated(self):
+        """Un flux en erreur n'empêche pas les autres d'être récupérés."""
+        session = MagicMock()
+
+        def fake_get(url, headers=None, timeout=None):
+            if "down" in url:
+                raise TimeoutError("read timeout")
+            return response(200, RSS)
+
+        session.get.side_effect = fake_get
+        results = FeedFetcher(self.path, session=session).fetch_all(
+            ["https://down.example.com/feed", "https://example.com/feed"])
+        self.assertEqual(results["https://down.example.com/feed"].status, "error")
+        self.assertEqual(results["https://example.com/feed"].status, "ok")
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
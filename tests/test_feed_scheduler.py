@@ -0,0 +1,133 @@
+import unittest
+import sys
+import os
+import time
+import tempfile
+import shutil
+from unittest.mock import MagicMock
+
+# Ajouter le chemin du projet pour les imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from scrapers.feed_scheduler import FeedScheduler
+
+FAST = "https://fast.example.com/feed"
+SLOW = "https://slow.example.com/feed"
+
+def entry(ts):
+    return {'title': f"entry {ts}", 'link': f"https://example.com/{ts}", 'published_parsed': time.gmtime(ts)}
+
+def result(url, status, entries=(), http_status=None):
+    return MagicMock(url=url, status=status, entries=list(entries), error="boom", http_status=http_status)
+
+class TestFeedScheduler(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp_dir, "schedule.json")
+        self.fetcher = MagicMock()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def make_scheduler(self, **kwargs):
+        params = dict(min_interval=60, max_interval=86400, default_interval=3600, alpha=1.0, jitter=0)
+        params.update(kwargs)
+        return FeedScheduler(self.fetcher, [FAST, SLOW], state_path=self.path, **params)
+
+    def test_interval_follows_publish_rate(self):
+        """Un flux qui publie souvent est interrogé plus souvent qu'un flux lent."""
+        scheduler = self.make_scheduler()
+        now = 1_000_000
+        scheduler.record_result(result(FAST, 'ok', [entry(now - i * 600) for i in range(10)]), now)
+        scheduler.record_result(result(SLOW, 'ok', [entry(now - i * 86400) for i in range(3)]), now)
+        self.assertEqual(scheduler.state[FAST]['interval'], 300)
+        self.assertEqual(scheduler.state[SLOW]['interval'], 43200)
+        self.assertEqual(scheduler.due(now + 400), [FAST])
+
+    def test_interval_bounds(self):
+        """L'intervalle appris reste dans [min_interval, max_interval]."""
+        scheduler = self.make_scheduler(min_interval=600, max_interval=7200)
+        scheduler.record_result(result(FAST, 'ok', [entry(1000 + i) for i in range(5)]), 2000)
+        self.assertEqual(scheduler.state[FAST]['interval'], 600)
+        scheduler.record_result(result(SLOW, 'ok', [entry(1000), entry(10_000_000)]), 10_000_000)
+        self.assertEqual(scheduler.state[SLOW]['interval'], 7200)
+
+    def test_only_new_entries_are_returned(self):
+        """Au passage suivant, seules les entrées plus récentes sont poussées."""
+        scheduler = self.make_scheduler()
+        first = scheduler.record_result(result(FAST, 'ok', [entry(200), entry(100)]), 300)
+        scheduler.mark_seen({FAST: first})
+        second = scheduler.record_result(result(FAST, 'ok', [entry(400), entry(200), entry(100)]), 500)
+        self.assertEqual(len(first), 2)
+        self.assertEqual([e['published_parsed'] for e in second], [time.gmtime(400)])
+
+    def test_entries_stay_new_until_marked_seen(self):
+        """Un passage dont les entrées n'ont pas été stockées les renvoie au passage suivant."""
+        scheduler = self.make_scheduler()
+        first = scheduler.record_result(result(FAST, 'ok', [entry(200), entry(100)]), 300)
+        second = scheduler.record_result(result(FAST, 'ok', [entry(200), entry(100)]), 500)
+        self.assertEqual(second, first)
+
+    def test_dead_feed_backs_off_exponentially(self):
+        """Les erreurs repoussent le flux de plus en plus loin ; un succès le rétablit."""
+        scheduler = self.make_scheduler()
+        now = 1_000_000
+        scheduler.record_result(result(SLOW, 'error'), now)
+        first_delay = scheduler.state[SLOW]['next_poll'] - now
+        scheduler.record_result(result(SLOW, 'error'), now)
+        self.assertEqual(scheduler.state[SLOW]['next_poll'] - now, first_delay * 2)
+        scheduler.record_result(result(SLOW, 'error', http_status=404), now)
+        self.assertEqual(scheduler.state[SLOW]['health'], 'dead')
+
+        scheduler.record_result(result(SLOW, 'not_modified'), now)
+        self.assertEqual(scheduler.state[SLOW]['health'], 'ok')
+        self.assertEqual(scheduler.state[SLOW]['failures'], 0)
+
+    def test_poll_once_fetches_due_feeds_and_persists(self):
+        """poll_once ne récupère que les flux dus et sauvegarde l'état."""
+        scheduler = self.make_scheduler()
+        scheduler.state[SLOW] = dict(scheduler._feed_state(SLOW), next_poll=time.time() + 3600)
+        self.fetcher.fetch_all.return_value = {FAST: result(FAST, 'ok', [entry(100)])}
+
+        new_entries = scheduler.poll_once()
+        self.fetcher.fetch_all.assert_called_once_with([FAST], commit=False)
+        self.fetcher.commit_validators.assert_called_once()
+        self.assertEqual(list(new_entries), [FAST])
+        self.assertIn(FAST, self.make_scheduler().state)
+
+    def test_poll_persists_nothing_until_commit(self):
+        """Un run interrompu avant le stockage laisse le flux dû et ses entrées nouvelles."""
+        scheduler = self.make_scheduler()
+        scheduler.feeds = [FAST]
+        self.fetcher.fetch_all.return_value = {FAST: result(FAST, 'ok', [entry(100)])}
+
+        new_entries, pending = scheduler.poll(now=1000)
+        self.assertEqual(list(new_entries), [FAST])
+        self.assertEqual(scheduler.due(now=1001), [FAST])
+        self.assertFalse(os.path.exists(self.path))
+        self.fetcher.commit_validators.assert_not_called()
+        self.assertEqual(list(scheduler.poll(now=1001)[0]), [FAST])
+
+        scheduler.commit(pending)
+        self.assertEqual(scheduler.due(now=1001), [])
+        self.fetcher.commit_validators.assert_called_once()
+        self.assertEqual(self.make_scheduler().state[FAST]['last_polled'], 1000)
+        self.assertEqual(scheduler.record_result(result(FAST, 'ok', [entry(100)]), 1100), [])
+
+    def test_truncated_poll_marks_only_processed_entries(self):
+        """Au-delà de max_entries, les entrées restent nouvelles au passage suivant."""
+        scheduler = self.make_scheduler()
+        scheduler.feeds = [FAST]
+        self.fetcher.fetch_all.return_value = {FAST: result(FAST, 'ok', [entry(400), entry(300), entry(200)])}
+
+        new_entries, pending = scheduler.poll(now=1000, max_entries=2)
+        self.assertEqual([e['published_parsed'] for e in new_entries[FAST]], [time.gmtime(300), time.gmtime(200)])
+        self.assertEqual(pending['results'], {})  # Flux tronqué : anciens validateurs conservés
+        scheduler.commit(pending)
+
+        remaining = scheduler.record_result(result(FAST, 'ok', [entry(400), entry(300), entry(200)]), 2000)
+        self.assertEqual([e['published_parsed'] for e in remaining], [time.gmtime(400)])
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,72 @@
+import unittest
+import sys
+import os
+import time
+import tempfile
+import shutil
+
+# Ajouter le chemin du projet pour les imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from scrapers.feed_watermark import FeedWatermarks, entry_guid
+
+FEED = "https://example.com/feed"
+
+def entry(n, ts=None, **fields):
+    data = {'id': f"guid-{n}", 'title': f"entry {n}", 'link': f"https://example.com/{n}"}
+    if ts is not None:
+        data['published_parsed'] = time.gmtime(ts)
+    data.update(fields)
+    return data
+
+class TestFeedWatermarks(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp_dir, "watermarks.json")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_seen_entries_are_skipped(self):
+        """Une entrée déjà traitée n'est plus renvoyée, même republiée avec une nouvelle date."""
+        marks = FeedWatermarks(path=None)
+        first = marks.take_new(FEED, [entry(1, 1000), entry(2, 2000)])
+        self.assertEqual(len(first), 2)
+
+        again = marks.take_new(FEED, [entry(1, 5000), entry(2, 2000), entry(3, 3000)])
+        self.assertEqual([e['id'] for e in again], ["guid-3"])
+
+    def test_entries_older_than_watermark_are_skipped(self):
+        marks = FeedWatermarks(path=None)
+        marks.take_new(FEED, [entry(1, 2000)])
+        new_entries = marks.take_new(FEED, [entry(2, 1000), entry(3, 3000), entry(4)])
+        # entry 2 est plus ancienne que la marque ; entry 4 (sans date) est jugée sur son GUID
+        self.assertEqual([e['id'] for e in new_entries], ["guid-3", "guid-4"])
+        self.assertEqual(marks.marks[FEED]['published'], 3000)
+
+    def test_guid_set_is_bounded(self):
+        marks = FeedWatermarks(path=None, max_guids=3)
+        marks.take_new(FEED, [entry(n) for n in range(5)])
+        self.assertEqual(list(marks.marks[FEED]['guids']), ["guid-2", "guid-3", "guid-4"])
+        # Le GUID le plus ancien est sorti de l'ensemble et redevient « nouveau »
+        self.assertEqual(len(marks.filter_new(FEED, [entry(0), entry(4)])), 1)
+
+    def test_persistence_between_runs(self):
+        marks = FeedWatermarks(path=self.path)
+        marks.take_new(FEED, [entry(1, 1000), entry(2, 2000)])
+        marks.save()
+
+        reloaded = FeedWatermarks(path=self.path)
+        self.assertEqual(reloaded.filter_new(FEED, [entry(1, 1000), entry(3, 3000)]), [entry(3, 3000)])
+        self.assertEqual(reloaded.filter_new("https://other.example.com/feed", [entry(1, 1000)]),
+                         [entry(1, 1000)])
+
+    def test_guid_fallbacks(self):
+        self.assertEqual(entry_guid({'guid': "g", 'link': "l"}), "g")
+        self.assertEqual(entry_guid({'link': "l"}), "l")
+        self.assertEqual(entry_guid({'title': "t"}), entry_guid({'title': "t"}))
+        self.assertNotEqual(entry_guid({'title': "t"}), entry_guid({'title': "u"}))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,116 @@
+import unittest
+import sys
+import os
+from unittest.mock import MagicMock, patch
+
+# Ajouter le chemin du projet pour les imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from scrapers.galxe_graphql import GalxeGraphQLClient, GRAPHQL_URL
+
+def campaign(campaign_id, **fields):
+    data = {'id': campaign_id, 'name': f"Campaign {campaign_id}", 'space': {'alias': "arb", 'name': "Arbitrum"}}
+    data.update(fields)
+    return data
+
+def connection(campaigns, cursor=None):
+    return {'pageInfo': {'endCursor': cursor, 'hasNextPage': cursor is not None}, 'list': campaigns}
+
+def graphql_response(payload):
+    return MagicMock(json=MagicMock(return_value=payload), raise_for_status=MagicMock())
+
+class TestGalxeGraphQLClient(unittest.TestCase):
+
+    def make_client(self, *payloads):
+        session = MagicMock()
+        session.post.side_effect = [graphql_response(payload) for payload in payloads]
+        return GalxeGraphQLClient(session=session, list_types=("Trending", "Newest"), per_page=2), session
+
+    def test_build_query_aliases_one_list_per_type(self):
+        client, _ = self.make_client()
+        query = client.build_query(["Trending", "Newest"])
+        self.assertIn("query ExploreCampaigns($after0: String $after1: String)", query)
+        self.assertIn("l0: campaigns(input: {listType: Trending, statuses: [Active], first: 2, after: $after0})", query)
+        self.assertIn("l1: campaigns(input: {listType: Newest, statuses: [Active], first: 2, after: $after1})", query)
+        self.assertIn("pageInfo { endCursor hasNextPage }", query)
+
+    def test_cursor_pagination_until_empty_page(self):
+        """Chaque liste suit son curseur ; une liste terminée sort de la requête suivante."""
+        client, session = self.make_client(
+            {'data': {'l0': connection([campaign("t1"), campaign("t2")], cursor="c1"),
+                      'l1': connection([campaign("n1"), campaign("t1")])}},
+            {'data': {'l0': connection([campaign("t3"), campaign("t4")], cursor="c2")}},
+            {'data': {'l0': connection([])}},
+        )
+        campaigns = client.fetch_campaigns(pages=10)
+
+        self.assertEqual([c['id'] for c in campaigns], ["t1", "t2", "n1", "t3", "t4"])
+        self.assertEqual(session.post.call_count, 3)
+        self.assertEqual(client.requests_made, 3)
+        calls = [call.kwargs['json'] for call in session.post.call_args_list]
+        self.assertEqual(session.post.call_args_list[0].args[0], GRAPHQL_URL)
+        self.assertEqual(calls[0]['variables'], {'after0': None, 'after1': None})
+        self.assertEqual(calls[1]['variables'], {'after0': "c1"})
+        self.assertNotIn("Newest", calls[1]['query'])
+        self.assertEqual(calls[2]['variables'], {'after0': "c2"})
+
+    def test_pages_limit(self):
+        client, session = self.make_client(
+            {'data': {'l0': connection([campaign("t1")], cursor="c1"), 'l1': connection([campaign("n1")], cursor="d1")}},
+        )
+        self.assertEqual(len(client.fetch_campaigns(pages=1)), 2)
+        self.assertEqual(session.post.call_count, 1)
+
+    def test_graphql_errors_payload(self):
+        """Des `errors` sans données lèvent une exception ; avec des données partielles, elles sont gardées."""
+        client, _ = self.make_client({'errors': [{'message': "rate limited"}], 'data': None})
+        with self.assertRaisesRegex(Exception, "GraphQL: rate limited"):
+            client.fetch_campaigns(pages=1)
+
+        client, _ = self.make_client({'errors': [{'message': "field deprecated"}],
+                                      'data': {'l0': connection([campaign("t1")]), 'l1': connection([])}})
+        self.assertEqual([c['id'] for c in client.fetch_campaigns(pages=1)], ["t1"])
+
+    def test_parse_campaigns_field_mapping(self):
+        client, _ = self.make_client()
+        quests = client.parse_campaigns([
+            campaign("t1", startTime=1754000000, endTime=1755000000,
+                     tokenReward={'userTokenAmount': "2500000", 'tokenDecimal': 6, 'tokenSymbol': "USDC"}),
+            campaign("t2", space=None, loyaltyPoints=150, rewardName="OAT"),
+            campaign("t3", name="x" * 150, rewardName="OAT"),
+            campaign("t4", tokenReward={'userTokenAmount': "0", 'tokenDecimal': 18, 'tokenSymbol': "ARB"}),
+        ])
+
+        self.assertEqual(quests[0], {
+            'id': "t1", 'title': "Campaign t1", 'link': "https://app.galxe.com/quest/arb/t1", 'source': "Galxe",
+            'space': "Arbitrum", 'start_time': 1754000000, 'end_time': 1755000000, 'reward': "2.5 USDC",
+        })
+        self.assertEqual((quests[1]['link'], quests[1]['space'], quests[1]['reward']),
+                         ("https://app.galxe.com/quest/t2", "", "150 POINTS"))
+        self.assertEqual((len(quests[2]['title']), quests[2]['reward']), (100, "OAT"))
+        self.assertNotIn('reward', quests[3])
+        self.assertEqual(quests[3]['start_time'], "")
+
+class TestGalxeScraperGraphQLMode(unittest.TestCase):
+
+    @patch("scrapers.galxe_scraper.ScraperAPIBalancer")
+    def test_graphql_mode_skips_html_rendering(self, mock_balancer):
+        """En mode graphql (défaut), les campagnes viennent de l'API : aucun rendu HTML payant."""
+        from scrapers.galxe_scraper import GalxeScraperEnhanced
+
+        with patch.dict(os.environ, {"GALXE_FETCH_MODE": "graphql"}):
+            scraper = GalxeScraperEnhanced()
+        session = MagicMock()
+        session.post.return_value = graphql_response(
+            {'data': {'l0': connection([campaign("t1")]), 'l1': connection([campaign("n1")])}})
+        scraper.graphql = GalxeGraphQLClient(session=session)
+        scraper.scrape_page = MagicMock()
+
+        quests = scraper.scrape_galxe_campaigns(pages=1)
+
+        self.assertEqual([q['id'] for q in quests], ["t1", "n1"])
+        self.assertEqual(session.post.call_count, 1)
+        scraper.scrape_page.assert_not_called()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+import unittest
+import sys
+import os
+import time
+import tempfile
+import shutil
+from unittest.mock import MagicMock
+
+# Ajouter le chemin du projet pour les imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from scrapers.http_cache import ResponseCache
+
+API_URL = "http://api.scraperapi.com"
+PAGE_URL = "https://galxe.com/explore?page=1"
+
+def response(status_code, text="", headers=None):
+    return MagicMock(status_code=status_code, text=text, headers=headers or {})
+
+class TestResponseCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.key = ResponseCache.make_key(PAGE_URL, variant="rendered")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def make_cache(self, **kwargs):
+        cache = ResponseCache(self.tmp_dir, **kwargs)
+        self.addCleanup(cache.cache.close)
+        return cache
+
+    def fetch(self, cache, session):
+        return cache.fetch(session, API_URL, key=self.key, params={"api_key": "secret", "url": PAGE_URL},
+                           conditional_params={"keep_headers": "true"}, page_url=PAGE_URL)
+
+    def test_miss_stores_page_url(self):
+        """L'entrée garde l'URL de la page demandée, pas celle de l'intermédiaire."""
+        cache = self.make_cache()
+        session = MagicMock()
+        session.get.return_value = response(200, "<html>1</html>", {"ETag": '"v1"'})
+        self.assertEqual(self.fetch(cache, session), (200, "<html>1</html>", 'network'))
+
+        entry = cache.get(self.key)
+        self.assertEqual((entry['url'], entry['etag']), (PAGE_URL, '"v1"'))
+        self.assertEqual(self.fetch(cache, session)[2], 'cache')
+        self.assertEqual(session.get.call_count, 1)
+
+    def test_304_revalidation_refreshes_entry(self):
+        cache = self.make_cache(ttl=60)
+        cache.store(self.key, "<html>1</html>", {"ETag": '"v1"', "Last-Modified": "Tue, 05 Aug 2025 10:00:00 GMT"},
+                    url=PAGE_URL)
+        entry = cache.get(self.key)
+        entry['fetched_at'] -= 120   # Entrée périmée
+        cache.cache.set(self.key, entry)
+
+        session = MagicMock()
+        session.get.return_value = response(304)
+        before = time.time()
+        self.assertEqual(self.fetch(cache, session), (200, "<html>1</html>", 'revalidated'))
+
+        request = session.get.call_args.kwargs
+        self.assertEqual(request['headers'], {'If-None-Match': '"v1"',
+                                              'If-Modified-Since': "Tue, 05 Aug 2025 10:00:00 GMT"})
+        self.assertEqual(request['params']['keep_headers'], "true")
+        self.assertGreaterEqual(cache.get(self.key)['fetched_at'], before)
+        self.assertEqual(cache.get_stats()['revalidated'], 1)
+        self.assertEqual(cache.get_fresh(self.key), "<html>1</html>")
+
+    def test_stale_entries_expire(self):
+        """Au-delà de ttl + max_stale, l'entrée disparaît : requête complète, sans validateurs."""
+        cache = self.make_cache(ttl=0.05, max_stale=0.05)
+        cache.store(self.key, "<html>1</html>", {"ETag": '"v1"'}, url=PAGE_URL)
+        time.sleep(0.2)
+        self.assertIsNone(cache.get(self.key))
+
+        session = MagicMock()
+        session.get.return_value = response(200, "<html>2</html>")
+        self.assertEqual(self.fetch(cache, session), (200, "<html>2</html>", 'network'))
+        self.assertEqual(session.get.call_args.kwargs['headers'], {})
+        self.assertNotIn('keep_headers', session.get.call_args.kwargs['params'])
+
+if __name__ == '__main__':
+    unittest.main()
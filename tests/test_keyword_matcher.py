@@ -0,0 +1,59 @@
+import unittest
+import sys
+import os
+import random
+
+# Ajouter le chemin du projet pour les imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from scrapers.keyword_matcher import KeywordMatcher
+
+CATEGORIES = {
+    'opportunity': ['airdrop', 'quest', 'earn', 'program', 'programme', 'token', 'ico', 'opportunity'],
+    'defi': ['defi', 'finance', 'swap', 'nft', 'staking', 'contest', 'testnet'],
+    'size': ['big', 'mini', 'small', 'good'],
+    'empty': [],
+}
+
+def brute_force(text):
+    """Référence : l'ancien `any(keyword in text for keyword in keywords)` par catégorie."""
+    return {name for name, words in CATEGORIES.items() if any(word in text for word in words)}
+
+class TestKeywordMatcher(unittest.TestCase):
+
+    def setUp(self):
+        self.matcher = KeywordMatcher(CATEGORIES)
+
+    def test_has_and_first(self):
+        """Tests court-circuités par catégorie et par ordre de priorité."""
+        self.assertTrue(self.matcher.has("new airdrop live", "opportunity"))
+        self.assertFalse(self.matcher.has("new airdrop live", "defi"))
+        self.assertFalse(self.matcher.has("anything", "empty"))
+        self.assertEqual(self.matcher.first("a small but good deal", ["defi", "size"]), "size")
+        self.assertIsNone(self.matcher.first("rien", ["defi", "size"]))
+
+    def test_substring_semantics(self):
+        """Comme `in`, les mots-clés sont trouvés à l'intérieur des mots (learn -> earn)."""
+        self.assertEqual(self.matcher.match("learn more"), {"opportunity"})
+
+    def test_overlapping_keywords(self):
+        """Les mots-clés qui se chevauchent sont tous trouvés, en un seul parcours."""
+        # 'contestnet' : testnet commence à l'intérieur de contest
+        self.assertEqual(self.matcher.match("contestnet"), {"defi"})
+        # 'stakingood' : staking (defi) chevauche good (size)
+        self.assertEqual(self.matcher.match("stakingood"), {"defi", "size"})
+        # 'xnftoken' : token commence dans nft et déborde après
+        self.assertEqual(self.matcher.match("xnftoken"), {"defi", "opportunity"})
+
+    def test_identical_to_any_on_random_texts(self):
+        """Résultats identiques à l'ancienne logique sur des textes aléatoires."""
+        rng = random.Random(7)
+        fragments = [w for words in CATEGORIES.values() for w in words] + ["a", "x", " ", "ear", "pro", "te", "st"]
+        for _ in range(3000):
+            text = "".join(rng.choice(fragments)[:rng.randint(1, 9)] for _ in range(rng.randint(0, 12)))
+            self.assertEqual(self.matcher.match(text), brute_force(text), text)
+            for name in CATEGORIES:
+                self.assertEqual(self.matcher.has(text, name), name in brute_force(text), text)
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,63 @@
+import unittest
+import sys
+import os
+import tempfile
+import shutil
+from unittest.mock import patch, MagicMock
+
+# Ajouter le chemin du projet pour les imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from scrapers.language_classifier import LanguageClassifier, UNKNOWN
+
+SPANISH = "Oportunidad de airdrop gratis para los primeros usuarios que se registren en esta plataforma"
+
+class TestLanguageClassifier(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp_dir, "languages.json")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_pre_classifier(self):
+        """Les cas évidents sont tranchés sans langdetect."""
+        classifier = LanguageClassifier(self.path)
+        self.assertEqual(classifier.pre_classify("The new airdrop for early users of the protocol is live"), "en")
+        self.assertEqual(classifier.pre_classify("Airdrop gratuit pour les premiers utilisateurs de la plateforme"), "fr")
+        self.assertEqual(classifier.pre_classify("Новый аирдроп для всех пользователей"), "ru")
+        self.assertEqual(classifier.pre_classify("Airdrop"), UNKNOWN)
+        # L'espagnol partage des mots-outils avec le français : laissé à langdetect
+        self.assertIsNone(classifier.pre_classify(SPANISH))
+
+    @patch("scrapers.language_classifier.LANGDETECT_AVAILABLE", True)
+    @patch("scrapers.language_classifier.detect", create=True)
+    def test_batch_detects_each_text_once(self, mock_detect):
+        """Un texte répété dans le lot n'est détecté qu'une fois."""
+        mock_detect.return_value = "es"
+        classifier = LanguageClassifier(self.path)
+        languages = classifier.classify_batch([SPANISH, "The airdrop of the year is live for you", SPANISH])
+        self.assertEqual(languages, ["es", "en", "es"])
+        self.assertEqual(mock_detect.call_count, 1)
+
+    @patch("scrapers.language_classifier.LANGDETECT_AVAILABLE", True)
+    @patch("scrapers.language_classifier.detect", create=True)
+    def test_cache_persists_across_runs(self, mock_detect):
+        """Un nouveau run réutilise les langues déjà calculées."""
+        mock_detect.return_value = "es"
+        LanguageClassifier(self.path).classify_batch([SPANISH])
+
+        classifier = LanguageClassifier(self.path)
+        self.assertEqual(classifier.classify_batch(["  " + SPANISH + "\n"]), ["es"])
+        self.assertEqual(mock_detect.call_count, 1)
+        self.assertEqual(classifier.stats["cache_hits"], 1)
+
+    def test_supported_languages(self):
+        """Les langues inconnues sont conservées, les autres écartées."""
+        self.assertTrue(LanguageClassifier.is_supported("es"))
+        self.assertTrue(LanguageClassifier.is_supported(UNKNOWN))
+        self.assertFalse(LanguageClassifier.is_supported("ru"))
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,116 @@
+import unittest
+import sys
+import os
+import json
+import tempfile
+import shutil
+import urllib.parse
+from unittest.mock import MagicMock
+
+# Ajouter le chemin du projet pour les imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from scrapers.layer3_trpc import Layer3TRPCClient, ProcedureCircuitBreaker, OPEN, CLOSED
+
+PROCEDURES = ["quest.getPublicQuests", "quest.getAllQuests", "campaign.getActiveCampaigns"]
+
+def batch_response(items, status_code=207):
+    return MagicMock(status_code=status_code, json=MagicMock(return_value=items))
+
+class TestLayer3TRPC(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp_dir, "circuit.json")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def make_client(self, response):
+        session = MagicMock()
+        session.get.return_value = response
+        breaker = ProcedureCircuitBreaker(self.path, failure_threshold=1, cooldown=60)
+        return Layer3TRPCClient(session, breaker=breaker), session
+
+    def test_single_batched_request(self):
+        """Toutes les procédures partent dans une seule requête `?batch=1`."""
+        client, session = self.make_client(batch_response([
+            {"error": {"message": "NOT_FOUND"}},
+            {"result": {"data": {"json": [{"id": "q1"}]}}},
+            {"result": {"data": []}},
+        ]))
+        procedure, quests = client.fetch_first_available(PROCEDURES)
+
+        self.assertEqual(session.get.call_count, 1)
+        url = session.get.call_args[0][0]
+        self.assertIn("/" + ",".join(PROCEDURES) + "?batch=1", url)
+        batch_input = json.loads(urllib.parse.unquote(url.split("input=")[1]))
+        self.assertEqual(sorted(batch_input), ["0", "1", "2"])
+        self.assertEqual(procedure, "quest.getAllQuests")
+        self.assertEqual(quests, [{"id": "q1"}])
+
+    def test_dead_procedure_is_skipped(self):
+        """Une procédure en échec est exclue des batchs suivants tant que le circuit est ouvert."""
+        client, session = self.make_client(batch_response([
+            {"error": {"message": "NOT_FOUND"}},
+            {"result": {"data": [{"id": "q1"}]}},
+            {"result": {"data": []}},
+        ]))
+        client.call_batch(PROCEDURES)
+        self.assertEqual(client.breaker.status()["quest.getPublicQuests"], OPEN)
+
+        session.get.return_value = batch_response([{"result": {"data": []}}] * 2)
+        client.call_batch(PROCEDURES)
+        self.assertNotIn("quest.getPublicQuests", session.get.call_args[0][0])
+
+    def test_half_open_probe(self):
+        """Après le délai, une sonde est autorisée ; un nouvel échec double le délai."""
+        breaker = ProcedureCircuitBreaker(self.path, failure_threshold=1, cooldown=60)
+        breaker.record_failure("p", now=1000)
+        self.assertFalse(breaker.allow("p", now=1030))
+        self.assertTrue(breaker.allow("p", now=1061))
+        self.assertFalse(breaker.allow("p", now=1062))
+
+        breaker.record_failure("p", now=1061)
+        self.assertFalse(breaker.allow("p", now=1150))
+        self.assertTrue(breaker.allow("p", now=1182))
+
+        breaker.record_success("p")
+        self.assertEqual(breaker.status()["p"], CLOSED)
+
+    def test_network_error_keeps_circuits(self):
+        """Une erreur réseau coûte un seul appel et n'ouvre aucun circuit."""
+        client, session = self.make_client(None)
+        session.get.side_effect = TimeoutError("timeout")
+        self.assertEqual(client.call_batch(PROCEDURES), {})
+        self.assertEqual(session.get.call_count, 1)
+        self.assertTrue(all(client.breaker.allow(p) for p in PROCEDURES))
+
+    def test_abandoned_probe_is_retried_after_cooldown(self):
+        """Une sonde sans verdict bloque les autres appels jusqu'au délai suivant."""
+        breaker = ProcedureCircuitBreaker(self.path, failure_threshold=1, cooldown=60)
+        breaker.record_failure("p", now=1000)
+        self.assertTrue(breaker.allow("p", now=1061))
+        self.assertFalse(breaker.allow("p", now=1100))
+        self.assertTrue(breaker.allow("p", now=1122))
+
+    def test_endpoint_error_keeps_circuits(self):
+        """Un 503 de l'endpoint entier n'est imputé à aucune procédure."""
+        client, session = self.make_client(batch_response({"error": {"message": "Service Unavailable"}},
+                                                          status_code=503))
+        self.assertEqual(client.call_batch(PROCEDURES), {})
+        self.assertEqual(client.breaker.status(), {p: CLOSED for p in PROCEDURES})
+
+        session.get.return_value = batch_response({"error": {"message": "Too Many Requests"}}, status_code=429)
+        client.call_batch(PROCEDURES)
+        self.assertTrue(all(client.breaker.allow(p) for p in PROCEDURES))
+
+    def test_state_persists(self):
+        """L'état des circuits est rechargé au run suivant."""
+        breaker = ProcedureCircuitBreaker(self.path, failure_threshold=1, cooldown=3600)
+        breaker.record_failure("quest.getAllQuests")
+        breaker.save()
+        self.assertFalse(ProcedureCircuitBreaker(self.path).allow("quest.getAllQuests"))
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,91 @@
+import unittest
+import sys
+import os
+import time
+import tempfile
+import shutil
+
+# Ajouter le chemin du projet pour les imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from scrapers.near_duplicates import NearDuplicateIndex, shingles
+
+ARB_SUMMARY = ("The Arbitrum Foundation said on Tuesday it will distribute 50 million ARB tokens to wallets "
+               "that voted in governance proposals before March. Eligible users can claim through the "
+               "official portal until June 30.")
+
+def entry(link, title, summary, feed="https://feed.example.com"):
+    return {'title': title, 'link': link, 'summary': summary, 'source_feed': feed}
+
+ORIGINAL = entry("https://cointelegraph.com/arb", "Arbitrum Foundation announces second ARB airdrop for early DAO voters",
+                 ARB_SUMMARY)
+SYNDICATED = entry("https://decrypt.co/arb-airdrop", "Arbitrum Foundation Announces Second ARB Airdrop for Early DAO Voters",
+                   f"<p>{ARB_SUMMARY.replace('through', 'via')}</p>")
+REWRITTEN = entry("https://beincrypto.com/arb", "Arbitrum announces second ARB airdrop for DAO voters - here's how to claim",
+                  f"{ARB_SUMMARY} Read more on our site.")
+SIMILAR_TOPIC = entry("https://cryptonews.com/arb-nft", "Arbitrum Foundation announces third ARB airdrop for NFT holders",
+                      "The Arbitrum Foundation said on Friday it will distribute 20 million ARB tokens to holders "
+                      "of Arbitrum Odyssey NFTs. Claims open next week.")
+UNRELATED = entry("https://decrypt.co/firedancer", "Solana validators push Firedancer client to mainnet",
+                  "Jump Crypto's Firedancer validator client went live on Solana mainnet on Tuesday.")
+
+class TestNearDuplicateIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp_dir, "fingerprints.json")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_shingles_ignore_html_and_case(self):
+        self.assertEqual(shingles("Big <b>AIRDROP</b> now"), shingles("big airdrop now"))
+        self.assertIn("big airdrop", shingles("Big airdrop now"))
+
+    def test_syndicated_copies_are_clustered(self):
+        """Les copies d'un même article sont regroupées sous la première entrée."""
+        index = NearDuplicateIndex(path=None)
+        entries = [dict(e) for e in (ORIGINAL, UNRELATED, SYNDICATED, SIMILAR_TOPIC, REWRITTEN)]
+        canonical = index.deduplicate(entries)
+
+        self.assertEqual([e['link'] for e in canonical],
+                         [ORIGINAL['link'], UNRELATED['link'], SIMILAR_TOPIC['link']])
+        self.assertEqual(canonical[0]['duplicates'], [SYNDICATED['link'], REWRITTEN['link']])
+        self.assertNotIn('duplicates', canonical[1])
+
+    def test_index_persists_between_runs(self):
+        index = NearDuplicateIndex(path=self.path)
+        index.deduplicate([dict(ORIGINAL)])
+        index.save()
+
+        reloaded = NearDuplicateIndex(path=self.path)
+        canonical = reloaded.deduplicate([dict(SYNDICATED), dict(UNRELATED)])
+        self.assertEqual([e['link'] for e in canonical], [UNRELATED['link']])
+
+    def test_old_fingerprints_expire(self):
+        index = NearDuplicateIndex(path=self.path, max_age=3600)
+        index.deduplicate([dict(ORIGINAL)], now=time.time() - 7200)
+        index.save()
+
+        reloaded = NearDuplicateIndex(path=self.path, max_age=3600)
+        self.assertEqual(len(reloaded.records), 0)
+        self.assertEqual(len(reloaded.deduplicate([dict(SYNDICATED)])), 1)
+
+    def test_match_indexes_only_on_commit(self):
+        """Un lot regroupé mais non validé reste nouveau pour l'index."""
+        index = NearDuplicateIndex(path=None)
+        canonical, pending = index.match([dict(ORIGINAL), dict(SYNDICATED)])
+        self.assertEqual([e['link'] for e in canonical], [ORIGINAL['link']])
+        self.assertEqual(len(index.records), 0)
+        self.assertEqual(len(index.match([dict(REWRITTEN)])[0]), 1)
+
+        index.commit(pending)
+        self.assertEqual(index.match([dict(REWRITTEN)])[0], [])
+
+    def test_entries_without_text_are_kept(self):
+        index = NearDuplicateIndex(path=None)
+        empty = [entry("https://a.example.com", "", ""), entry("https://b.example.com", "", "")]
+        self.assertEqual(len(index.deduplicate(empty)), 2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+import unittest
+import sys
+import os
+import json
+
+# Ajouter le chemin du projet pour les imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from processing.opportunity import Opportunity, json_default
+from processing.pipeline import process_opportunities
+
+class TestOpportunity(unittest.TestCase):
+
+    def test_from_raw_normalizes_field_names(self):
+        galxe = Opportunity.from_raw({'title': "Campaign", 'link': "https://galxe.com/c/1", 'source': "Galxe"})
+        rss = Opportunity.from_raw({'title': "Post", 'url': "https://x.com/1", 'estimated_time': 3,
+                                    'roi_usd_per_min': 0.5, 'end_time': "2026-12-31", 'chain': "Base"})
+        self.assertEqual(galxe.url, "https://galxe.com/c/1")
+        self.assertEqual((rss.time_est_min, rss.roi, rss.deadline), (3, 0.5, "2026-12-31"))
+        self.assertEqual(rss.extra, {'chain': "Base"})
+        self.assertIsNone(galxe.extra)
+        # Le nom canonique l'emporte sur l'alias
+        self.assertEqual(Opportunity.from_raw({'url': "a", 'link': "b"}).url, "a")
+
+    def test_compact_and_interned(self):
+        first = Opportunity.from_raw({'source': ''.join(["Zea", "ly"]), 'reward_currency': ''.join(["X", "P"])})
+        second = Opportunity.from_raw({'source': ''.join(["Ze", "aly"]), 'reward_currency': ''.join(["X", "P"])})
+        self.assertIs(first.source, second.source)
+        self.assertIs(first.reward_currency, second.reward_currency)
+        self.assertFalse(hasattr(first, '__dict__'))
+
+    def test_mapping_interface(self):
+        op = Opportunity(title="Quest", link="https://a.com", time_est_min=0)
+        self.assertEqual(op.get('url'), op['link'])
+        self.assertIn('time_est_min', op)  # 0 est une valeur, pas une absence
+        self.assertNotIn('roi', op)
+        self.assertEqual(op.get('roi', 0), 0)
+        with self.assertRaises(KeyError):
+            op['roi']
+        op['logo'] = "logo.png"
+        self.assertEqual(op.to_dict(), {'title': "Quest", 'url': "https://a.com", 'time_est_min': 0,
+                                        'logo': "logo.png"})
+
+    def test_json_round_trip(self):
+        op = Opportunity.from_raw({'id': 7, 'title': "Quest", 'reward': "$5", 'tags': ["defi"]})
+        data = json.loads(json.dumps({'ops': [op]}, default=json_default))
+        self.assertEqual(Opportunity.from_raw(data['ops'][0]), op)
+
+    def test_pipeline_accepts_records(self):
+        raws = [
+            {'title': 'Quest A', 'url': 'https://a.com', 'reward': "$100", 'time_est_min': 10, 'source': 'Galxe'},
+            {'title': 'Quest B', 'link': 'https://b.com', 'reward': "500 XP", 'estimated_time': 5, 'source': 'Galxe'},
+            {'title': 'Quest A', 'url': 'https://a.com/?utm_source=x', 'reward': "$100", 'time_est_min': 10,
+             'source': 'RSS'},
+        ]
+        result = process_opportunities(Opportunity.from_records(raws), min_roi=1.0)
+        self.assertEqual(result['stats']['after_deduplication'], 2)
+        top = result['processed_opportunities'][0]
+        self.assertIsInstance(top, Opportunity)
+        self.assertEqual((top.title, top.roi, top.currency_detected), ('Quest A', 10.0, 'USD'))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+import unittest
+import sys
+import os
+import tempfile
+import shutil
+
+# Ajouter le chemin du projet pour les imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from storage.opportunity_store import OpportunityStore
+from processing.opportunity import Opportunity
+
+def quest(quest_id, roi, source='Galxe', **fields):
+    op = {'id': quest_id, 'source': source, 'title': f"Quest {quest_id}", 'url': f"https://example.com/q/{quest_id}",
+          'reward': "$50", 'roi': roi}
+    op.update(fields)
+    return op
+
+class TestOpportunityStore(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.store = OpportunityStore(os.path.join(self.tmp_dir, "opportunities.db"))
+
+    def tearDown(self):
+        self.store.close()
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_wal_mode(self):
+        self.assertEqual(self.store.conn.execute("PRAGMA journal_mode").fetchone()[0], 'wal')
+
+    def test_upsert_by_hash_across_runs(self):
+        """Une opportunité revue est mise à jour sur place ; sa première apparition est conservée."""
+        self.store.start_run("test", now=900)
+        self.store.save_opportunities([quest(1, 3.0), quest(2, 1.0)], now=1000)
+        self.store.save_opportunities([quest(1, 4.5, reward="$75"), quest(3, 2.0)], now=2000)
+        self.assertEqual(len(self.store), 3)
+        updated = self.store.query(source='Galxe', limit=1)[0]
+        self.assertEqual((updated['reward'], updated['roi']), ("$75", 4.5))
+        self.assertEqual((updated['created_at'], updated['updated_at']), (1000, 2000))
+
+    def test_indexed_queries(self):
+        self.store.save_opportunities([quest(1, 3.0), quest(2, 6.0, source='Zealy'), quest(3, 1.0)], now=1000)
+        self.store.save_opportunities([quest(4, 2.5, source='Zealy')], now=2000)
+        self.assertEqual([op['id'] for op in self.store.query()], [2, 1, 4, 3])
+        self.assertEqual([op['id'] for op in self.store.query(source='Zealy', min_roi=2.6)], [2])
+        self.assertEqual([op['id'] for op in self.store.query(since=1500)], [4])
+        self.assertEqual([op['id'] for op in self.store.top(limit=2, min_roi=2.0)], [2, 1])
+        self.assertEqual(self.store.source_counts(), {'Galxe': 2, 'Zealy': 2})
+        plan = " ".join(row[3] for row in self.store.conn.execute(
+            "EXPLAIN QUERY PLAN SELECT data FROM opportunities WHERE source = ? AND roi >= ? ORDER BY roi DESC",
+            ('Zealy', 2.0)))
+        self.assertIn("opportunities_source_roi", plan)
+
+    def test_save_run_with_records_and_source_stats(self):
+        report = {'sources': [{'name': 'Galxe', 'status': 'ok', 'count': 2, 'duration': 1.5, 'error': None},
+                              {'name': 'Zealy', 'status': 'timeout', 'count': 0, 'duration': 60.0,
+                               'error': "Délai de 60s dépassé"}]}
+        records = Opportunity.from_records([quest(1, 3.0, chain="Base"), quest(2, 1.0, link="ignored")])
+        run_id = self.store.save_run("test", records, stats={'after_roi_filter': 1}, execution_report=report)
+        run = self.store.runs(limit=1)[0]
+        self.assertEqual((run['id'], run['stored'], run['stats']), (run_id, 2, {'after_roi_filter': 1}))
+        self.assertEqual([(s['source'], s['status']) for s in self.store.source_stats(run_id)],
+                         [('Galxe', 'ok'), ('Zealy', 'timeout')])
+        stored = self.store.get(records[0].hash)
+        self.assertEqual((stored['title'], stored['chain']), ("Quest 1", "Base"))
+
+    def test_failed_save_run_leaves_no_trace(self):
+        """Un run est une seule transaction : un rapport invalide annule aussi le lot et le run."""
+        with self.assertRaises(KeyError):
+            self.store.save_run("test", [quest(1, 3.0)], execution_report={'sources': [{'status': 'ok'}]})
+        self.assertEqual(len(self.store), 0)
+        self.assertEqual(self.store.runs(), [])
+
+if __name__ == '__main__':
+    unittest.main()
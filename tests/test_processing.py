@@ -7,7 +7,9 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')
 
 from processing.roi_calculator import calculate_roi
 from processing.deduplication import deduplicate_opportunities, hash_opportunity
-from processing.roi_filter import filter_by_roi, categorize_by_roi
+from processing.roi_filter import filter_by_roi, categorize_by_roi, rank_by_roi
+from processing.pipeline import process_opportunities
+from processing.roi_vectorized import columnar_available
 
 class TestROICalculator(unittest.TestCase):
     
@@ -87,6 +89,18 @@ class TestROIFilter(unittest.TestCase):
         self.assertEqual(len(categories['high']), 1)    # ≥ $5/min
         self.assertEqual(len(categories['medium']), 1)  # $2-5/min
         self.assertEqual(len(categories['low']), 2)     # < $2/min
+    
+    def test_rank_by_roi_top_k(self):
+        """Top-K en un passage : même tête que le tri complet, ex aequo dans l'ordre d'origine."""
+        ops = [{'title': f'Op {i}', 'roi': roi} for i, roi in enumerate([3.0, 7.0, 3.0, 1.0, 7.0, 2.5, 3.0])]
+        ranked, categories, stats = rank_by_roi(ops, min_roi=2.0)
+        for k in range(len(ops) + 1):
+            self.assertEqual(rank_by_roi(ops, min_roi=2.0, top_k=k)[0], ranked[:k])
+        self.assertEqual([op['title'] for op in ranked[:3]], ['Op 1', 'Op 4', 'Op 0'])
+        self.assertEqual((stats['count'], stats['max_roi'], stats['min_roi']), (6, 7.0, 2.5))
+        self.assertAlmostEqual(stats['avg_roi'], 25.5 / 6)
+        self.assertEqual((stats['high'], stats['medium'], stats['low']), (2, 4, 1))
+        self.assertEqual(len(categories['medium']), 4)
 
 class TestIntegration(unittest.TestCase):
     
@@ -115,6 +129,37 @@ class TestIntegration(unittest.TestCase):
         filtered_ops = filter_by_roi(unique_ops, min_roi=2.0)
         self.assertEqual(len(filtered_ops), 1)  # Seulement Airdrop 2 ($5/min)
 
+@unittest.skipUnless(columnar_available(), "NumPy non installé")
+class TestColumnarPipeline(unittest.TestCase):
+    
+    def make_opportunities(self):
+        rewards = ["$50", "100 XP", "10 GAL", "2000 points", "$10-30 estimated", 25, "unknown"]
+        return [
+            {'title': f'Op {i % 40}', 'url': f'https://test{i % 40}.com', 'reward': rewards[i % len(rewards)],
+             'time_est_min': i % 7}
+            for i in range(60)
+        ]
+    
+    def test_columnar_matches_dict_pipeline(self):
+        """Le mode colonnes donne exactement le même résultat que le chemin dict par dict."""
+        expected = process_opportunities(self.make_opportunities(), min_roi=2.0, columnar=False)
+        result = process_opportunities(self.make_opportunities(), min_roi=2.0, columnar=True)
+        self.assertEqual(result, expected)
+        self.assertEqual(result['stats']['after_deduplication'], 40)
+    
+    def test_top_k_matches_full_ranking(self):
+        """Avec top_k, les deux chemins gardent la tête du classement complet et les mêmes stats."""
+        full = process_opportunities(self.make_opportunities(), min_roi=1.0, columnar=False)
+        for columnar in (False, True):
+            result = process_opportunities(self.make_opportunities(), min_roi=1.0, columnar=columnar, top_k=5)
+            self.assertEqual(result['processed_opportunities'], full['processed_opportunities'][:5])
+            self.assertEqual(result['stats'], full['stats'])
+    
+    def test_columnar_empty_batch(self):
+        result = process_opportunities([], columnar=True)
+        self.assertEqual(result['processed_opportunities'], [])
+        self.assertEqual(result['stats']['avg_roi'], 0)
+
 if __name__ == '__main__':
     # Configurer la sortie des tests
     unittest.main(verbosity=2)
@@ -0,0 +1,98 @@
+import unittest
+import sys
+import os
+import tempfile
+import shutil
+import threading
+
+# Ajouter le chemin du projet pour les imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from quota_ledger import QuotaLedger, account_id_for
+
+class TestQuotaLedger(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.tmp_dir, "quota.db")
+        self.accounts = [account_id_for(f"key-{i}") for i in range(3)]
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def make_ledger(self, **kwargs):
+        params = dict(daily_budget=2, monthly_budget=100, bucket_capacity=10, refill_per_minute=60)
+        params.update(kwargs)
+        ledger = QuotaLedger(db_path=self.db_path, **params)
+        ledger.register(self.accounts)
+        return ledger
+
+    def test_account_id_hides_key(self):
+        """L'identifiant de compte ne contient pas la clé d'API."""
+        self.assertNotIn("key-0", account_id_for("key-0"))
+        self.assertEqual(account_id_for("key-0"), account_id_for("key-0"))
+
+    def test_least_loaded_selection(self):
+        """Sans préférence, la charge est répartie sur les comptes les moins utilisés."""
+        ledger = self.make_ledger()
+        chosen = [ledger.acquire(self.accounts) for _ in range(3)]
+        self.assertEqual(sorted(chosen), sorted(self.accounts))
+
+    def test_preferred_account(self):
+        """Le compte préféré est choisi tant qu'il est éligible."""
+        ledger = self.make_ledger()
+        self.assertEqual(ledger.acquire(self.accounts, prefer=self.accounts[2]), self.accounts[2])
+        self.assertEqual(ledger.acquire(self.accounts, prefer=self.accounts[2]), self.accounts[2])
+        # Budget journalier (2) atteint : bascule vers un autre compte
+        self.assertNotEqual(ledger.acquire(self.accounts, prefer=self.accounts[2]), self.accounts[2])
+
+    def test_usage_persists_across_instances(self):
+        """Une nouvelle instance (nouveau run) retrouve l'usage déjà consommé."""
+        self.make_ledger().acquire(self.accounts, prefer=self.accounts[0])
+        states = self.make_ledger().snapshot(self.accounts)
+        self.assertEqual(states[self.accounts[0]]['day_used'], 1)
+
+    def test_pool_exhausted(self):
+        """Le pool n'est épuisé que lorsque tous les comptes ont consommé leur budget."""
+        ledger = self.make_ledger()
+        for _ in range(5):
+            self.assertIsNotNone(ledger.acquire(self.accounts))
+            self.assertFalse(ledger.pool_exhausted(self.accounts))
+        self.assertIsNotNone(ledger.acquire(self.accounts))
+        self.assertTrue(ledger.pool_exhausted(self.accounts))
+        self.assertIsNone(ledger.acquire(self.accounts))
+
+    def test_token_bucket_limits_burst(self):
+        """Le token bucket limite les rafales même si le budget journalier le permet."""
+        ledger = self.make_ledger(daily_budget=100, bucket_capacity=1, refill_per_minute=0.001)
+        self.assertIsNotNone(ledger.acquire(self.accounts[:1]))
+        self.assertIsNone(ledger.acquire(self.accounts[:1]))
+        self.assertFalse(ledger.pool_exhausted(self.accounts[:1]))
+
+    def test_concurrent_workers_never_overconsume(self):
+        """Des workers concurrents ne dépassent jamais le budget total du pool."""
+        self.make_ledger()
+        granted = []
+        lock = threading.Lock()
+
+        def worker():
+            ledger = QuotaLedger(db_path=self.db_path, daily_budget=2, monthly_budget=100,
+                                 bucket_capacity=10, refill_per_minute=60)
+            for _ in range(4):
+                account = ledger.acquire(self.accounts)
+                if account:
+                    with lock:
+                        granted.append(account)
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(granted), 6)  # 3 comptes x 2 requêtes/jour
+        for account in self.accounts:
+            self.assertEqual(granted.count(account), 2)
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
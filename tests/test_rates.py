@@ -0,0 +1,125 @@
+import unittest
+import sys
+import os
+import json
+import tempfile
+import shutil
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+# Ajouter le chemin du projet pour les imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from processing.rates import RateProvider, JSONRateSource, HTTPRateSource, set_rate_provider
+from processing.roi_calculator import calculate_roi
+
+class SlowSource:
+    """Source de prix dont la réponse est retenue jusqu'à `release`."""
+
+    def __init__(self, rates):
+        self.rates = rates
+        self.release = threading.Event()
+        self.calls = 0
+
+    def fetch(self):
+        self.calls += 1
+        self.release.wait(5)
+        if isinstance(self.rates, Exception):
+            raise self.rates
+        return self.rates
+
+def wait_for(condition, timeout=2):
+    deadline = time.time() + timeout
+    while not condition() and time.time() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+class TestRateProvider(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_json_source_overrides_defaults(self):
+        path = os.path.join(self.tmp_dir, "rates.json")
+        with open(path, "w") as f:
+            json.dump({"rates": {"gal": 0.42, "ARB": "1.1", "BAD": -3, "NAN": "x"}}, f)
+        provider = RateProvider(JSONRateSource(path))
+        self.assertTrue(provider.refresh())
+        self.assertEqual(provider.rates_for(["GAL", "ARB", "XP", "BAD", "???"]), [0.42, 1.1, 0.01, 0.0, 0.0])
+        # Fichier absent : les taux de repli restent en place
+        missing = RateProvider(JSONRateSource(os.path.join(self.tmp_dir, "missing.json")))
+        self.assertTrue(missing.refresh())
+        self.assertEqual(missing.rate("GAL"), 0.50)
+
+    def test_chain_tokens_have_default_rates(self):
+        """Les jetons reconnus par l'analyse des récompenses ont un taux de repli ; l'inconnu ne vaut rien."""
+        from processing.reward_parser import TOKENS, TOKEN_ALIASES
+        provider = RateProvider()
+        for token in TOKENS:
+            self.assertGreater(provider.rate(TOKEN_ALIASES.get(token, token)), 0, token)
+        self.assertGreater(provider.rate("ETH"), provider.rate("SOL"))
+        self.assertEqual(calculate_roi(1000, 10, "FOO"), 0.0)
+
+    def test_stale_while_revalidate(self):
+        source = SlowSource({"GAL": 0.8})
+        provider = RateProvider(source, ttl=3600)
+        start = time.monotonic()
+        self.assertEqual(provider.rate("GAL"), 0.50)   # Sert les taux connus sans attendre
+        self.assertEqual(provider.rate("GAL"), 0.50)
+        self.assertLess(time.monotonic() - start, 1)
+        self.assertTrue(wait_for(lambda: source.calls == 1))
+        source.release.set()
+        self.assertTrue(wait_for(lambda: provider.rate("GAL") == 0.8))
+        self.assertEqual(source.calls, 1)  # Une seule revalidation, puis frais pendant le TTL
+
+    def test_failed_refresh_keeps_rates(self):
+        source = SlowSource({"GAL": 0.8})
+        source.release.set()
+        provider = RateProvider(source, ttl=0, retry_delay=3600)
+        self.assertTrue(provider.refresh())
+        source.rates = OSError("endpoint indisponible")
+        self.assertFalse(provider.refresh())
+        self.assertEqual(provider.rate("GAL"), 0.8)
+        calls = source.calls
+        provider.rate("GAL")
+        time.sleep(0.05)
+        self.assertEqual(source.calls, calls)  # Pas de nouvel essai avant retry_delay
+
+    def test_http_source_with_local_stub(self):
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                body = json.dumps({"GAL": 0.61, "XP": 0.02}).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        server = HTTPServer(("127.0.0.1", 0), Handler)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            provider = RateProvider(HTTPRateSource(f"http://127.0.0.1:{server.server_port}/rates"))
+            self.assertTrue(provider.refresh())
+            self.assertEqual(provider.rates_for(["GAL", "XP"]), [0.61, 0.02])
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    def test_roi_uses_shared_provider(self):
+        provider = RateProvider(defaults={"GAL": 2.0})
+        previous = set_rate_provider(provider)
+        try:
+            self.assertEqual(calculate_roi(10, 5, "GAL"), 4.0)
+        finally:
+            set_rate_provider(previous)
+        self.assertEqual(calculate_roi(10, 5, "GAL"), 1.0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+import unittest
+import sys
+import os
+
+# Ajouter le chemin du projet pour les imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from processing.reward_parser import (parse_reward, parse_rewards, find_reward, format_reward,
+                                      NO_REWARD)
+from processing.pipeline import extract_reward_info
+
+class TestParseReward(unittest.TestCase):
+
+    def assertReward(self, value, amount, currency, **kwargs):
+        info = parse_reward(value, **kwargs)
+        self.assertAlmostEqual(info.amount, amount)
+        self.assertEqual(info.currency, currency)
+        return info
+
+    def test_supported_formats(self):
+        self.assertReward("$1,000", 1000, 'USD')
+        self.assertReward("500 XP", 500, 'XP')
+        self.assertReward("0.05 BTC", 0.05, 'BTC')
+        self.assertReward("100 USDT", 100, 'USDT')
+        self.assertReward("1,500 points", 1500, 'POINTS')
+        self.assertReward("$2.5k", 2500, 'USD')
+        self.assertReward("Web3 quest: 300 xp", 300, 'XP')
+
+    def test_range_estimates(self):
+        info = self.assertReward("$10-30 estimated", 20, 'USD')
+        self.assertEqual((info.low, info.high), (10, 30))
+        self.assertLess(info.confidence, self.assertReward("$10-30", 20, 'USD').confidence)
+
+    def test_bare_numbers_and_defaults(self):
+        self.assertEqual(self.assertReward(100, 100, 'XP', default_currency='XP').confidence, 1.0)
+        self.assertLess(self.assertReward("100", 100, 'XP', default_currency='XP').confidence, 0.9)
+        self.assertEqual(parse_reward("unknown"), NO_REWARD)
+        self.assertEqual(parse_reward(None), NO_REWARD)
+
+    def test_batch_uses_declared_currency(self):
+        opportunities = [{'reward': 100, 'reward_currency': 'XP'}, {'reward': "$25"}, {'title': "no reward"}]
+        rewards = parse_rewards(opportunities)
+        self.assertEqual([(r.amount, r.currency) for r in rewards], [(100, 'XP'), (25, 'USD'), (None, None)])
+
+    def test_free_text_prefers_dollars(self):
+        self.assertEqual(find_reward("Stake 2 ETH and win $500 in prizes").amount, 500)
+        self.assertEqual(format_reward(find_reward("claim 0.5 btc today")), "0.5 BTC")
+        # Les montants macro (« 50 million ARB ») et les nombres nus ne sont pas des récompenses
+        self.assertIsNone(find_reward("Arbitrum unlocks 50 million ARB in 2025"))
+
+    def test_pipeline_extract_reward_info(self):
+        self.assertEqual(extract_reward_info({'reward': "$50-100 estimated", 'estimated_time': 5}), (75, 'USD', 5))
+        self.assertEqual(extract_reward_info({'reward': 200, 'reward_currency': 'XP'}), (200, 'XP', 5))
+        self.assertEqual(extract_reward_info({}), (10, 'USD', 5))
+
+if __name__ == '__main__':
+    unittest.main()
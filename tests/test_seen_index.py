@@ -0,0 +1,109 @@
+import unittest
+import sys
+import os
+import tempfile
+import shutil
+
+# Ajouter le chemin du projet pour les imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from processing.seen_index import SeenIndex, opportunity_key, content_fingerprint
+from processing.opportunity import Opportunity
+from processing.pipeline import process_opportunities
+
+def quest(quest_id, reward="$50", **fields):
+    op = {'id': quest_id, 'source': 'Zealy', 'title': f"Quest {quest_id}", 'url': f"https://zealy.io/q/{quest_id}",
+          'reward': reward, 'time_est_min': 5}
+    op.update(fields)
+    return op
+
+class TestSeenIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp_dir, "seen.db")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_new_updated_unchanged_across_runs(self):
+        """Un second run ne réémet que ce qui est nouveau ou a changé."""
+        index = SeenIndex(path=self.path)
+        new, updated, unchanged = index.classify([quest(1), quest(2)], now=1000)
+        self.assertEqual((len(new), len(updated), len(unchanged)), (2, 0, 0))
+        index.close()
+
+        index = SeenIndex(path=self.path)
+        new, updated, unchanged = index.classify([quest(1), quest(2, reward="$80"), quest(3)], now=2000)
+        self.assertEqual([op['id'] for op in new], [3])
+        self.assertEqual([op['id'] for op in updated], [2])
+        self.assertEqual([op['id'] for op in unchanged], [1])
+        self.assertEqual(index.get(quest(1)), (1000, 2000))
+        index.close()
+
+    def test_key_is_normalized(self):
+        self.assertEqual(opportunity_key({'source': 'Galxe', 'url': 'https://Galxe.com/Q1 '}),
+                         opportunity_key({'source': 'galxe', 'url': 'https://galxe.com/Q1'}))
+        self.assertNotEqual(opportunity_key(quest(1)), opportunity_key(quest(1, source='Layer3')))
+
+    def test_fingerprint_ignores_field_aliases(self):
+        """Un dict aux noms hérités et son Opportunity ont la même empreinte."""
+        raw = quest(1, end_time="2025-09-01", estimated_time=15)
+        del raw['time_est_min']
+        record = Opportunity.from_raw(dict(raw))
+        self.assertEqual(content_fingerprint(raw), content_fingerprint(record))
+        self.assertEqual(content_fingerprint(raw), content_fingerprint(quest(1, deadline="2025-09-01", time_est_min=15)))
+        self.assertNotEqual(content_fingerprint(raw), content_fingerprint(dict(raw, end_time="2025-10-01")))
+
+        index = SeenIndex(path=None)
+        index.classify([raw], now=1000)
+        _, updated, unchanged = index.classify([record], now=1001)
+        self.assertEqual((len(updated), len(unchanged)), (0, 1))
+
+    def test_ttl_pruning(self):
+        index = SeenIndex(path=None, ttl=100)
+        index.classify([quest(1)], now=1000)
+        index.classify([quest(2)], now=1050)
+        self.assertEqual(len(index), 2)
+        self.assertEqual(index.prune(now=1120), 1)
+        self.assertNotIn(quest(1), index)
+        # Oubliée après le TTL, l'opportunité redevient nouvelle
+        new, _, _ = index.classify([quest(1)], now=1130)
+        self.assertEqual(len(new), 1)
+
+    def test_batch_larger_than_lookup_chunk(self):
+        index = SeenIndex(path=None)
+        ops = [quest(i) for i in range(SeenIndex.LOOKUP_CHUNK * 2 + 7)]
+        index.classify(ops, now=1000)
+        new, updated, unchanged = index.classify([dict(op) for op in ops], now=1001)
+        self.assertEqual((len(new), len(updated), len(unchanged)), (0, 0, len(ops)))
+
+    def test_pipeline_skips_unchanged(self):
+        index = SeenIndex(path=None)
+        process_opportunities([quest(1), quest(2)], min_roi=1.0, seen_index=index)
+        index.commit()
+        result = process_opportunities([quest(1), quest(2, reward="$90"), quest(3)], min_roi=1.0, seen_index=index)
+        self.assertEqual(sorted(op['id'] for op in result['processed_opportunities']), [2, 3])
+        self.assertEqual((result['stats']['new'], result['stats']['updated'], result['stats']['unchanged']), (1, 1, 1))
+
+    def test_pass_is_recorded_only_on_commit(self):
+        """Un run dont le stockage échoue ne marque rien comme vu."""
+        index = SeenIndex(path=None)
+        index.classify([quest(1)], now=1000, commit=False)
+        self.assertEqual(len(index), 0)
+        # Run abandonné : la classification suivante remplace la précédente
+        new, _, _ = index.classify([quest(1), quest(2)], now=1100, commit=False)
+        self.assertEqual(len(new), 2)
+        index.commit()
+        self.assertEqual(index.get(quest(1)), (1100, 1100))
+        index.commit()
+        self.assertEqual(len(index), 2)
+
+    def test_pipeline_defers_index_until_commit(self):
+        index = SeenIndex(path=None)
+        process_opportunities([quest(1)], min_roi=1.0, seen_index=index)
+        result = process_opportunities([quest(1)], min_roi=1.0, seen_index=index)
+        self.assertEqual(result['stats']['new'], 1)
+
+if __name__ == '__main__':
+    unittest.main()
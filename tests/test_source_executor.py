@@ -0,0 +1,126 @@
+import unittest
+import sys
+import os
+import time
+
+# Ajouter le chemin du projet pour les imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from scrapers.source_executor import Source, SourceBatch, SourceExecutor, run_sources
+
+def make_source(name, delay, result=None, error=None, timeout=None):
+    def fetch(stop):
+        time.sleep(delay)
+        if error:
+            raise error
+        return result if result is not None else [{'title': name, 'source': name}]
+    return Source(name, fetch, timeout=timeout)
+
+class TestSourceExecutor(unittest.TestCase):
+
+    def test_sources_run_concurrently(self):
+        """Le temps réel doit être proche de la source la plus lente, pas de la somme."""
+        sources = [make_source(f"S{i}", 0.2) for i in range(4)]
+        executor = SourceExecutor(max_workers=4)
+        results = executor.run(sources)
+
+        self.assertEqual(len(results), 4)
+        self.assertTrue(all(r.status == 'ok' for r in results))
+        self.assertLess(executor.last_report['wall_time'], 0.6)
+        self.assertGreater(executor.last_report['sum_source_time'], 0.7)
+
+    def test_bounded_parallelism(self):
+        """Avec un seul worker, les sources s'exécutent l'une après l'autre."""
+        sources = [make_source(f"S{i}", 0.1) for i in range(3)]
+        executor = SourceExecutor(max_workers=1)
+        executor.run(sources)
+        self.assertGreaterEqual(executor.last_report['wall_time'], 0.3)
+
+    def test_slow_source_does_not_delay_others(self):
+        """Une source lente est abandonnée à son délai et les autres arrivent avant."""
+        sources = [
+            make_source("Slow", 5, timeout=0.3),
+            make_source("Fast", 0.05),
+        ]
+        executor = SourceExecutor(max_workers=2, poll_interval=0.05)
+        start = time.perf_counter()
+        results = executor.run(sources)
+
+        self.assertLess(time.perf_counter() - start, 1.0)
+        self.assertEqual(results[0].name, "Fast")
+        self.assertEqual(results[1].status, 'timeout')
+
+    def test_failing_source_is_isolated(self):
+        """Une source en erreur n'empêche pas la collecte des autres."""
+        sources = [
+            make_source("Broken", 0, error=ValueError("boom")),
+            make_source("Empty", 0, result=[]),
+            make_source("Good", 0),
+        ]
+        opportunities, report = run_sources(sources, max_workers=3)
+
+        self.assertEqual(len(opportunities), 1)
+        statuses = {s['name']: s['status'] for s in report['sources']}
+        self.assertEqual(statuses, {'Broken': 'error', 'Empty': 'empty', 'Good': 'ok'})
+
+    def test_cancel_skips_pending_sources(self):
+        """Une annulation marque les sources non terminées comme annulées."""
+        executor = SourceExecutor(max_workers=1, poll_interval=0.05)
+
+        def cancelling_fetch(stop):
+            executor.cancel()
+            return [{'title': 'first'}]
+
+        sources = [Source("First", cancelling_fetch), make_source("Second", 0)]
+        results = executor.run(sources)
+        statuses = {r.name: r.status for r in results}
+        self.assertEqual(statuses["Second"], 'cancelled')
+
+    def test_same_name_sources_are_tracked_separately(self):
+        """Deux sources homonymes sont suivies et collectées séparément."""
+        sources = [make_source("RSS", 0.05, result=[{'title': 'a'}]),
+                   make_source("RSS", 0.1, result=[{'title': 'b'}])]
+        results = SourceExecutor(max_workers=2, poll_interval=0.05).run(sources)
+        self.assertEqual(sorted(r.opportunities[0]['title'] for r in results), ['a', 'b'])
+        self.assertTrue(all(r.status == 'ok' for r in results))
+
+    def test_only_accepted_sources_are_committed(self):
+        """L'état d'une source abandonnée n'est jamais validé, même si elle finit plus tard."""
+        committed = []
+
+        def batch_source(name, delay, timeout=None):
+            def fetch(stop):
+                time.sleep(delay)
+                return SourceBatch([{'title': name}], [lambda: committed.append(name)])
+            return Source(name, fetch, timeout=timeout)
+
+        opportunities, report = run_sources([batch_source("Fast", 0.05), batch_source("Slow", 0.5, timeout=0.2)],
+                                            max_workers=2)
+        self.assertEqual([op['title'] for op in opportunities], ["Fast"])
+        self.assertEqual(committed, [])  # Rien n'avance avant le stockage du run
+        opportunities.commit()
+        time.sleep(0.5)
+        self.assertEqual(committed, ["Fast"])
+
+    def test_timed_out_source_is_told_to_stop(self):
+        """Une source abandonnée voit son événement `stop` levé et s'arrête à son point de contrôle."""
+        pages = []
+
+        def paged_fetch(stop):
+            for page in range(50):
+                if stop.is_set():
+                    break
+                pages.append(page)
+                stop.wait(0.05)
+            return [{'title': 'late'}]
+
+        results = SourceExecutor(poll_interval=0.05).run([Source("Paged", paged_fetch, timeout=0.2)])
+        self.assertEqual(results[0].status, 'timeout')
+        time.sleep(0.2)
+        stopped_at = len(pages)
+        time.sleep(0.2)
+        self.assertEqual(len(pages), stopped_at)
+        self.assertLess(stopped_at, 10)
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
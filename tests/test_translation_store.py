@@ -0,0 +1,64 @@
+import unittest
+import sys
+import os
+import tempfile
+import shutil
+from unittest.mock import MagicMock
+
+# Ajouter le chemin du projet pour les imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from scrapers.translation_store import TranslationStore
+
+def fake_translator():
+    """Traducteur factice : préfixe chaque texte, un objet réponse par texte du lot."""
+    translator = MagicMock()
+    translator.translate.side_effect = lambda batch, src, dest: [MagicMock(text=f"EN:{t}") for t in batch]
+    return translator
+
+class TestTranslationStore(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def make_store(self, **kwargs):
+        return TranslationStore(os.path.join(self.tmp_dir, "translations"), **kwargs)
+
+    def test_batches_distinct_texts(self):
+        """Les textes distincts partent par lots ; l'ordre et les doublons sont respectés."""
+        translator = fake_translator()
+        store = self.make_store(batch_size=2)
+        result = store.translate(["uno", "dos", "uno", "tres"], translator, 'es')
+        self.assertEqual(result, ["EN:uno", "EN:dos", "EN:uno", "EN:tres"])
+        self.assertEqual(translator.translate.call_count, 2)
+
+    def test_cache_persists_across_runs(self):
+        """Un texte déjà traduit ne coûte plus aucun appel au run suivant."""
+        self.make_store().translate(["Nuevo airdrop gratis"], fake_translator(), 'es')
+        translator = fake_translator()
+        store = self.make_store()
+        self.assertEqual(store.translate(["Nuevo airdrop gratis"], translator, 'es'), ["EN:Nuevo airdrop gratis"])
+        translator.translate.assert_not_called()
+        self.assertEqual(store.get_stats()['hits'], 1)
+
+    def test_full_text_key(self):
+        """Deux textes au même début ne se confondent pas ; la paire de langues compte."""
+        prefix = "x" * 60
+        self.assertNotEqual(TranslationStore.make_key(prefix + "a", 'es', 'en'),
+                            TranslationStore.make_key(prefix + "b", 'es', 'en'))
+        self.assertNotEqual(TranslationStore.make_key("hola", 'es', 'en'),
+                            TranslationStore.make_key("hola", 'pt', 'en'))
+
+    def test_error_returns_original_uncached(self):
+        """En cas d'échec, le texte original est renvoyé et retraduit au prochain run."""
+        failing = MagicMock()
+        failing.translate.side_effect = Exception("quota")
+        store = self.make_store()
+        self.assertEqual(store.translate(["hola"], failing, 'es'), ["hola"])
+        self.assertEqual(store.translate(["hola"], fake_translator(), 'es'), ["EN:hola"])
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
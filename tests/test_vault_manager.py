@@ -0,0 +1,98 @@
+import unittest
+import sys
+import os
+import time
+from unittest.mock import MagicMock, patch
+
+# Ajouter le chemin du projet pour les imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from vault_manager import VaultManager
+
+SECRETS = {
+    "scraperapi/account1": {"api_key": "key-1"},
+    "scraperapi/account2": {"api_key": "key-2"},
+    "scrapers/zealy": {"api_key": "zealy-key"},
+}
+
+def make_client(lease_duration=0, authenticated=True):
+    client = MagicMock()
+    client.is_authenticated.return_value = authenticated
+    kv = client.secrets.kv.v2
+    kv.read_secret_version.side_effect = lambda path, mount_point: {
+        'lease_duration': lease_duration, 'data': {'data': dict(SECRETS[path])}}
+    kv.list_secrets.return_value = {'data': {'keys': ["account1", "account2", "archive/"]}}
+    return client
+
+class TestVaultManager(unittest.TestCase):
+
+    def setUp(self):
+        VaultManager.clear_cache()
+        self.addCleanup(VaultManager.clear_cache)
+        self.client = make_client()
+        patcher = patch("vault_manager.hvac.Client", return_value=self.client)
+        self.hvac_client = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_lazy_single_authentication(self):
+        """Aucune connexion à la construction ; une seule vérification par processus et par token."""
+        first = VaultManager(token="dev-token")
+        self.hvac_client.assert_not_called()
+
+        first.retrieve_secret("scrapers/zealy")
+        VaultManager(token="dev-token").retrieve_secret("scraperapi/account1")
+        self.assertEqual(self.client.is_authenticated.call_count, 1)
+
+        VaultManager(token="other-token").retrieve_secret("scraperapi/account2")
+        self.assertEqual(self.client.is_authenticated.call_count, 2)
+
+    def test_failed_authentication_is_not_remembered(self):
+        self.client.is_authenticated.return_value = False
+        vault = VaultManager(token="dev-token")
+        with self.assertRaises(Exception):
+            vault.retrieve_secret("scrapers/zealy")
+        self.client.is_authenticated.return_value = True
+        self.assertEqual(vault.retrieve_secret("scrapers/zealy"), {"api_key": "zealy-key"})
+        self.assertEqual(self.client.is_authenticated.call_count, 2)
+
+    def test_secret_cache_is_shared_between_instances(self):
+        VaultManager(token="dev-token").retrieve_secret("scrapers/zealy")
+        secret = VaultManager(token="dev-token").retrieve_secret("scrapers/zealy")
+        self.assertEqual(secret, {"api_key": "zealy-key"})
+        self.assertEqual(self.client.secrets.kv.v2.read_secret_version.call_count, 1)
+
+    def test_cache_is_keyed_by_token_and_returns_copies(self):
+        """Un autre token relit le secret ; modifier le secret retourné n'altère pas le cache."""
+        secret = VaultManager(token="dev-token").retrieve_secret("scrapers/zealy")
+        secret["api_key"] = "modifiée"
+        VaultManager(token="dev-token").retrieve_secret("scrapers/zealy")["api_key"] = "encore"
+        self.assertEqual(VaultManager(token="dev-token").retrieve_secret("scrapers/zealy"), {"api_key": "zealy-key"})
+        self.assertEqual(self.client.secrets.kv.v2.read_secret_version.call_count, 1)
+
+        VaultManager(token="other-token").retrieve_secret("scrapers/zealy")
+        self.assertEqual(self.client.secrets.kv.v2.read_secret_version.call_count, 2)
+
+    def test_cache_respects_lease_duration(self):
+        """Un bail Vault plus court que le TTL local fait expirer l'entrée plus tôt."""
+        self.hvac_client.return_value = make_client(lease_duration=0.05)
+        vault = VaultManager(token="dev-token", ttl=3600)
+        vault.retrieve_secret("scrapers/zealy")
+        time.sleep(0.1)
+        vault.retrieve_secret("scrapers/zealy")
+        self.assertEqual(self.hvac_client.return_value.secrets.kv.v2.read_secret_version.call_count, 2)
+
+    def test_prefetch_loads_all_paths_under_prefix(self):
+        vault = VaultManager(token="dev-token")
+        vault.retrieve_secret("scraperapi/account1")   # Déjà en cache : pas relu
+
+        secrets = vault.prefetch("scraperapi/")
+        self.assertEqual(secrets, {"scraperapi/account1": {"api_key": "key-1"},
+                                   "scraperapi/account2": {"api_key": "key-2"}})
+        read_paths = [call.kwargs['path'] for call in self.client.secrets.kv.v2.read_secret_version.call_args_list]
+        self.assertEqual(sorted(read_paths), ["scraperapi/account1", "scraperapi/account2"])
+
+        VaultManager(token="dev-token").retrieve_secret("scraperapi/account2")
+        self.assertEqual(self.client.secrets.kv.v2.read_secret_version.call_count, 2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+import unittest
+import sys
+import os
+import tempfile
+import shutil
+
+# Ajouter le chemin du projet pour les imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from scrapers.zealy_registry import ZealyCommunityRegistry, DEFAULT_COMMUNITIES
+
+class TestZealyCommunityRegistry(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp_dir, "communities.json")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_default_community_is_due(self):
+        """Un registre neuf contient la communauté par défaut, due immédiatement."""
+        registry = ZealyCommunityRegistry(self.path)
+        self.assertEqual(registry.due(), DEFAULT_COMMUNITIES)
+
+    def test_poll_interval(self):
+        """Une communauté n'est plus due avant la fin de son intervalle de polling."""
+        registry = ZealyCommunityRegistry(self.path)
+        registry.add("fast", poll_interval=60)
+        registry.add("slow", poll_interval=3600)
+        registry.mark_polled("fast", now=100000)
+        registry.mark_polled("slow", now=100000)
+        self.assertEqual(registry.due(now=100030), ["aipioneers"])
+        self.assertEqual(registry.due(now=100100), ["aipioneers", "fast"])
+        self.assertIn("slow", registry.due(now=104000))
+
+    def test_cursor_never_moves_back(self):
+        """Le curseur « dernier vu » avance uniquement vers des dates plus récentes."""
+        registry = ZealyCommunityRegistry(self.path)
+        registry.mark_polled("aipioneers", cursor="2025-08-02T10:00:00Z")
+        registry.mark_polled("aipioneers", cursor="2025-08-01T10:00:00Z")
+        registry.mark_polled("aipioneers", cursor=None)
+        self.assertEqual(registry.cursor("aipioneers"), "2025-08-02T10:00:00Z")
+
+    def test_persistence(self):
+        """Le registre est rechargé à l'identique par une nouvelle instance."""
+        registry = ZealyCommunityRegistry(self.path)
+        registry.add("defi", poll_interval=900)
+        registry.mark_polled("defi", cursor="2025-08-02", now=1000)
+        registry.save()
+
+        reloaded = ZealyCommunityRegistry(self.path)
+        self.assertEqual(reloaded.communities["defi"]["poll_interval"], 900)
+        self.assertEqual(reloaded.cursor("defi"), "2025-08-02")
+        self.assertNotIn("defi", reloaded.due(now=1500))
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -10,15 +10,21 @@ from scrapers.zealy_scraper import ZealyScraper
 class TestZealyScraper(unittest.TestCase):
     """Tests unitaires pour le ZealyScraper."""
 
-    @patch("scrapers.zealy_scraper.requests.get")
+    def setUp(self):
+        # fetch_all_quests sauvegarde son lot : aucun fichier écrit dans le data/ du dépôt
+        patcher = patch.object(ZealyScraper, "save_quests")
+        self.save_quests = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    @patch("scrapers.zealy_scraper.requests.Session")
     @patch("scrapers.zealy_scraper.VaultManager")
-    def test_fetch_success(self, mock_vault, mock_get):
+    def test_fetch_success(self, mock_vault, mock_session):
         """Doit récupérer une page de quêtes sans erreur."""
         # Mock du secret Vault
         mock_vault.return_value.retrieve_secret.return_value = {"api_key": "fake-key"}
 
         # Mock d'une réponse HTTP OK
-        mock_response = MagicMock()
+        mock_response = MagicMock(status_code=200, headers={})
         mock_response.json.return_value = [
             {
                 "id": "q1",
@@ -31,16 +37,17 @@ class TestZealyScraper(unittest.TestCase):
             }
         ]
         mock_response.raise_for_status = MagicMock()
-        mock_get.return_value = mock_response
+        mock_session.return_value.get.return_value = mock_response
 
         scraper = ZealyScraper()
         quests = scraper.fetch_all_quests(max_pages=1)
+        self.save_quests.assert_called_once_with(quests)
         self.assertEqual(len(quests), 1)
         self.assertEqual(quests[0]["id"], "q1")
 
-    @patch("scrapers.zealy_scraper.requests.get")
+    @patch("scrapers.zealy_scraper.requests.Session")
     @patch("scrapers.zealy_scraper.VaultManager")
-    def test_fetch_pagination(self, mock_vault, mock_get):
+    def test_fetch_pagination(self, mock_vault, mock_session):
         """Doit gérer la pagination et ne renvoyer que le nombre demandé."""
         mock_vault.return_value.retrieve_secret.return_value = {"api_key": "fake-key"}
 
@@ -48,17 +55,144 @@ class TestZealyScraper(unittest.TestCase):
         def make_page(start, end):
             return [{"id": f"q{i}", "name": f"Quest {i}"} for i in range(start, end)]
 
-        mock_get.side_effect = [
-            MagicMock(json=MagicMock(return_value=make_page(1, 21)), raise_for_status=MagicMock()),
-            MagicMock(json=MagicMock(return_value=make_page(21, 41)), raise_for_status=MagicMock()),
-            MagicMock(json=MagicMock(return_value=make_page(41, 46)), raise_for_status=MagicMock()),
-        ]
+        pages = {1: make_page(1, 21), 2: make_page(21, 41), 3: make_page(41, 46)}
+
+        # Les pages sont demandées en parallèle : réponse choisie selon le numéro de page
+        def fake_get(url, timeout=None):
+            page = int(url.split("page=")[1].split("&")[0])
+            return MagicMock(status_code=200, headers={}, json=MagicMock(return_value=pages.get(page, [])),
+                             raise_for_status=MagicMock())
+
+        mock_session.return_value.get.side_effect = fake_get
 
         scraper = ZealyScraper()
         quests = scraper.fetch_all_quests(max_pages=3)
         self.assertEqual(len(quests), 45)
         self.assertEqual(quests[-1]["id"], "q45")
 
+    @patch("scrapers.zealy_scraper.time.sleep")
+    @patch("scrapers.zealy_scraper.requests.Session")
+    @patch("scrapers.zealy_scraper.VaultManager")
+    def test_fetch_retries_rate_limited_page(self, mock_vault, mock_session, mock_sleep):
+        """Un 429 sur une page est réessayé après Retry-After sans perdre les autres pages."""
+        mock_vault.return_value.retrieve_secret.return_value = {"api_key": "fake-key"}
+        calls = {"page2": 0}
+
+        def fake_get(url, timeout=None):
+            page = int(url.split("page=")[1].split("&")[0])
+            if page == 2 and calls["page2"] == 0:
+                calls["page2"] += 1
+                return MagicMock(status_code=429, headers={"Retry-After": "1"})
+            quests = [{"id": f"p{page}-{i}", "name": "Quest"} for i in range(20 if page < 3 else 3)]
+            return MagicMock(status_code=200, headers={}, json=MagicMock(return_value=quests),
+                             raise_for_status=MagicMock())
+
+        mock_session.return_value.get.side_effect = fake_get
+
+        scraper = ZealyScraper()
+        quests = scraper.fetch_all_quests(max_pages=5, concurrency=2)
+        self.assertEqual(len(quests), 43)
+        self.assertEqual(quests[20]["id"], "p2-0")
+
+    @patch("scrapers.zealy_scraper.requests.Session")
+    @patch("scrapers.zealy_scraper.VaultManager")
+    def test_crawl_communities(self, mock_vault, mock_session):
+        """Doit parcourir toutes les communautés dues et taguer les quêtes par communauté."""
+        import tempfile
+        from scrapers.zealy_registry import ZealyCommunityRegistry
+        mock_vault.return_value.retrieve_secret.return_value = {"api_key": "fake-key"}
+
+        def fake_get(url, timeout=None):
+            community = url.split("/communities/")[1].split("/")[0]
+            page = int(url.split("page=")[1].split("&")[0])
+            quests = [
+                {"id": f"{community}-1", "name": "Nouvelle", "updatedAt": "2025-08-02"},
+                {"id": f"{community}-2", "name": "Ancienne", "updatedAt": "2025-07-01"},
+                {"id": f"{community}-3", "name": "Sans date"},
+            ] if page == 1 else []
+            return MagicMock(status_code=200, headers={}, json=MagicMock(return_value=quests),
+                             raise_for_status=MagicMock())
+
+        mock_session.return_value.get.side_effect = fake_get
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            registry = ZealyCommunityRegistry(os.path.join(tmp_dir, "communities.json"))
+            registry.add("defi")
+            registry.mark_polled("defi", cursor="2025-07-15", now=1)
+
+            scraper = ZealyScraper()
+            raw = scraper.crawl_communities(registry=registry, max_concurrency=2, requests_per_second=100)
+            parsed = scraper.parse_quests(raw)
+
+            # aipioneers : tout est nouveau ; defi : la quête postérieure au curseur et celle sans date
+            self.assertEqual(sorted(q["id"] for q in raw),
+                             ["aipioneers-1", "aipioneers-2", "aipioneers-3", "defi-1", "defi-3"])
+            self.assertEqual({q["community"] for q in parsed}, {"aipioneers", "defi"})
+            self.assertEqual(registry.cursor("defi"), "2025-08-02")
+            self.assertEqual(registry.due(), [])
+
+    @patch("scrapers.zealy_scraper.requests.Session")
+    @patch("scrapers.zealy_scraper.VaultManager")
+    def test_crawl_unsorted_pages_and_deferred_commit(self, mock_vault, mock_session):
+        """Sans ordre garanti, toutes les pages sont lues ; le curseur n'avance qu'au commit."""
+        import tempfile
+        from scrapers.zealy_registry import ZealyCommunityRegistry
+        mock_vault.return_value.retrieve_secret.return_value = {"api_key": "fake-key"}
+        pages = {
+            1: [{"id": "old-1", "updatedAt": "2025-07-01"}, {"id": "old-2", "updatedAt": "2025-07-02"}],
+            2: [{"id": "new-1", "updatedAt": "2025-08-05"}],
+        }
+
+        def fake_get(url, timeout=None):
+            page = int(url.split("page=")[1].split("&")[0])
+            return MagicMock(status_code=200, headers={}, json=MagicMock(return_value=pages.get(page, [])),
+                             raise_for_status=MagicMock())
+
+        mock_session.return_value.get.side_effect = fake_get
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "communities.json")
+            registry = ZealyCommunityRegistry(path)
+            registry.communities.clear()
+            registry.add("defi")
+            registry.mark_polled("defi", cursor="2025-07-15", now=1)
+
+            scraper = ZealyScraper()
+            raw = scraper.crawl_communities(registry=registry, requests_per_second=100, limit=2, commit=False)
+            self.assertEqual([q["id"] for q in raw], ["new-1"])
+            self.assertEqual(registry.cursor("defi"), "2025-07-15")
+            self.assertFalse(os.path.exists(path))
+
+            raw.commit()
+            self.assertEqual(registry.cursor("defi"), "2025-08-05")
+            self.assertEqual(ZealyCommunityRegistry(path).cursor("defi"), "2025-08-05")
+
+    @patch("scrapers.zealy_scraper.requests.Session")
+    @patch("scrapers.zealy_scraper.VaultManager")
+    def test_crawl_stops_when_source_is_abandoned(self, mock_vault, mock_session):
+        """Un arrêt demandé par l'exécuteur interrompt le crawl sans enregistrer de passage."""
+        import tempfile
+        import threading
+        from scrapers.zealy_registry import ZealyCommunityRegistry
+        mock_vault.return_value.retrieve_secret.return_value = {"api_key": "fake-key"}
+        stop = threading.Event()
+
+        def slow_get(url, timeout=None):
+            stop.set()  # L'exécuteur abandonne la source pendant la première page
+            return MagicMock(status_code=200, headers={}, raise_for_status=MagicMock(),
+                             json=MagicMock(return_value=[{"id": f"q{i}", "updatedAt": "2025-08-01"}
+                                                          for i in range(20)]))
+
+        mock_session.return_value.get.side_effect = slow_get
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            registry = ZealyCommunityRegistry(os.path.join(tmp_dir, "communities.json"))
+            scraper = ZealyScraper()
+            raw = scraper.crawl_communities(registry=registry, requests_per_second=100, stop=stop)
+            self.assertEqual(list(raw), [])
+            self.assertEqual(mock_session.return_value.get.call_count, 1)
+            self.assertEqual(registry.due(), ["aipioneers"])
+
     @patch("scrapers.zealy_scraper.VaultManager")
     def test_parse_quests(self, mock_vault):
         """Vérifie le mapping easy/medium/hard vers le temps estimé."""
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Benchmark de la clé canonique (processing.canonical_key) contre les hachages historiques :
+md5(titre|url|description) en déduplication, md5(source-id-titre) dans main.py et
+sha1(source, id) dans l'index des opportunités vues, chacun recalculé à son étape.
+
+Usage:
+    python tools/bench_canonical_key.py [--archive DIR] [--entries N] [--repeat R]
+
+Le corpus est l'archive des runs (data/opportunities/*.json) si elle existe, sinon un
+corpus synthétique : quêtes relayées par plusieurs sources, URLs avec paramètres de suivi,
+http/https, « www. », « / » final. Mesure le taux de doublons détectés et le coût de hachage.
+"""
+import glob
+import hashlib
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from processing.canonical_key import canonical_url, compute_key, opportunity_key
+
+URL_VARIANTS = ["{}", "{}/", "http://{}", "{}?utm_source=twitter&utm_medium=social", "{}?ref=airdrops", "www"]
+
+
+def load_archive(directory):
+    opportunities = []
+    for path in sorted(glob.glob(os.path.join(directory, "*.json"))):
+        try:
+            with open(path, encoding='utf-8') as f:
+                batch = json.load(f)
+        except (OSError, ValueError):
+            continue
+        if isinstance(batch, list):
+            opportunities.extend(op for op in batch if isinstance(op, dict))
+    return opportunities
+
+
+def url_variant(url, rng):
+    variant = rng.choice(URL_VARIANTS)
+    if variant == "www":
+        return url.replace("https://", "https://www.")
+    if variant.startswith("http://"):
+        return url.replace("https://", "http://")
+    return variant.format(url)
+
+
+def generate_corpus(count, rng):
+    """(opportunités, nombre de quêtes distinctes) : chaque quête revient sur plusieurs runs et sources."""
+    opportunities = []
+    quests = 0
+    while len(opportunities) < count:
+        quests += 1
+        slug = f"quest-{quests}"
+        url = f"https://galxe.com/campaign/{slug}"
+        description = f"Complete the {slug} tasks"
+        for run in range(rng.randint(1, 4)):
+            # Campagne Galxe relevée à chaque run, description parfois retouchée
+            opportunities.append({'source': 'Galxe', 'id': slug, 'title': f"Campaign {quests}", 'link': url,
+                                  'description': description + (" (updated)" if run == 3 else "")})
+            if rng.random() < 0.4:  # Relayée par un flux RSS
+                link = url_variant(url, rng)
+                opportunities.append({'source': 'TwitterRSS', 'title': f"New Galxe campaign {quests} is live",
+                                      'id': f"rss_{hashlib.md5(link.encode()).hexdigest()[:8]}", 'url': link,
+                                      'description': "Airdrop alert"})
+        if rng.random() < 0.3:  # Quête Zealy : pas d'URL, id dans la communauté
+            zealy = {'source': 'Zealy', 'id': f"z{quests}", 'community': f"community-{quests % 50}",
+                     'title': f"Zealy quest {quests}", 'description': description}
+            opportunities.extend(dict(zealy) for _ in range(rng.randint(1, 3)))
+            quests += 1
+    return opportunities[:count], quests
+
+
+def legacy_keys(op):
+    """Les trois hachages historiques, chacun recalculé par son étape."""
+    dedup = hashlib.md5(f"{op.get('title', '')}|{op.get('url', '')}|{op.get('description', '')}".encode()).hexdigest()
+    hashlib.md5(f"{op.get('source')}-{op.get('id')}-{op.get('title')}".encode()).hexdigest()
+    source = str(op.get('source') or '').strip().lower()
+    ident = op.get('id') or op.get('url') or op.get('link') or op.get('title') or ''
+    hashlib.sha1(f"{source}\x00{str(ident).strip().lower()}".encode('utf-8')).hexdigest()
+    return dedup
+
+
+def canonical_stages(opportunities):
+    """Clé calculée à la déduplication, relue (op['hash']) par main.py et l'index des vues."""
+    keys = [opportunity_key(op) for op in opportunities]
+    for _ in range(2):
+        for op in opportunities:
+            opportunity_key(op)
+    return keys
+
+
+def timed(func, repeat, setup=None):
+    best = float('inf')
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    argv = sys.argv[1:]
+    options = {'--archive': "data/opportunities", '--entries': 50000, '--repeat': 3}
+    for option in options:
+        if option in argv:
+            index = argv.index(option)
+            options[option] = argv[index + 1] if option == '--archive' else int(argv[index + 1])
+            del argv[index:index + 2]
+
+    opportunities = load_archive(options['--archive'])
+    distinct = None
+    if opportunities:
+        print(f"📚 Archive {options['--archive']}: {len(opportunities)} opportunités")
+    else:
+        opportunities, distinct = generate_corpus(options['--entries'], random.Random(42))
+        print(f"📚 Corpus synthétique: {len(opportunities)} opportunités, {distinct} quêtes distinctes")
+
+    legacy_time, legacy = timed(lambda: [legacy_keys(op) for op in opportunities], options['--repeat'])
+    copies = []
+
+    def fresh_copies():  # Lot neuf, cache d'URLs vidé : coût d'un premier run
+        canonical_url.cache_clear()
+        copies[:] = [dict(op) for op in opportunities]
+
+    compute_time, _ = timed(lambda: [compute_key(op) for op in opportunities], options['--repeat'],
+                            canonical_url.cache_clear)
+    canonical_time, canonical = timed(lambda: canonical_stages(copies), options['--repeat'], fresh_copies)
+
+    total = len(opportunities)
+    for name, keys in (("historique (md5 titre|url|description)", legacy), ("clé canonique (blake2b-64)", canonical)):
+        unique = len(set(keys))
+        line = f"  {name:42s} {unique:7d} uniques, {total - unique:7d} doublons ({(total - unique) / total:.1%})"
+        if distinct:
+            line += f", {(total - unique) / (total - distinct):.1%} des doublons réels"
+        print(line)
+
+    print(f"  hachages historiques, 3 étapes             {legacy_time * 1000:8.1f} ms")
+    print(f"  clé canonique, calcul seul                 {compute_time * 1000:8.1f} ms")
+    print(f"  clé canonique, 3 étapes (calcul + relues)  {canonical_time * 1000:8.1f} ms")
+    print(f"⚡ Coût de hachage sur les 3 étapes: x{legacy_time / canonical_time:.2f}")
+
+
+if __name__ == "__main__":
+    main()
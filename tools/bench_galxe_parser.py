@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Benchmark du parsing des pages explore Galxe : ancien parser (BeautifulSoup + html.parser,
+sélecteurs essayés un par un) contre GalxeQuestParser (lxml, un seul parcours).
+
+Usage:
+    python tools/bench_galxe_parser.py [dossier_corpus] [--repeat N]
+
+Le corpus est un dossier de pages HTML sauvegardées (*.html). Par défaut data/galxe_pages ;
+s'il est vide, un corpus synthétique de pages explore est généré dans ce dossier.
+Le pic mémoire est mesuré par tracemalloc (allocations Python ; la mémoire C de lxml n'y figure pas).
+"""
+import os
+import sys
+import time
+import glob
+import random
+import tracemalloc
+import contextlib
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from bs4 import BeautifulSoup
+from scrapers.galxe_parser import GalxeQuestParser
+
+DEFAULT_CORPUS = "data/galxe_pages"
+
+
+def legacy_parse_quests(html):
+    """Ancienne implémentation de GalxeScraperEnhanced.parse_quests (sans les print)."""
+    soup = BeautifulSoup(html, 'html.parser')
+    grid_container = soup.select_one("div.GridFlowContainer_grid-flow__m_iqK")
+    if grid_container:
+        len(grid_container.find_all())
+    selectors_to_try = [
+        "div.GridFlowContainer_grid-flow__m_iqK > div",
+        "div.GridFlowContainer_grid-flow__m_iqK > *",
+        "div[class*='card']", "div[class*='Card']",
+        "div[class*='item']", "div[class*='Item']",
+        "a[href*='/space/']", "a[href*='/quest/']", "a[href*='/campaign/']",
+        "main a[href]"
+    ]
+    found_items = []
+    for selector in selectors_to_try:
+        items = soup.select(selector)
+        if items:
+            found_items.extend(items)
+            break
+
+    quests = []
+    for item in found_items:
+        link_element = item if item.name == 'a' else item.select_one('a')
+        if not link_element:
+            continue
+        href = link_element.get('href', '')
+        if not href or not any(path in href for path in ['/space/', '/quest/', '/campaign/']):
+            continue
+        title = ""
+        for candidate in [link_element.get_text().strip(),
+                          item.get_text().strip() if item != link_element else ""]:
+            if candidate and len(candidate) > 3:
+                title = candidate[:100]
+                break
+        if href.startswith('/'):
+            full_link = "https://galxe.com" + href
+        elif href.startswith('http'):
+            full_link = href
+        else:
+            full_link = "https://galxe.com/" + href
+        quests.append({"title": title or f"Quest from {href}", "link": full_link, "source": "Galxe"})
+
+    seen_links = set()
+    unique_quests = []
+    for quest in quests:
+        if quest['link'] not in seen_links:
+            seen_links.add(quest['link'])
+            unique_quests.append(quest)
+    return unique_quests
+
+
+def generate_corpus(directory, pages=5, cards=400, noise_blocks=3000):
+    """Génère des pages explore synthétiques (~ plusieurs Mo) avec la structure du grid Galxe."""
+    os.makedirs(directory, exist_ok=True)
+    rng = random.Random(42)
+    for page in range(pages):
+        parts = ["<html><head><title>Galxe Explore</title></head><body><main>"]
+        parts.append("<nav>" + "".join(f"<a href='/menu/{i}'>Menu {i}</a>" for i in range(50)) + "</nav>")
+        for i in range(noise_blocks):
+            parts.append(f"<div class='Noise_block__{i % 97}'><span>{'lorem ipsum ' * rng.randint(5, 30)}</span></div>")
+        parts.append("<div class='GridFlowContainer_grid-flow__m_iqK'>")
+        for i in range(cards):
+            space = f"space{rng.randint(1, 300)}"
+            parts.append(
+                f"<div class='CampaignCard_card__x{i % 7}'><div class='CampaignCard_header'>"
+                f"<img src='/img/{i}.png'/><span>{space}</span></div>"
+                f"<a href='/quest/{space}/GC{page}{i}'><h3>Campaign {page}-{i} {'reward ' * rng.randint(1, 5)}</h3></a>"
+                f"<div class='CampaignCard_footer'><span>{rng.randint(10, 5000)} participants</span></div></div>"
+            )
+        parts.append("</div></main></body></html>")
+        with open(os.path.join(directory, f"explore_page_{page + 1}.html"), "w", encoding="utf-8") as f:
+            f.write("".join(parts))
+    print(f"🧪 Corpus synthétique généré: {pages} pages dans {directory}")
+
+
+def bench(name, parse, pages, repeat):
+    tracemalloc.start()
+    start = time.perf_counter()
+    quests = 0
+    # Les print des parsers ne doivent pas fausser la mesure
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        for _ in range(repeat):
+            for html in pages:
+                quests += len(parse(html))
+    duration = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    total_mb = sum(len(html) for html in pages) * repeat / 1024 / 1024
+    print(f"  {name:<22} {duration:7.2f}s | {len(pages) * repeat / duration:7.2f} pages/s | "
+          f"{total_mb / duration:6.2f} Mo/s | pic mémoire {peak / 1024 / 1024:7.1f} Mo | {quests // repeat} quêtes")
+    return duration
+
+
+def main():
+    argv = sys.argv[1:]
+    repeat = 3
+    if '--repeat' in argv:
+        index = argv.index('--repeat')
+        repeat = int(argv[index + 1])
+        del argv[index:index + 2]
+    corpus_dir = argv[0] if argv else DEFAULT_CORPUS
+
+    files = sorted(glob.glob(os.path.join(corpus_dir, "*.html")))
+    if not files:
+        generate_corpus(corpus_dir)
+        files = sorted(glob.glob(os.path.join(corpus_dir, "*.html")))
+
+    pages = []
+    for path in files:
+        with open(path, "r", encoding="utf-8", errors="ignore") as f:
+            pages.append(f.read())
+    size_mb = sum(len(p) for p in pages) / 1024 / 1024
+    print(f"📚 Corpus: {len(pages)} pages, {size_mb:.1f} Mo, {repeat} passes")
+
+    new_parser = GalxeQuestParser()
+    parse_new = lambda html: new_parser.parse(html, url="https://galxe.com/explore")
+
+    legacy = bench("ancien (html.parser)", legacy_parse_quests, pages, repeat)
+    fast = bench(f"nouveau ({new_parser.backend})", parse_new, pages, repeat)
+
+    print(f"⚡ Gain: x{legacy / fast:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Benchmark du filtrage par mots-clés du pipeline RSS : ancienne logique (listes
+reconstruites à chaque entrée, `any(...)`) contre le KeywordMatcher précompilé de
+TwitterRSSScraper. L'estimation des récompenses a son propre benchmark
+(tools/bench_reward_parser.py).
+
+Usage:
+    python tools/bench_keyword_matcher.py [--entries N] [--repeat R]
+
+Le corpus (10 000 entrées par défaut) est synthétique et reproductible. Le script vérifie
+que les deux implémentations retiennent exactement les mêmes entrées.
+"""
+import os
+import sys
+import time
+import random
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from scrapers.twitter_rss_scraper import TwitterRSSScraper, build_keyword_matcher
+
+LEGACY_FALLBACK = [
+    'airdrop', 'free', 'earn', 'reward', 'giveaway', 'claim',
+    'bonus', 'incentive', 'campaign', 'contest', 'competition',
+    'whitelist', 'presale', 'launch', 'testnet', 'mainnet',
+    'gratuit', 'gagner', 'récompense', 'cadeau', 'concours',
+    'campagne', 'bonus', 'lancement'
+]
+LEGACY_MAIN = [
+    'airdrop', 'quest', 'task', 'reward', 'earn', 'free',
+    'giveaway', 'bonus', 'incentive', 'campaign', 'event',
+    'contest', 'competition', 'opportunity', 'program',
+    'defi', 'nft', 'token', 'staking', 'yield', 'farming',
+    'trading', 'swap', 'liquidity', 'bridge', 'layer2',
+    'whitelist', 'presale', 'ido', 'ico', 'launch',
+    'testnet', 'mainnet', 'alpha', 'beta',
+    'gratuit', 'gagner', 'récompense', 'jeton', 'crypto',
+    'blockchain', 'opportunité', 'programme', 'concours',
+    'campagne', 'lancement', 'finance', 'investir'
+]
+
+
+def legacy_filter(entries):
+    results = []
+    for entry in entries:
+        title_lower = entry['title'].lower()
+        # Listes reconstruites à chaque entrée, comme dans l'ancien parse_rss_data
+        keywords = list(LEGACY_FALLBACK) if entry['is_fallback'] else list(LEGACY_MAIN)
+        results.append(any(keyword in title_lower for keyword in keywords))
+    return results
+
+
+def make_scraper():
+    # Seul le moteur de mots-clés est utile ici : pas de session HTTP ni de traducteur
+    scraper = object.__new__(TwitterRSSScraper)
+    scraper.keyword_matcher = build_keyword_matcher()
+    return scraper
+
+
+def matcher_filter(scraper):
+    def run(entries):
+        results = []
+        for entry in entries:
+            results.append(scraper._matches_keywords(entry['title'], entry['is_fallback']))
+        return results
+    return run
+
+
+def generate_corpus(count, rng):
+    subjects = ["Bitcoin", "Ethereum", "Solana", "Arbitrum", "Base", "the SEC", "Binance", "a new L2",
+                "Le marché crypto", "La blockchain Tezos", "Uniswap", "Celestia"]
+    actions = ["launches", "announces", "hits new high as", "faces pressure while", "opens its testnet and",
+               "lance", "annonce", "unveils", "reports", "delays"]
+    objects = ["a massive airdrop", "its staking program", "a quick quest campaign", "a good trading week",
+               "new ETF flows", "a small governance vote", "des récompenses gratuites", "its mainnet",
+               "a security incident", "quarterly results", "a liquidity mining event", "une mise à jour"]
+    fillers = ("market analysts said the move could weigh on prices in the coming weeks while on-chain "
+               "activity remains elevated across major networks and users keep bridging assets").split()
+    amounts = ["$250", "$1000", "500 USDT", "2 ETH", "0.5 btc", "10 000 tokens", "", "", "", ""]
+    corpus = []
+    for _ in range(count):
+        title = f"{rng.choice(subjects)} {rng.choice(actions)} {rng.choice(objects)}"
+        summary = " ".join(rng.choice(fillers) for _ in range(rng.randint(20, 120)))
+        summary = f"<p>{summary} {rng.choice(amounts)} {rng.choice(fillers)}</p>"
+        corpus.append({'title': title, 'summary': summary, 'is_fallback': rng.random() < 0.3})
+    return corpus
+
+
+def bench(name, func, entries, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        results = func(entries)
+    duration = (time.perf_counter() - start) / repeat
+    kept = sum(results)
+    print(f"  {name:<24} {duration * 1000:8.1f} ms | {len(entries) / duration:9.0f} entrées/s | {kept} retenues")
+    return duration, results
+
+
+def main():
+    argv = sys.argv[1:]
+    options = {'--entries': 10000, '--repeat': 5}
+    for option in options:
+        if option in argv:
+            index = argv.index(option)
+            options[option] = int(argv[index + 1])
+            del argv[index:index + 2]
+
+    entries = generate_corpus(options['--entries'], random.Random(42))
+    print(f"📚 Corpus: {len(entries)} entrées, {options['--repeat']} passes")
+
+    legacy_time, legacy_results = bench("ancien (any)", legacy_filter, entries, options['--repeat'])
+    new_time, new_results = bench("KeywordMatcher", matcher_filter(make_scraper()), entries, options['--repeat'])
+
+    if legacy_results != new_results:
+        diffs = sum(1 for a, b in zip(legacy_results, new_results) if a != b)
+        print(f"❌ Résultats différents sur {diffs} entrées")
+        sys.exit(1)
+    print("✅ Résultats identiques")
+    print(f"⚡ Gain: x{legacy_time / new_time:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Benchmark de la détection de langue du pipeline RSS : ancienne version (deux appels
+langdetect par entrée) contre LanguageClassifier (pré-classification + cache par contenu).
+
+Usage:
+    python tools/bench_language_detection.py [dossier_archives] [--entries N]
+
+Les entrées archivées sont lues dans les fichiers JSON du dossier (par défaut data/ :
+champs title + summary/description). S'il y en a moins que N, le corpus est complété
+par des entrées synthétiques multilingues, avec les répétitions typiques d'un flux RSS
+relu à chaque run.
+"""
+import os
+import sys
+import glob
+import json
+import time
+import random
+import tempfile
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from scrapers.language_classifier import LanguageClassifier, LANGDETECT_AVAILABLE
+
+DEFAULT_ARCHIVE = "data"
+
+TEMPLATES = [
+    "New {token} airdrop for early users of the {chain} testnet is now live",
+    "How to claim your {token} rewards before the snapshot on {chain}",
+    "Airdrop {token} : comment participer à la campagne sur {chain}",
+    "Les meilleures opportunités de staking de la semaine sur {chain}",
+    "Nuevo airdrop de {token} para los usuarios de {chain} que completen las tareas",
+    "Como participar do airdrop de {token} na rede {chain} e ganhar recompensas",
+    "{token} Airdrop: Neue Belohnungen für frühe Nutzer im {chain} Netzwerk",
+    "Новый аирдроп {token} для пользователей сети {chain}",
+    "{chain} 生态 {token} 空投活动正式开启，早期用户可领取奖励",
+]
+
+
+def load_archived_entries(directory):
+    texts = []
+    for path in glob.glob(os.path.join(directory, "**", "*.json"), recursive=True):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            continue
+        items = data if isinstance(data, list) else data.get("opportunities", []) if isinstance(data, dict) else []
+        for item in items:
+            if isinstance(item, dict) and item.get("title"):
+                texts.append(f"{item['title']} {item.get('summary', item.get('description', ''))}")
+    return texts
+
+
+def synthetic_entries(count, rng):
+    tokens = ["ZK", "LAYER", "ARB", "OP", "STRK", "BLAST", "MODE", "SCROLL"]
+    chains = ["Ethereum", "Solana", "Base", "Arbitrum", "Linea", "zkSync"]
+    # Environ un tiers de textes distincts : les flux renvoient les mêmes articles d'un run à l'autre
+    distinct = [rng.choice(TEMPLATES).format(token=rng.choice(tokens), chain=rng.choice(chains)) + f" #{i}"
+                for i in range(max(1, count // 3))]
+    return [rng.choice(distinct) for _ in range(count)]
+
+
+def legacy_classify(texts):
+    """Ancienne logique de parse_rss_data : detect() direct puis is_supported_language()."""
+    from langdetect import detect
+    kept = 0
+    for text in texts:
+        try:
+            detect(text)
+        except Exception:
+            pass
+        clean = text.replace('\n', ' ').replace('\t', ' ').strip()
+        if len(clean) < 10:
+            kept += 1
+            continue
+        try:
+            kept += detect(clean) in ['en', 'fr', 'es', 'pt', 'lt']
+        except Exception:
+            kept += 1
+    return kept
+
+
+def run(name, func, texts):
+    start = time.perf_counter()
+    kept = func(texts)
+    duration = time.perf_counter() - start
+    print(f"  {name:<28} {duration:7.2f}s | {len(texts) / duration:9.0f} entrées/s | {kept} conservées")
+    return duration
+
+
+def main():
+    argv = sys.argv[1:]
+    count = 3000
+    if '--entries' in argv:
+        index = argv.index('--entries')
+        count = int(argv[index + 1])
+        del argv[index:index + 2]
+    directory = argv[0] if argv else DEFAULT_ARCHIVE
+
+    texts = load_archived_entries(directory)[:count]
+    archived = len(texts)
+    texts += synthetic_entries(count - archived, random.Random(42))
+    print(f"📚 Corpus: {len(texts)} entrées ({archived} archivées, {len(set(texts))} distinctes)")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cache_path = os.path.join(tmp_dir, "language_cache.json")
+
+        def classify(texts):
+            classifier = LanguageClassifier(cache_path)
+            languages = classifier.classify_batch(texts)
+            print(f"    {classifier.stats}")
+            return sum(LanguageClassifier.is_supported(lang) for lang in languages)
+
+        if LANGDETECT_AVAILABLE:
+            legacy = run("ancien (2x langdetect)", legacy_classify, texts)
+        else:
+            legacy = None
+            print("  ⚠️ langdetect non installé : référence ancienne non mesurée")
+        cold = run("classifier (cache vide)", classify, texts)
+        warm = run("classifier (cache chaud)", classify, texts)
+
+    if legacy:
+        print(f"⚡ Gain: x{legacy / cold:.1f} au premier run, x{legacy / warm:.1f} aux runs suivants")
+
+
+if __name__ == "__main__":
+    main()
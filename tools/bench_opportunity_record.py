@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Benchmark de processing.opportunity.Opportunity (__slots__) contre les dicts bruts des scrapers.
+
+Usage:
+    python tools/bench_opportunity_record.py [--entries N] [--repeat R]
+
+Les enregistrements sont relus depuis du JSON (comme les lots sauvegardés), annotés comme
+par le pipeline de processing, puis mesurés : mémoire (tracemalloc), construction, accès
+aux champs et sérialisation JSON.
+"""
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from processing.opportunity import Opportunity, json_default
+
+SOURCES = ["Galxe", "Zealy", "Layer3", "TwitterRSS"]
+CURRENCIES = ["USD", "XP", "POINTS", "GAL"]
+
+
+def raw_payload(i, rng):
+    """Sortie brute typique d'un scraper, noms de champs selon la source."""
+    source = rng.choice(SOURCES)
+    payload = {'id': f"{source.lower()}-{i}", 'title': f"Quest {i} on {source}", 'source': source,
+               'description': "Complete the tasks to earn rewards" * rng.randint(0, 2),
+               'reward': rng.randint(1, 1000), 'reward_currency': rng.choice(CURRENCIES)}
+    if source == "Galxe":
+        payload['link'] = f"https://galxe.com/campaign/{i}"
+    elif source == "Zealy":
+        payload.update(community=f"community-{i % 50}", time_est_min=5, end_time="2026-12-31")
+    else:
+        payload.update(url=f"https://example.com/{i}", estimated_time=10, roi_usd_per_min=0.5)
+    return payload
+
+
+def annotate(op):
+    op['roi'] = 1.25
+    op['reward_amount_extracted'] = 100
+    op['currency_detected'] = "USD"
+    op['reward_confidence'] = 0.9
+    op['time_estimated'] = 5
+    op['hash'] = "0123456789abcdef"
+    op['seen_status'] = "new"
+
+
+def build(serialized, convert):
+    records = json.loads(serialized)
+    if convert:
+        records = Opportunity.from_records(records)
+    for op in records:
+        annotate(op)
+    return records
+
+
+def measure_memory(serialized, convert):
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    records = build(serialized, convert)
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    size = sum(stat.size_diff for stat in after.compare_to(before, 'filename'))
+    return size, records
+
+
+def timed(func, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    argv = sys.argv[1:]
+    options = {'--entries': 100000, '--repeat': 3}
+    for option in options:
+        if option in argv:
+            index = argv.index(option)
+            options[option] = int(argv[index + 1])
+            del argv[index:index + 2]
+
+    rng = random.Random(42)
+    count = options['--entries']
+    serialized = json.dumps([raw_payload(i, rng) for i in range(count)])
+    print(f"📚 Lot: {count} opportunités, meilleur de {options['--repeat']} passes")
+
+    dict_size, dicts = measure_memory(serialized, convert=False)
+    record_size, records = measure_memory(serialized, convert=True)
+    print(f"  mémoire, dicts                  {dict_size / 2**20:8.1f} Mo ({dict_size / count:6.0f} o/opportunité)")
+    print(f"  mémoire, Opportunity            {record_size / 2**20:8.1f} Mo ({record_size / count:6.0f} o/opportunité)")
+
+    raws = json.loads(serialized)
+    construct_time, _ = timed(lambda: Opportunity.from_records(raws), options['--repeat'])
+    print(f"  construction depuis les dicts   {construct_time * 1000:8.1f} ms "
+          f"({construct_time / count * 1e6:.2f} µs/opportunité)")
+
+    dict_read, _ = timed(lambda: sum(op.get('roi', 0) for op in dicts), options['--repeat'])
+    record_read, _ = timed(lambda: sum(op.roi for op in records), options['--repeat'])
+    mapping_read, _ = timed(lambda: sum(op.get('roi', 0) for op in records), options['--repeat'])
+    print(f"  lecture roi, dict.get           {dict_read * 1000:8.1f} ms")
+    print(f"  lecture roi, attribut           {record_read * 1000:8.1f} ms")
+    print(f"  lecture roi, Opportunity.get    {mapping_read * 1000:8.1f} ms")
+
+    dict_dump, dict_json = timed(lambda: json.dumps(dicts, ensure_ascii=False), options['--repeat'])
+    record_dump, record_json = timed(lambda: json.dumps(records, ensure_ascii=False, default=json_default),
+                                     options['--repeat'])
+    print(f"  json.dumps, dicts               {dict_dump * 1000:8.1f} ms")
+    print(f"  json.dumps, Opportunity         {record_dump * 1000:8.1f} ms")
+    if len(json.loads(record_json)) != len(json.loads(dict_json)):
+        print("❌ Sérialisation incomplète")
+        sys.exit(1)
+    print(f"⚡ Mémoire: x{dict_size / record_size:.2f} plus compact")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Benchmark de l'analyse des récompenses : les quatre anciennes implémentations
+(pipeline.extract_reward_info, ZealyScraper._extract_numeric_reward,
+TwitterRSSScraper._estimate_reward, calculate_rewards.extract_numeric_value) contre
+processing.reward_parser.
+
+Usage:
+    python tools/bench_reward_parser.py [--entries N] [--repeat R]
+
+Le corpus est étiqueté (montant et devise attendus) et reproductible : le script mesure
+la précision de chaque implémentation puis le débit, sur un corpus réaliste (les libellés
+se répètent : "100 XP", "$10-30 estimated"...) et sur un corpus où tout est distinct
+(cache de reward_parser inopérant).
+"""
+import os
+import re
+import sys
+import time
+import random
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from processing.reward_parser import parse_reward, parse_rewards, find_reward, CRYPTO_CURRENCIES
+
+# (texte, montant attendu, devise attendue)
+LABELLED = [
+    ("$1,000", 1000, 'USD'), ("$250", 250, 'USD'), ("$12.5", 12.5, 'USD'), ("50 USD", 50, 'USD'),
+    ("500 XP", 500, 'XP'), ("1,500 XP", 1500, 'XP'), ("100 points", 100, 'POINTS'), ("20 GAL", 20, 'GAL'),
+    ("0.05 BTC", 0.05, 'BTC'), ("0.5 btc", 0.5, 'BTC'), ("2 ETH", 2, 'ETH'), ("100 USDT", 100, 'USDT'),
+    ("250 USDC", 250, 'USDC'), ("$10-30 estimated", 20, 'USD'), ("$50-100 estimated", 75, 'USD'),
+    ("$5-20 estimated", 12.5, 'USD'), ("$2k", 2000, 'USD'), ("Web3 quest: 300 XP", 300, 'XP'),
+]
+CRYPTO_RATES_USD = {'USD': 1, 'USDT': 1, 'USDC': 1, 'BTC': 100000}
+TEMPLATES = ["${}", "${:,}", "{} USD", "{} XP", "{:,} XP", "{} points", "{} GAL", "0.0{} BTC", "{} ETH",
+             "{} USDT", "{} USDC", "Web3 quest: {} XP", "${}-{} estimated"]
+
+
+# --- Anciennes implémentations (copies fidèles) ---
+
+def legacy_pipeline(reward_str):
+    reward_amount, currency = 10, "USD"
+    amount_match = re.search(r'(\d+(?:\.\d+)?)', reward_str)
+    if amount_match:
+        reward_amount = float(amount_match.group(1))
+    upper = reward_str.upper()
+    if 'XP' in upper:
+        currency = 'XP'
+    elif 'GAL' in upper:
+        currency = 'GAL'
+    elif 'POINTS' in upper or 'POINT' in upper:
+        currency = 'POINTS'
+    elif '$' in reward_str or 'USD' in upper:
+        currency = 'USD'
+    return reward_amount, currency
+
+
+def legacy_zealy(value):
+    match = re.search(r'([0-9]+(?:\.[0-9]+)?)', str(value))
+    return float(match.group(1)) if match else 0.0
+
+
+def legacy_rss(text):
+    text = text.lower()
+    amounts = re.findall(r'\$(\d+)', text)
+    if amounts:
+        return float(amounts[0]), 'USD'
+    crypto_amounts = re.findall(r'(\d+)\s*(usdt|usdc|eth|btc)', text)
+    if crypto_amounts:
+        amount, token = crypto_amounts[0]
+        return float(amount), token.upper()
+    return None
+
+
+def legacy_calculate_rewards(reward_str):
+    dollar_match = re.search(r'\$(\d+(?:,\d+)*(?:\.\d+)?)', str(reward_str))
+    if dollar_match:
+        return float(dollar_match.group(1).replace(',', ''))
+    btc_match = re.search(r'(\d+(?:\.\d+)?)\s*BTC', str(reward_str), re.IGNORECASE)
+    if btc_match:
+        return float(btc_match.group(1)) * 100000
+    if 'estimated' in str(reward_str).lower():
+        for label, value in (('10-30', 20), ('50-100', 75), ('20-50', 35), ('5-20', 12.5)):
+            if label in str(reward_str):
+                return value
+        return 20
+    return 0
+
+
+# --- Précision ---
+
+def close(a, b):
+    return a is not None and b is not None and abs(a - b) < 1e-9
+
+
+def accuracy():
+    scores = {'pipeline': 0, 'zealy': 0, 'rss': 0, 'calculate_rewards': 0, 'reward_parser': 0}
+    rss_cases = [case for case in LABELLED if case[2] == 'USD' or case[2] in CRYPTO_CURRENCIES]
+    for text, amount, currency in LABELLED:
+        scores['pipeline'] += legacy_pipeline(text) == (amount, currency)
+        scores['zealy'] += close(legacy_zealy(text), amount)
+        expected_usd = amount * CRYPTO_RATES_USD.get(currency, 0)
+        scores['calculate_rewards'] += close(legacy_calculate_rewards(text), expected_usd)
+        info = parse_reward(text)
+        scores['reward_parser'] += close(info.amount, amount) and info.currency == currency
+    rss_ok = new_rss_ok = 0
+    for text, amount, currency in rss_cases:
+        sentence = f"Project X launches a campaign worth {text} for early users"
+        legacy = legacy_rss(sentence)
+        rss_ok += legacy is not None and close(legacy[0], amount) and legacy[1] == currency
+        found = find_reward(sentence)
+        new_rss_ok += found is not None and close(found.amount, amount) and found.currency == currency
+    print(f"🎯 Précision sur {len(LABELLED)} formats étiquetés (montant + devise):")
+    for name in ('pipeline', 'zealy', 'calculate_rewards', 'reward_parser'):
+        print(f"  {name:<22} {scores[name]:3d}/{len(LABELLED)}")
+    print(f"  {'rss (texte libre)':<22} {rss_ok:3d}/{len(rss_cases)} → reward_parser {new_rss_ok}/{len(rss_cases)}")
+    return scores['reward_parser'] >= max(scores[name] for name in scores if name != 'reward_parser')
+
+
+# --- Débit ---
+
+def bench(name, func, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    duration = (time.perf_counter() - start) / repeat
+    print(f"  {name:<36} {duration * 1000:8.1f} ms")
+    return duration
+
+
+def main():
+    argv = sys.argv[1:]
+    options = {'--entries': 50000, '--repeat': 5}
+    for option in options:
+        if option in argv:
+            index = argv.index(option)
+            options[option] = int(argv[index + 1])
+            del argv[index:index + 2]
+
+    if not accuracy():
+        print("❌ reward_parser moins précis qu'une ancienne implémentation")
+        sys.exit(1)
+
+    rng = random.Random(42)
+    pools = {
+        "réaliste": [10, 20, 25, 50, 100, 150, 200, 250, 500, 1000, 1500, 5000],
+        "tout distinct": range(1, 10 ** 9),
+    }
+    for corpus_name, pool in pools.items():
+        rewards = []
+        for _ in range(options['--entries']):
+            amount = rng.choice(pool)
+            rewards.append(rng.choice(TEMPLATES).format(amount, amount * 2))
+        opportunities = [{'reward': reward} for reward in rewards]
+        print(f"\n📚 Débit ({corpus_name}): {len(rewards)} récompenses, "
+              f"{len(set(rewards))} distinctes, {options['--repeat']} passes")
+
+        legacy_time = sum([
+            bench("ancien pipeline.extract_reward_info", lambda: [legacy_pipeline(r) for r in rewards], options['--repeat']),
+            bench("ancien Zealy._extract_numeric_reward", lambda: [legacy_zealy(r) for r in rewards], options['--repeat']),
+            bench("ancien calculate_rewards", lambda: [legacy_calculate_rewards(r) for r in rewards], options['--repeat']),
+        ]) / 3
+        new_time = bench("reward_parser.parse_rewards", lambda: parse_rewards(opportunities), options['--repeat'])
+        print(f"⚡ Gain moyen: x{legacy_time / new_time:.2f}")
+
+
+if __name__ == "__main__":
+    main()
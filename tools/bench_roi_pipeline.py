@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Benchmark de processing.pipeline.process_opportunities : chemin dict par dict contre
+chemin en colonnes (NumPy), sur un lot synthétique de type backfill.
+
+Usage:
+    python tools/bench_roi_pipeline.py [--entries N] [--repeat R]
+
+Mesure le pipeline complet (copie du lot incluse) puis les seules étapes ROI / filtre + tri / catégories / stats
+(sur des ROI déjà calculés), et vérifie que les deux chemins donnent le même résultat.
+Compare enfin filtre + tri complet + catégories en passes séparées au passage unique de
+rank_by_roi, avec tri complet puis avec un top-5 (tas borné).
+"""
+import contextlib
+import copy
+import io
+import os
+import sys
+import time
+import random
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from processing.pipeline import process_opportunities
+from processing.roi_calculator import calculate_roi
+from processing.roi_filter import filter_by_roi, categorize_by_roi, rank_by_roi
+from processing.roi_vectorized import columnar_available, compute_roi, select_by_roi
+
+REWARD_FORMATS = ["${}", "{} XP", "{} GAL", "{} points", "{} USDT", "${}-{} estimated"]
+
+
+def generate_opportunities(count, rng):
+    opportunities = []
+    for i in range(count):
+        amount = rng.randint(1, 2000)
+        opportunities.append({
+            'title': f"Quest {rng.randint(0, count)}",
+            'url': f"https://example.com/{i}",
+            'reward': rng.choice(REWARD_FORMATS).format(amount, amount * 2),
+            'time_est_min': rng.choice([0, 1, 5, 10, 30]),
+        })
+    return opportunities
+
+
+def timed(func, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    argv = sys.argv[1:]
+    options = {'--entries': 100000, '--repeat': 3}
+    for option in options:
+        if option in argv:
+            index = argv.index(option)
+            options[option] = int(argv[index + 1])
+            del argv[index:index + 2]
+
+    if not columnar_available():
+        print("❌ NumPy n'est pas installé")
+        sys.exit(1)
+
+    opportunities = generate_opportunities(options['--entries'], random.Random(42))
+    print(f"📚 Lot: {len(opportunities)} opportunités, meilleur de {options['--repeat']} passes")
+
+    dict_time, dict_result = timed(lambda: process_opportunities(copy.deepcopy(opportunities), columnar=False),
+                                   options['--repeat'])
+    column_time, column_result = timed(lambda: process_opportunities(copy.deepcopy(opportunities), columnar=True),
+                                       options['--repeat'])
+    if dict_result != column_result:
+        print("❌ Résultats différents entre les deux chemins")
+        sys.exit(1)
+    print("✅ Résultats identiques")
+    print(f"  pipeline complet, dict par dict   {dict_time * 1000:8.1f} ms")
+    print(f"  pipeline complet, colonnes        {column_time * 1000:8.1f} ms")
+
+    # Étapes ROI -> filtre + tri -> catégories -> stats seules, extraction déjà faite
+    ops = [op for category in column_result['categories'].values() for op in category]
+    amounts = [op['reward_amount_extracted'] for op in ops]
+    currencies = [op['currency_detected'] for op in ops]
+    minutes = [op['time_estimated'] for op in ops]
+
+    def dict_stages():
+        for op, amount, currency, minute in zip(ops, amounts, currencies, minutes):
+            op['roi'] = round(calculate_roi(amount, minute, currency), 4)
+        filtered = filter_by_roi(ops, 2.0)
+        categorize_by_roi(ops)
+        return sum(op['roi'] for op in filtered) / len(filtered), max(op['roi'] for op in filtered)
+
+    def column_stages():
+        rois = compute_roi(amounts, currencies, minutes).round(4)
+        _, _, stats = select_by_roi(rois, 2.0)
+        return stats['avg_roi'], stats['max_roi']
+
+    stages_dict, _ = timed(dict_stages, options['--repeat'])
+    stages_column, _ = timed(column_stages, options['--repeat'])
+    print(f"  étapes ROI/filtre/catégories, dict   {stages_dict * 1000:8.1f} ms")
+    print(f"  étapes ROI/filtre/catégories, NumPy  {stages_column * 1000:8.1f} ms")
+    print(f"⚡ Gain: x{dict_time / column_time:.2f} (pipeline), x{stages_dict / stages_column:.1f} (étapes vectorisées)")
+
+    # Filtre / tri / catégories / stats : passes séparées contre passage unique (top-K)
+    def separate_passes():
+        filtered = sorted((op for op in ops if op['roi'] >= 2.0), key=lambda op: op['roi'], reverse=True)
+        categories = categorize_by_roi(ops)
+        return (filtered[:5], sum(op['roi'] for op in filtered) / len(filtered), max(op['roi'] for op in filtered),
+                {name: len(category) for name, category in categories.items()})
+
+    def single_pass(top_k):
+        top, _, stats = rank_by_roi(ops, 2.0, top_k=top_k)
+        return top[:5], stats['avg_roi'], stats['max_roi'], {name: stats[name] for name in ('high', 'medium', 'low')}
+
+    separate_time, separate = timed(separate_passes, options['--repeat'])
+    full_time, full = timed(lambda: single_pass(None), options['--repeat'])
+    top_time, top = timed(lambda: single_pass(5), options['--repeat'])
+    if separate[0] != full[0] or full[0] != top[0] or separate[3] != top[3]:
+        print("❌ Top 5 ou catégories différents entre passes séparées et passage unique")
+        sys.exit(1)
+    print(f"  passes séparées (filtre, tri, catégories, stats)  {separate_time * 1000:8.1f} ms")
+    print(f"  passage unique, tri complet                       {full_time * 1000:8.1f} ms")
+    print(f"  passage unique, top-5 (tas borné)                 {top_time * 1000:8.1f} ms")
+    print(f"⚡ Gain top-5: x{separate_time / top_time:.2f}")
+
+
+if __name__ == "__main__":
+    main()
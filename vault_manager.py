@@ -1,24 +1,90 @@
 import os
+import hashlib
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 import hvac
 
+# Cache de secrets partagé par toutes les instances du processus :
+# (url, empreinte du token, path) -> (données, expiration)
+_secret_cache = {}
+_authenticated = set()
+_cache_lock = threading.Lock()
+
+DEFAULT_SECRET_TTL = int(os.getenv("VAULT_SECRET_TTL", 3600))
+
 class VaultManager:
-    def __init__(self, url="http://localhost:8200", token=None):
+    def __init__(self, url="http://localhost:8200", token=None, ttl=DEFAULT_SECRET_TTL):
         if token is None:
             token = os.getenv("VAULT_TOKEN")
         if not token:
             raise ValueError("Token Vault non fourni. Définissez la variable d'environnement VAULT_TOKEN.")
-        
+
         # Le token Vault en mode dev - utiliser le token tel quel
         # Pas besoin d'ajouter des guillemets supplémentaires
-        
-        self.client = hvac.Client(url=url, token=token)
-        if not self.client.is_authenticated():
-            raise Exception("Erreur d'authentification avec Vault")
 
-    def retrieve_secret(self, path):
+        # Connexion et authentification différées au premier accès réel à Vault
+        self.url = url
+        self.token = token
+        self.ttl = ttl
+        self._client = None
+        self._auth_key = (url, hashlib.sha256(token.encode()).hexdigest())
+
+    @property
+    def client(self):
+        if self._client is None:
+            self._client = hvac.Client(url=self.url, token=self.token)
+            # Une seule vérification d'authentification par processus pour ce couple url/token
+            with _cache_lock:
+                already_checked = self._auth_key in _authenticated
+            if not already_checked:
+                if not self._client.is_authenticated():
+                    self._client = None
+                    raise Exception("Erreur d'authentification avec Vault")
+                with _cache_lock:
+                    _authenticated.add(self._auth_key)
+        return self._client
+
+    def _cache_key(self, path):
+        # Un secret lu avec un token n'est jamais servi à une instance authentifiée autrement
+        return (*self._auth_key, path)
+
+    def _cached(self, path):
+        with _cache_lock:
+            entry = _secret_cache.get(self._cache_key(path))
+        if entry and entry[1] > time.time():
+            return dict(entry[0])  # Copie : l'appelant ne modifie pas le cache partagé
+        return None
+
+    def _read(self, path):
         # Spécifier explicitement le moteur KV 'kv'
         secret = self.client.secrets.kv.v2.read_secret_version(path=path, mount_point='kv')
-        return secret['data']['data']
+        # Respecter la durée de bail renvoyée par Vault si elle est définie
+        lease = secret.get('lease_duration') or 0
+        ttl = min(lease, self.ttl) if lease > 0 else self.ttl
+        data = secret['data']['data']
+        with _cache_lock:
+            _secret_cache[self._cache_key(path)] = (dict(data), time.time() + ttl)
+        return data
 
+    def retrieve_secret(self, path):
+        cached = self._cached(path)
+        if cached is not None:
+            return cached
+        return self._read(path)
 
+    def prefetch(self, prefix="scraperapi/", max_workers=8):
+        """Charge en une fois, en parallèle, tous les secrets sous `prefix` (kv/<prefix>*)."""
+        listing = self.client.secrets.kv.v2.list_secrets(path=prefix, mount_point='kv')
+        paths = [f"{prefix}{key}" for key in listing['data']['keys'] if not key.endswith('/')]
+        missing = [path for path in paths if self._cached(path) is None]
+        if missing:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                list(executor.map(self._read, missing))
+        return {path: self._cached(path) for path in paths}
 
+    @staticmethod
+    def clear_cache():
+        with _cache_lock:
+            _secret_cache.clear()
+            _authenticated.clear()